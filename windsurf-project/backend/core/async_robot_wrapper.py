@@ -1,18 +1,45 @@
 """
 Async robot wrapper for non-blocking robot operations.
-Provides thread pool execution, connection pooling, and batched operations.
+Provides per-robot I/O channel execution, connection pooling, and batched operations.
 """
 
 import asyncio
+import threading
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, List, Optional, Callable, Union
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 
 from .exceptions import HardwareError, ValidationError
+from .robot_io_channel import RobotIOChannel
+from .robot_status_feed import RobotStatusFeed
+
+
+# Commands that occupy a slot in the robot's motion queue while streaming
+MOTION_QUEUE_COMMANDS = frozenset({
+    "MovePose", "MoveLin", "move_joints",
+    "GripperOpen", "GripperClose", "MoveGripper", "Delay"
+})
+
+# Config commands that only set a persistent motion parameter: re-sending the
+# value the robot already has is a no-op and can be skipped
+IDEMPOTENT_CONFIG_COMMANDS = frozenset({
+    "SetJointVel", "SetJointAcc", "SetCartVel", "SetCartLinVel", "SetCartAcc",
+    "SetBlending", "SetConf", "SetGripperForce", "SetTorqueLimits", "SetTorqueLimitsCfg"
+})
+
+# Status edges after which the robot's motion parameters can no longer be assumed
+MOTION_STATE_RESET_EDGES = frozenset({"connected", "activated", "homed", "error", "paused"})
+
+# mecademicpy accepts checkpoint ids 1-8000
+MAX_CHECKPOINT_ID = 8000
+
+# Blocking robot waits on the command thread run in slices of at most this long,
+# so an abandoned or interrupted wait frees the thread within one slice
+WAIT_SLICE = 0.1
 
 
 class CommandType(Enum):
@@ -74,23 +101,23 @@ class AsyncRobotWrapper:
         self,
         robot_id: str,
         robot_driver: Any,  # Original synchronous robot driver
-        max_workers: int = 4,
         command_timeout: float = 30.0,
         batch_size: int = 10,
-        batch_timeout: float = 0.1
+        batch_timeout: float = 0.1,
+        lookahead_window: int = 8
     ):
         self.robot_id = robot_id
         self.robot_driver = robot_driver
-        self.max_workers = max_workers
         self.command_timeout = command_timeout
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout
+        self.lookahead_window = max(1, lookahead_window)
         
-        # Thread pool for blocking operations
-        self.executor = ThreadPoolExecutor(
-            max_workers=max_workers,
-            thread_name_prefix=f"robot_{robot_id}"
-        )
+        # Per-robot I/O channel: one ordered command thread plus status and control threads.
+        # Reuse the driver's channel when it has one so the robot never gets more than three threads.
+        driver_channel = getattr(robot_driver, 'io_channel', None)
+        self._owns_io_channel = not isinstance(driver_channel, RobotIOChannel)
+        self.io_channel = RobotIOChannel(robot_id) if self._owns_io_channel else driver_channel
         
         # Command batching
         self._pending_commands: List[Dict[str, Any]] = []
@@ -106,6 +133,44 @@ class AsyncRobotWrapper:
             "command_types": {}
         }
         
+        # Compiled program streaming (progress is written from the executor thread)
+        self._program_abort = threading.Event()
+        self._program_progress = {
+            "program_id": None,
+            "total_instructions": 0,
+            "next_index": 0,
+            "confirmed_index": 0,
+            "running": False
+        }
+        self._program_progress_callback: Optional[Callable[[int], None]] = None
+        self._checkpoint_counter = 0
+        self._streaming_stats = {
+            "lookahead_window": self.lookahead_window,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "refills": 0,
+            "total_refill_wait": 0.0,
+            "average_refill_latency": 0.0,
+            "max_refill_latency": 0.0
+        }
+        
+        # Motion parameters last applied on the robot (config_type -> values), so
+        # no-op config commands never reach the command thread
+        self._motion_state: Dict[str, Tuple[Any, ...]] = {}
+        self._motion_state_owner: Optional[int] = None
+        self._motion_state_listening = False
+        self._config_stats = {"sent": 0, "eliminated": 0, "invalidations": 0}
+        if hasattr(robot_driver, 'add_motion_cleared_listener'):
+            # ClearMotion discards queued Set* commands along with the motions
+            robot_driver.add_motion_cleared_listener(self.invalidate_motion_state)
+        
+        # Host-side delays run as event-loop timers, never on the command thread.
+        # interrupt_delays() wakes every running delay by setting the current
+        # generation's events and starting a new generation.
+        self._delay_interrupt = asyncio.Event()
+        self._sync_delay_interrupt = threading.Event()
+        self._delay_stats = {"loop_delays": 0, "loop_delay_time": 0.0, "thread_delays": 0, "thread_delay_time": 0.0, "interrupted": 0}
+        
         # Connection state
         self._connected = False
         self._last_status_check = 0.0
@@ -140,10 +205,17 @@ class AsyncRobotWrapper:
             except asyncio.CancelledError:
                 pass
         
-        # Shutdown executor
-        self.executor.shutdown(wait=True)
+        # Shutdown command/status threads (the driver shuts down a shared channel itself)
+        if self._owns_io_channel:
+            self.io_channel.shutdown(wait=True)
         self.logger.info(f"AsyncRobotWrapper for {self.robot_id} shutdown complete")
     
+    @property
+    def status_feed(self) -> Optional[RobotStatusFeed]:
+        """Event-driven status feed of the underlying driver, if it provides one"""
+        feed = getattr(self.robot_driver, 'status_feed', None)
+        return feed if isinstance(feed, RobotStatusFeed) else None
+    
     async def get_status(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get robot status with caching for performance.
@@ -156,6 +228,11 @@ class AsyncRobotWrapper:
         """
         current_time = time.time()
         
+        # Live status feed snapshot: O(1) read, no thread hop
+        feed = self.status_feed
+        if use_cache and feed is not None and feed.is_fresh(self._status_cache_ttl):
+            return feed.latest().to_status_dict()
+        
         # Use cache if available and fresh
         if (use_cache and 
             self._status_cache and 
@@ -167,13 +244,9 @@ class AsyncRobotWrapper:
         self.logger.debug(f"Requesting fresh status from robot {self.robot_id}")
         
         try:
-            # Execute in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
+            # Status thread: never queues behind motion or WaitIdle on the command thread
             status = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self.executor,
-                    self._get_status_sync
-                ),
+                self.io_channel.run_status(self._get_status_sync),
                 timeout=self.command_timeout
             )
             
@@ -214,12 +287,37 @@ class AsyncRobotWrapper:
             return {"connected": self._connected, "status": "unknown"}
     
     async def delay(self, milliseconds: int):
-        """Non-blocking delay operation"""
+        """
+        Non-blocking delay on the event loop.
+        
+        Raises:
+            HardwareError: If interrupt_delays() is called (emergency stop) before it elapses
+        """
         if milliseconds <= 0:
             return
         
-        # Use asyncio.sleep instead of blocking robot delay
-        await asyncio.sleep(milliseconds / 1000.0)
+        interrupt = self._delay_interrupt
+        started = time.time()
+        try:
+            await asyncio.wait_for(interrupt.wait(), timeout=milliseconds / 1000.0)
+        except asyncio.TimeoutError:
+            return
+        finally:
+            self._delay_stats["loop_delays"] += 1
+            self._delay_stats["loop_delay_time"] += time.time() - started
+        
+        self._delay_stats["interrupted"] += 1
+        raise HardwareError(
+            f"Delay of {milliseconds / 1000.0:.3f}s interrupted for robot {self.robot_id}",
+            robot_id=self.robot_id
+        )
+    
+    def interrupt_delays(self):
+        """Cut short every running delay and sliced robot wait, on the event loop and on the command thread"""
+        self._delay_interrupt.set()
+        self._delay_interrupt = asyncio.Event()
+        self._sync_delay_interrupt.set()
+        self._sync_delay_interrupt = threading.Event()
     
     async def execute_movement(self, command: MovementCommand) -> CommandResult:
         """
@@ -234,6 +332,15 @@ class AsyncRobotWrapper:
         command.validate()
         
         command_id = f"{self.robot_id}_{int(time.time() * 1000)}"
+        
+        if command.command_type == "config" and self._is_redundant_config(command):
+            self._config_stats["eliminated"] += 1
+            self.logger.debug(
+                f"Skipping no-op {command.parameters.get('config_type')} {command.parameters.get('values')} "
+                f"for {self.robot_id} (already active)"
+            )
+            return CommandResult(command_id=command_id, success=True, metadata={"eliminated": True})
+        
         start_time = time.time()
         
         # Log command transmission
@@ -241,17 +348,19 @@ class AsyncRobotWrapper:
         self.logger.debug(f"Command details: type={command.command_type}, position={command.target_position}, speed={command.speed}")
         
         try:
-            # Execute in thread pool
-            self.logger.debug(f"Executing movement command {command_id} in thread pool")
-            loop = asyncio.get_event_loop()
-            result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self.executor,
-                    self._execute_movement_sync,
-                    command
-                ),
-                timeout=self.command_timeout
-            )
+            # Emergency stop must not wait behind queued motion, so it uses the status thread
+            self.logger.debug(f"Executing movement command {command_id} on robot I/O channel")
+            if command.command_type == "Delay":
+                # Earlier commands are already on the robot; the dwell itself is an event-loop timer
+                pending = self.delay(1000.0 * (command.parameters or {}).get("duration", 0))
+            elif command.command_type == "emergency_stop":
+                self.interrupt_delays()
+                pending = self.io_channel.run_status(self._execute_movement_sync, command)
+            elif command.command_type == "WaitIdle":
+                pending = self._run_interruptible(self._execute_movement_sync, command)
+            else:
+                pending = self.io_channel.run_command(self._execute_movement_sync, command)
+            result = await asyncio.wait_for(pending, timeout=self.command_timeout)
             
             execution_time = time.time() - start_time
             
@@ -310,17 +419,46 @@ class AsyncRobotWrapper:
 
         try:
             robot = self.robot_driver.get_robot_instance()
-            if robot and hasattr(robot, 'WaitIdle'):
-                loop = asyncio.get_event_loop()
-
+            feed = self.status_feed
+            if robot and hasattr(robot, 'WaitIdle') and feed is not None and feed.running:
+                # Race the motion queue against the status feed's fault edge so a
+                # collision or pause fails immediately instead of at the timeout
+                idle_task = asyncio.ensure_future(self._run_interruptible(self._wait_idle_sync, robot, timeout))
+                idle_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                fault_task = asyncio.ensure_future(feed.fault_event.wait())
+                try:
+                    done, _ = await asyncio.wait(
+                        {idle_task, fault_task},
+                        timeout=timeout,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    fault_task.cancel()
+                    if not idle_task.done():
+                        # Fault edge or timeout won: abort the blocked WaitIdle so the command
+                        # thread is free for recovery by the time this returns
+                        idle_task.cancel()
+                        await asyncio.wait({idle_task})
+                
+                if idle_task in done:
+                    idle_task.result()
+                    self.logger.debug(f"Robot {self.robot_id} motion queue completed")
+                elif fault_task in done:
+                    snapshot = feed.latest()
+                    raise HardwareError(
+                        f"Robot {self.robot_id} stopped while waiting for motion queue - "
+                        f"error={snapshot.error}, paused={snapshot.paused}, connected={snapshot.connected} "
+                        f"(Likely collision or torque limit exceeded)",
+                        robot_id=self.robot_id
+                    )
+                else:
+                    raise asyncio.TimeoutError()
+            elif robot and hasattr(robot, 'WaitIdle'):
                 # Add timeout protection to prevent infinite hang
                 # If robot hits obstacle or enters error state, motion queue never completes
                 await asyncio.wait_for(
-                    loop.run_in_executor(
-                        self.executor,
-                        robot.WaitIdle
-                    ),
-                    timeout=timeout
+                    self._run_interruptible(self._wait_idle_sync, robot, timeout),
+                    timeout=timeout + WAIT_SLICE
                 )
                 self.logger.debug(f"Robot {self.robot_id} motion queue completed")
             else:
@@ -351,8 +489,111 @@ class AsyncRobotWrapper:
             self.logger.error(f"Error waiting for robot {self.robot_id} to idle: {e}")
             raise
 
-    def _execute_movement_sync(self, command: MovementCommand) -> Any:
-        """Execute movement command synchronously (runs in thread pool)"""
+    async def _run_interruptible(self, func: Callable, *args) -> Any:
+        """
+        Run a blocking wait on the command thread, passing it an abort event that is
+        set if the await is abandoned (cancelled, e.g. by an emergency stop, or timed
+        out). An abandoned call returns only once the thread has let go of the wait,
+        so whatever runs next on the command thread does not queue behind it.
+        """
+        abort = threading.Event()
+        pending = asyncio.ensure_future(self.io_channel.run_command(func, *args, abort))
+        pending.add_done_callback(lambda t: t.cancelled() or t.exception())
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            abort.set()
+            if not pending.done():
+                await asyncio.wait({pending}, timeout=2 * WAIT_SLICE)
+
+    def _wait_sliced(self, wait: Callable[[float], Any], timeout: float, abort: threading.Event) -> bool:
+        """
+        Call a robot wait (WaitIdle, WaitGripperMoveCompletion) in WAIT_SLICE steps.
+
+        Returns:
+            True when the wait completed, False when the timeout elapsed
+
+        Raises:
+            HardwareError: If abort or interrupt_delays() (emergency stop) fires first
+        """
+        interrupt = self._sync_delay_interrupt
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                wait(min(WAIT_SLICE, remaining))
+                return True
+            except Exception as e:
+                # mecademicpy raises TimeoutException on timeout, other errors mean the robot faulted
+                if "timeout" not in type(e).__name__.lower():
+                    raise
+            if abort.is_set() or interrupt.is_set():
+                raise HardwareError(f"Wait interrupted for robot {self.robot_id}", robot_id=self.robot_id)
+
+    def _wait_idle_sync(self, robot: Any, timeout: float, abort: threading.Event) -> None:
+        """WaitIdle with a timeout on the robot side (runs on the command thread)"""
+        if not self._wait_sliced(robot.WaitIdle, timeout, abort):
+            raise asyncio.TimeoutError()
+
+    async def confirm_action(self, action: str, timeout: float) -> Dict[str, Any]:
+        """
+        Wait for the robot to confirm the last queued action instead of sleeping a fixed time.
+
+        Args:
+            action: "gripper" (gripper move completed) or "settle" (end of block reached)
+            timeout: The fixed delay this replaces; the wait never exceeds it
+
+        Returns:
+            Dict with confirmed (False when the timeout elapsed) and elapsed seconds
+        """
+        started = time.time()
+        confirmed = await self._run_interruptible(self._confirm_action_sync, action, timeout)
+        if confirmed is None:
+            # No confirmation available from this robot - keep the fixed delay, off the command thread
+            await self.delay(1000.0 * max(0.0, timeout - (time.time() - started)))
+            confirmed = False
+        return {"action": action, "confirmed": confirmed, "elapsed": time.time() - started, "timeout": timeout}
+
+    def _confirm_action_sync(self, action: str, timeout: float, abort: threading.Event) -> Optional[bool]:
+        """Block on the command thread until the robot confirms the action or the timeout elapses (None: unsupported)"""
+        robot = self.robot_driver.get_robot_instance()
+        if robot is None:
+            raise HardwareError(f"Robot {self.robot_id} not connected", robot_id=self.robot_id)
+
+        try:
+            if action == "gripper" and hasattr(robot, 'WaitGripperMoveCompletion'):
+                return self._wait_sliced(robot.WaitGripperMoveCompletion, timeout, abort)
+            if action == "gripper" and hasattr(robot, 'GetRtGripperState') and hasattr(robot, 'WaitIdle'):
+                # The real-time gripper state reports the previous target until the queued
+                # gripper command runs, so it is only read once end of block has dequeued it
+                deadline = time.monotonic() + timeout
+                if not self._wait_sliced(robot.WaitIdle, timeout, abort):
+                    return False
+                while not abort.is_set():
+                    if getattr(robot.GetRtGripperState(), 'target_pos_reached', False):
+                        return True
+                    if time.monotonic() >= deadline:
+                        return False
+                    time.sleep(0.01)
+                return False
+            if hasattr(robot, 'WaitIdle'):
+                # Gripper commands run in the motion queue too, so end of block covers both
+                return self._wait_sliced(robot.WaitIdle, timeout, abort)
+        except Exception as e:
+            # mecademicpy raises TimeoutException on timeout, other errors mean the robot faulted
+            if "timeout" not in type(e).__name__.lower():
+                raise HardwareError(
+                    f"Robot {self.robot_id} failed while confirming {action}: {e}",
+                    robot_id=self.robot_id
+                )
+            return False
+
+        return None
+
+    def _execute_movement_sync(self, command: MovementCommand, abort: Optional[threading.Event] = None) -> Any:
+        """Execute movement command synchronously (runs in thread pool); abort cuts WaitIdle short"""
         try:
             # Get the actual robot instance from the driver wrapper
             actual_robot = None
@@ -466,12 +707,30 @@ class AsyncRobotWrapper:
                 else:
                     self.logger.warning(f"MoveGripper not available on robot {self.robot_id}")
             
+            # Drain the robot motion queue (used as a barrier inside compiled programs)
+            elif command.command_type == "WaitIdle":
+                timeout = command.parameters.get("timeout", self.command_timeout) if command.parameters else self.command_timeout
+                if hasattr(actual_robot, 'WaitIdle'):
+                    if not self._wait_sliced(actual_robot.WaitIdle, timeout, abort or threading.Event()):
+                        raise HardwareError(f"WaitIdle timeout after {timeout}s", robot_id=self.robot_id)
+                    self.logger.debug(f"Motion queue drained for {self.robot_id}")
+                else:
+                    self.logger.warning(f"WaitIdle not available on robot {self.robot_id}")
+            
             # Delay command
             elif command.command_type == "Delay":
                 duration = command.parameters.get("duration", 0) if command.parameters else 0
                 if duration > 0:
+                    # Only reached when a batch or program runs on the command thread without
+                    # a robot-side Delay; still interruptible by interrupt_delays()
                     self.logger.info(f"Executing delay of {duration} seconds for {self.robot_id}")
-                    time.sleep(duration)  # Synchronous sleep in thread pool is OK
+                    started = time.time()
+                    interrupted = self._sync_delay_interrupt.wait(duration)
+                    self._delay_stats["thread_delays"] += 1
+                    self._delay_stats["thread_delay_time"] += time.time() - started
+                    if interrupted:
+                        self._delay_stats["interrupted"] += 1
+                        raise HardwareError(f"Delay interrupted for robot {self.robot_id}", robot_id=self.robot_id)
                 else:
                     self.logger.warning(f"Invalid delay duration: {duration} for {self.robot_id}")
             
@@ -547,10 +806,15 @@ class AsyncRobotWrapper:
                         
                 else:
                     self.logger.warning(f"Unknown configuration command: {config_type} with values {values} for {self.robot_id}")
+                
+                self._config_stats["sent"] += 1
+                if config_type in IDEMPOTENT_CONFIG_COMMANDS:
+                    self._record_motion_state(actual_robot, config_type, values)
             
             elif command.command_type == "emergency_stop":
                 # EMERGENCY STOP: Immediate halt using proper Mecademic API methods
                 self.logger.critical(f"🚨 EMERGENCY STOP triggered for {self.robot_id}")
+                self.invalidate_motion_state()
                 
                 emergency_executed = False
                 
@@ -613,7 +877,413 @@ class AsyncRobotWrapper:
             
         except Exception as e:
             self.logger.error(f"Movement execution failed: {e}")
+            self.invalidate_motion_state()
             raise HardwareError(f"Movement failed: {e}", robot_id=self.robot_id)
+
+    def _is_redundant_config(self, command: MovementCommand) -> bool:
+        """True if a config command would set a motion parameter to the value it already has"""
+        config_type = command.parameters.get("config_type")
+        if config_type not in IDEMPOTENT_CONFIG_COMMANDS or not self._motion_state:
+            return False
+        self._watch_motion_state()
+        robot = self.robot_driver.get_robot_instance() if hasattr(self.robot_driver, 'get_robot_instance') else None
+        if robot is None or id(robot) != self._motion_state_owner:
+            return False
+        return self._motion_state.get(config_type) == tuple(command.parameters.get("values", []))
+
+    def _record_motion_state(self, robot: Any, config_type: str, values: List[Any]):
+        if id(robot) != self._motion_state_owner:
+            # New robot instance (reconnect): nothing known about its parameters
+            self._motion_state = {}
+            self._motion_state_owner = id(robot)
+        self._motion_state[config_type] = tuple(values)
+
+    def _watch_motion_state(self):
+        """Forget tracked parameters on connection/activation/homing/error/pause edges"""
+        if self._motion_state_listening:
+            return
+        feed = self.status_feed
+        if feed is not None:
+            feed.add_edge_listener(self._on_status_edge)
+            self._motion_state_listening = True
+
+    def _on_status_edge(self, field_name: str, old: Any, new: Any, snapshot: Any):
+        if field_name in MOTION_STATE_RESET_EDGES:
+            self.invalidate_motion_state()
+
+    def invalidate_motion_state(self):
+        """Forget the tracked motion parameters so the next config commands are all sent"""
+        if self._motion_state:
+            self._config_stats["invalidations"] += 1
+        self._motion_state = {}
+    
+    async def execute_program(
+        self,
+        program_id: str,
+        commands: List[MovementCommand],
+        start_index: int = 0,
+        timeout: Optional[float] = None,
+        lookahead: Optional[int] = None,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ) -> CommandResult:
+        """
+        Stream a pre-validated program to the robot in a single executor hop.
+        
+        Commands are sent in order from start_index. When the robot supports
+        checkpoints, up to `lookahead` motion-queue commands are kept in flight
+        and the window is topped up as each checkpoint (end of block) is reached,
+        so the arm moves continuously without flooding the robot buffer.
+        
+        Args:
+            program_id: Identifier of the compiled program
+            commands: Ordered, already-validated commands
+            start_index: Index of the first command to send (for resume)
+            timeout: Overall timeout for the whole program (None = no limit)
+            lookahead: Motion commands kept queued ahead (default: lookahead_window)
+            progress_callback: Called from the command thread with the new
+                confirmed index each time it advances (e.g. to checkpoint it)
+            
+        Returns:
+            Command result; metadata carries sent/confirmed/failed instruction indices
+        """
+        if not 0 <= start_index <= len(commands):
+            raise ValidationError(
+                f"Program start index {start_index} out of range (0-{len(commands)})",
+                field="start_index"
+            )
+        
+        window = max(1, lookahead or self.lookahead_window)
+        start_time = time.time()
+        self._program_abort.clear()
+        self._program_progress = {
+            "program_id": program_id,
+            "total_instructions": len(commands),
+            "next_index": start_index,
+            "confirmed_index": start_index,
+            "running": True
+        }
+        self._program_progress_callback = progress_callback
+        self._streaming_stats["lookahead_window"] = window
+        
+        self.logger.info(
+            f"Streaming program {program_id} to robot {self.robot_id}: "
+            f"{len(commands) - start_index} instructions from index {start_index} (look-ahead {window})"
+        )
+        
+        try:
+            await asyncio.wait_for(
+                self.io_channel.run_command(self._execute_program_sync, commands, start_index, window),
+                timeout=timeout
+            )
+            success, error = True, None
+        except asyncio.TimeoutError:
+            # Stop the worker at the next instruction boundary
+            self._program_abort.set()
+            success, error = False, f"Program timeout after {timeout}s"
+        except Exception as e:
+            success, error = False, str(e)
+        finally:
+            self._program_progress["running"] = False
+            self._program_progress_callback = None
+            self._streaming_stats["queue_depth"] = 0
+        
+        execution_time = time.time() - start_time
+        next_index = self._program_progress["next_index"]
+        confirmed_index = self._program_progress["confirmed_index"]
+        await self._update_command_stats(CommandType.PROTOCOL, success, execution_time)
+        
+        if success:
+            self.logger.info(f"Program {program_id} completed in {execution_time:.3f}s ({len(commands)} instructions)")
+        else:
+            self.logger.error(
+                f"Program {program_id} stopped after {execution_time:.3f}s "
+                f"(sent up to {next_index}, confirmed up to {confirmed_index}): {error}"
+            )
+        
+        return CommandResult(
+            command_id=program_id,
+            success=success,
+            result={"instructions_sent": next_index - start_index},
+            error=error,
+            execution_time=execution_time,
+            metadata={
+                "start_index": start_index,
+                "next_index": next_index,
+                "confirmed_index": confirmed_index,
+                "failed_index": None if success else next_index,
+                "total_instructions": len(commands)
+            }
+        )
+    
+    def _execute_program_sync(self, commands: List[MovementCommand], start_index: int, window: int) -> None:
+        """Send program instructions in order, keeping a bounded look-ahead window (runs in thread pool)"""
+        robot = self.robot_driver.get_robot_instance() if hasattr(self.robot_driver, 'get_robot_instance') else None
+        streaming = robot is not None and hasattr(robot, 'SetCheckpoint')
+        in_flight = deque()  # (instruction index, checkpoint handle)
+        
+        if not streaming:
+            self.logger.debug(f"Checkpoints unavailable for {self.robot_id} - streaming without look-ahead window")
+        
+        for index in range(start_index, len(commands)):
+            if self._program_abort.is_set():
+                raise HardwareError(
+                    f"Program aborted before instruction {index} for robot {self.robot_id}",
+                    robot_id=self.robot_id
+                )
+            
+            command = commands[index]
+            
+            if command.command_type == "config" and self._is_redundant_config(command):
+                self._config_stats["eliminated"] += 1
+                self._program_progress["next_index"] = index + 1
+                if not in_flight:
+                    self._confirm_program_index(index + 1)
+                continue
+            
+            if not streaming:
+                self._execute_movement_sync(command, self._program_abort)
+                self._program_progress["next_index"] = index + 1
+                self._confirm_program_index(index + 1)
+                continue
+            
+            if command.command_type == "WaitIdle":
+                # Barrier: everything queued so far must finish first
+                self._drain_window(in_flight)
+                self._execute_movement_sync(command, self._program_abort)
+            elif command.command_type == "Delay" and hasattr(robot, 'Delay'):
+                # Dwell on the robot side so the delay stays in sequence with queued motion
+                robot.Delay(command.parameters.get("duration", 0))
+            elif command.command_type == "Delay":
+                self._drain_window(in_flight)
+                self._execute_movement_sync(command)
+            else:
+                self._execute_movement_sync(command)
+            
+            self._program_progress["next_index"] = index + 1
+            
+            if command.command_type in MOTION_QUEUE_COMMANDS:
+                in_flight.append((index, robot.SetCheckpoint(self._next_checkpoint_id())))
+                depth = len(in_flight)
+                self._streaming_stats["queue_depth"] = depth
+                if depth > self._streaming_stats["max_queue_depth"]:
+                    self._streaming_stats["max_queue_depth"] = depth
+                
+                # Window full: wait for the oldest block to finish before sending more
+                while len(in_flight) >= window:
+                    self._wait_oldest_checkpoint(in_flight)
+            elif not in_flight:
+                self._confirm_program_index(index + 1)
+        
+        self._drain_window(in_flight)
+        self._confirm_program_index(len(commands))
+    
+    def _confirm_program_index(self, index: int):
+        """Advance the confirmed instruction index and report it to the progress callback"""
+        if index <= self._program_progress["confirmed_index"]:
+            return
+        self._program_progress["confirmed_index"] = index
+        if self._program_progress_callback:
+            try:
+                self._program_progress_callback(index)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Program progress callback failed at instruction {index}: {e}")
+    
+    def _next_checkpoint_id(self) -> int:
+        self._checkpoint_counter = self._checkpoint_counter % MAX_CHECKPOINT_ID + 1
+        return self._checkpoint_counter
+    
+    def _wait_oldest_checkpoint(self, in_flight: deque):
+        """Block until the oldest in-flight checkpoint is reached and record refill latency"""
+        index, checkpoint = in_flight[0]
+        wait_start = time.time()
+        deadline = wait_start + self.command_timeout
+        
+        while True:
+            if self._program_abort.is_set():
+                raise HardwareError(
+                    f"Program aborted while waiting on instruction {index} for robot {self.robot_id}",
+                    robot_id=self.robot_id
+                )
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise HardwareError(
+                    f"Instruction {index} not completed within {self.command_timeout}s for robot {self.robot_id}",
+                    robot_id=self.robot_id
+                )
+            try:
+                checkpoint.wait(timeout=min(0.1, remaining))
+                break
+            except Exception as e:
+                # mecademicpy raises TimeoutException on timeout, other errors mean the robot faulted
+                if "timeout" not in type(e).__name__.lower():
+                    raise HardwareError(
+                        f"Robot {self.robot_id} failed before completing instruction {index}: {e}",
+                        robot_id=self.robot_id
+                    )
+        
+        in_flight.popleft()
+        self._confirm_program_index(index + 1)
+        self._streaming_stats["queue_depth"] = len(in_flight)
+        
+        latency = time.time() - wait_start
+        stats = self._streaming_stats
+        stats["refills"] += 1
+        stats["total_refill_wait"] += latency
+        stats["average_refill_latency"] = stats["total_refill_wait"] / stats["refills"]
+        if latency > stats["max_refill_latency"]:
+            stats["max_refill_latency"] = latency
+    
+    def _drain_window(self, in_flight: deque):
+        while in_flight:
+            self._wait_oldest_checkpoint(in_flight)
+    
+    async def execute_uploaded_program(
+        self,
+        program_id: str,
+        program_number: int,
+        program_lines: List[str],
+        checkpoints: List[Tuple[int, int]],
+        start_index: int,
+        total_instructions: int,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ) -> CommandResult:
+        """
+        Store a program on the robot and run it from the robot's controller.
+
+        The program is saved into offline program slot `program_number` with the
+        text protocol (StartSaving/StopSaving), then started with one command.
+        Progress comes back through the checkpoints the program sets, each mapped
+        to the instruction index it confirms, so the result metadata matches
+        execute_program and a stopped run can be resumed the same way.
+
+        Args:
+            program_id: Identifier of the compiled program
+            program_number: Offline program slot on the robot
+            program_lines: Program commands, one per line (no comments)
+            checkpoints: (checkpoint id, confirmed instruction index) in program order
+            start_index: Instruction index the program starts at
+            total_instructions: Length of the full compiled program
+            timeout: Overall timeout for upload and run (None = no limit)
+            progress_callback: Called from the command thread with the new
+                confirmed index each time it advances
+        """
+        start_time = time.time()
+        self._program_abort.clear()
+        self._program_progress = {
+            "program_id": program_id,
+            "total_instructions": total_instructions,
+            "next_index": start_index,
+            "confirmed_index": start_index,
+            "running": True,
+            "mode": "upload"
+        }
+        self._program_progress_callback = progress_callback
+
+        self.logger.info(
+            f"📤 Uploading program {program_id} to robot {self.robot_id} slot {program_number}: "
+            f"{len(program_lines)} lines, {len(checkpoints)} checkpoints"
+        )
+
+        # The stored program sets motion parameters the wrapper never sees
+        self.invalidate_motion_state()
+        try:
+            await asyncio.wait_for(
+                self._run_uploaded_program(program_id, program_number, program_lines, checkpoints, total_instructions),
+                timeout=timeout
+            )
+            success, error = True, None
+        except asyncio.TimeoutError:
+            self._program_abort.set()
+            success, error = False, f"Program timeout after {timeout}s"
+        except Exception as e:
+            success, error = False, str(e)
+        finally:
+            self.invalidate_motion_state()
+            self._program_progress["running"] = False
+            self._program_progress_callback = None
+
+        execution_time = time.time() - start_time
+        next_index = self._program_progress["next_index"]
+        confirmed_index = self._program_progress["confirmed_index"]
+        await self._update_command_stats(CommandType.PROTOCOL, success, execution_time)
+
+        if success:
+            self.logger.info(f"Uploaded program {program_id} completed in {execution_time:.3f}s")
+        else:
+            self.logger.error(
+                f"Uploaded program {program_id} stopped after {execution_time:.3f}s "
+                f"(confirmed up to {confirmed_index}): {error}"
+            )
+
+        return CommandResult(
+            command_id=program_id,
+            success=success,
+            result={"instructions_sent": next_index - start_index, "program_number": program_number},
+            error=error,
+            execution_time=execution_time,
+            metadata={
+                "start_index": start_index,
+                "next_index": next_index,
+                "confirmed_index": confirmed_index,
+                "failed_index": None if success else confirmed_index,
+                "total_instructions": total_instructions,
+                "mode": "upload"
+            }
+        )
+
+    async def _run_uploaded_program(self, program_id: str, program_number: int, program_lines: List[str],
+                                     checkpoints: List[Tuple[int, int]], total_instructions: int):
+        robot = self.robot_driver.get_robot_instance() if hasattr(self.robot_driver, 'get_robot_instance') else None
+        missing = [
+            name for name in ("SendCustomCommand", "StartOfflineProgram", "ExpectExternalCheckpoint")
+            if not hasattr(robot, name)
+        ]
+        if missing:
+            raise HardwareError(
+                f"Robot {self.robot_id} does not support program upload (missing {', '.join(missing)})",
+                robot_id=self.robot_id
+            )
+
+        await self.io_channel.run_command(self._upload_program_sync, robot, program_number, program_lines)
+        self.logger.info(f"Program {program_id} stored in slot {program_number} - starting")
+        await self.io_channel.run_command(
+            self._run_uploaded_program_sync, robot, program_number, checkpoints, total_instructions
+        )
+
+    def _upload_program_sync(self, robot: Any, program_number: int, program_lines: List[str]) -> None:
+        """Save program lines into an offline program slot (runs in thread pool)"""
+        robot.SendCustomCommand(f"StartSaving({program_number})")
+        for line in program_lines:
+            if self._program_abort.is_set():
+                raise HardwareError(
+                    f"Program upload aborted for robot {self.robot_id}", robot_id=self.robot_id
+                )
+            robot.SendCustomCommand(line)
+        saved = robot.SendCustomCommand("StopSaving", expected_responses=[2061])
+        if saved is not None and hasattr(saved, 'wait'):
+            saved.wait(timeout=self.command_timeout)
+
+    def _run_uploaded_program_sync(self, robot: Any, program_number: int,
+                                   checkpoints: List[Tuple[int, int]], total_instructions: int) -> None:
+        """Start a stored program and follow its checkpoints (runs in thread pool)"""
+        # Register before starting so no checkpoint can be missed
+        in_flight = deque(
+            (index - 1, robot.ExpectExternalCheckpoint(checkpoint_id)) for checkpoint_id, index in checkpoints
+        )
+        robot.StartOfflineProgram(program_number)
+        self._program_progress["next_index"] = total_instructions
+        self._drain_window(in_flight)
+        self._confirm_program_index(total_instructions)
+
+    def abort_program(self):
+        """Stop a streaming program at the next instruction boundary"""
+        self._program_abort.set()
+        self.interrupt_delays()
+    
+    def get_program_progress(self) -> Dict[str, Any]:
+        """Snapshot of the current/last streamed program"""
+        return dict(self._program_progress)
     
     async def execute_batch(self, commands: List[MovementCommand]) -> List[CommandResult]:
         """
@@ -636,14 +1306,9 @@ class AsyncRobotWrapper:
         results = []
         
         try:
-            # Execute batch in thread pool
-            loop = asyncio.get_event_loop()
+            # Execute batch on the ordered command thread
             batch_results = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self.executor,
-                    self._execute_batch_sync,
-                    commands
-                ),
+                self._run_batch(commands),
                 timeout=self.command_timeout * len(commands)
             )
             
@@ -685,6 +1350,25 @@ class AsyncRobotWrapper:
             
             return results
     
+    async def _run_batch(self, commands: List[MovementCommand]) -> List[Any]:
+        """Run runs of commands on the command thread, with Delays between them as event-loop timers"""
+        results: List[Any] = []
+        segment: List[MovementCommand] = []
+        for command in commands + [None]:
+            if command is not None and command.command_type != "Delay":
+                segment.append(command)
+                continue
+            if segment:
+                results.extend(await self.io_channel.run_command(self._execute_batch_sync, segment))
+                segment = []
+            if command is not None:
+                try:
+                    await self.delay(1000.0 * (command.parameters or {}).get("duration", 0))
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        return results
+    
     def _execute_batch_sync(self, commands: List[MovementCommand]) -> List[Any]:
         """Execute batch of commands synchronously"""
         results = []
@@ -790,8 +1474,8 @@ class AsyncRobotWrapper:
         return {
             "robot_id": self.robot_id,
             "executor_stats": {
-                "max_workers": self.max_workers,
-                "active_threads": self.executor._threads.__len__() if hasattr(self.executor, '_threads') else 0
+                "shared_with_driver": not self._owns_io_channel,
+                **self.io_channel.get_stats()
             },
             "command_stats": self._command_stats.copy(),
             "batch_stats": {
@@ -802,7 +1486,15 @@ class AsyncRobotWrapper:
             "cache_stats": {
                 "status_cache_age": time.time() - self._last_status_check,
                 "status_cache_ttl": self._status_cache_ttl
-            }
+            },
+            "program_stats": self.get_program_progress(),
+            "delay_stats": dict(self._delay_stats),
+            "config_stats": {
+                **self._config_stats,
+                "tracked_parameters": {key: list(values) for key, values in self._motion_state.items()}
+            },
+            "streaming_stats": dict(self._streaming_stats),
+            "status_feed": self.status_feed.get_stats() if self.status_feed else None
         }
     
     async def reset_stats(self):
@@ -814,6 +1506,19 @@ class AsyncRobotWrapper:
             "average_execution_time": 0.0,
             "command_types": {}
         }
+        self._config_stats = {"sent": 0, "eliminated": 0, "invalidations": 0}
+        if hasattr(robot_driver, 'add_motion_cleared_listener'):
+            # ClearMotion discards queued Set* commands along with the motions
+            robot_driver.add_motion_cleared_listener(self.invalidate_motion_state)
+        self._delay_stats = {"loop_delays": 0, "loop_delay_time": 0.0, "thread_delays": 0, "thread_delay_time": 0.0, "interrupted": 0}
+        self._streaming_stats.update({
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "refills": 0,
+            "total_refill_wait": 0.0,
+            "average_refill_latency": 0.0,
+            "max_refill_latency": 0.0
+        })
         self.logger.info(f"Performance stats reset for robot {self.robot_id}")
 
 
@@ -830,10 +1535,10 @@ class AsyncRobotFactory:
         return AsyncRobotWrapper(
             robot_id=robot_id,
             robot_driver=meca_robot,
-            max_workers=config.get("max_workers", 4),
             command_timeout=config.get("timeout", 30.0),
             batch_size=config.get("batch_size", 10),
-            batch_timeout=config.get("batch_timeout", 0.1)
+            batch_timeout=config.get("batch_timeout", 0.1),
+            lookahead_window=config.get("lookahead_window", 8)
         )
     
     @staticmethod
@@ -846,7 +1551,6 @@ class AsyncRobotFactory:
         return AsyncRobotWrapper(
             robot_id=robot_id,
             robot_driver=ot2_client,
-            max_workers=config.get("max_workers", 2),  # OT2 typically needs fewer workers
             command_timeout=config.get("timeout"),  # Longer timeout for protocols
             batch_size=config.get("batch_size", 5),
             batch_timeout=config.get("batch_timeout", 0.2)
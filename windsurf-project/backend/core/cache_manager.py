@@ -4,9 +4,14 @@ Provides in-memory caching with TTL and invalidation strategies.
 """
 
 import asyncio
+import fnmatch
+import heapq
+import itertools
 import json
+import re
 import time
-from typing import Dict, Any, Optional, List, Callable
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Iterator, Pattern, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -33,11 +38,23 @@ class CacheEntry:
     access_count: int = 0
     last_accessed: float = field(default_factory=time.time)
     tags: List[str] = field(default_factory=list)
+    # How long past its TTL get_or_set may still serve the entry while refreshing it
+    stale_ttl: float = 0.0
     
     @property
     def is_expired(self) -> bool:
         """Check if cache entry has expired"""
         return time.time() - self.created_at > self.ttl
+
+    @property
+    def discard_at(self) -> float:
+        """Time after which the entry is expired and past its stale window"""
+        return self.created_at + self.ttl + self.stale_ttl
+
+    @property
+    def is_discardable(self) -> bool:
+        """Check if cache entry is expired and past its stale window"""
+        return time.time() > self.discard_at
     
     @property
     def age(self) -> float:
@@ -58,6 +75,80 @@ class CacheInvalidationStrategy(Enum):
     TAG_BASED = "tag_based"  # Tag-based invalidation
 
 
+# Cache keys are namespaced with ":" (e.g. "robot_status:meca"); the key index
+# is a trie over these segments
+KEY_SEPARATOR = ":"
+WILDCARD_CHARS = "*?["
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Part of an fnmatch pattern before its first wildcard"""
+    for i, char in enumerate(pattern):
+        if char in WILDCARD_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+class _KeyTrieNode:
+    __slots__ = ("children", "key")
+
+    def __init__(self):
+        self.children: Dict[str, "_KeyTrieNode"] = {}
+        self.key: Optional[str] = None
+
+
+class KeyTrie:
+    """Trie over ":"-separated key segments, for prefix lookups that touch only matching keys"""
+
+    def __init__(self):
+        self._root = _KeyTrieNode()
+
+    def add(self, key: str):
+        node = self._root
+        for segment in key.split(KEY_SEPARATOR):
+            node = node.children.setdefault(segment, _KeyTrieNode())
+        node.key = key
+
+    def remove(self, key: str):
+        path = [self._root]
+        segments = key.split(KEY_SEPARATOR)
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].key = None
+        # Prune empty branches
+        for segment, node, parent in zip(reversed(segments), reversed(path[1:]), reversed(path[:-1])):
+            if node.key is not None or node.children:
+                break
+            del parent.children[segment]
+
+    def clear(self):
+        self._root = _KeyTrieNode()
+
+    def keys_with_prefix(self, prefix: str) -> Iterator[str]:
+        segments = prefix.split(KEY_SEPARATOR)
+        node = self._root
+        for segment in segments[:-1]:
+            node = node.children.get(segment)
+            if node is None:
+                return
+        partial = segments[-1]
+        for segment, child in node.children.items():
+            if segment.startswith(partial):
+                yield from self._subtree(child)
+
+    @staticmethod
+    def _subtree(node: _KeyTrieNode) -> Iterator[str]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.key is not None:
+                yield node.key
+            stack.extend(node.children.values())
+
+
 class InMemoryCacheManager:
     """
     High-performance in-memory cache manager for robot status and configuration data.
@@ -66,8 +157,17 @@ class InMemoryCacheManager:
     - TTL-based expiration
     - Tag-based invalidation
     - Statistics and monitoring
-    - Async-safe operations
+    - Async-safe operations: writers serialize on a lock; reads take no lock and
+      rely on the event loop not switching tasks between lookup and return
     - Memory usage tracking
+    - O(1) get, set and eviction: entries are kept in an ordered dict (insertion
+      order, or recency order for LRU) plus access-count buckets for LFU
+    - Indexed invalidation: tag -> keys, a key-segment trie for patterns, and
+      invalidation callbacks grouped by exact key and key namespace
+    - Single-flight get_or_set: concurrent misses on a key share one factory call,
+      optionally serving the stale value while one background refresh runs
+    - Expiry heap: cleanup pops only the entries that are due, and the oldest entry
+      is read from the front of the creation order
     """
 
     def __init__(
@@ -82,12 +182,31 @@ class InMemoryCacheManager:
         self.cleanup_interval = cleanup_interval
         self.invalidation_strategy = invalidation_strategy
         
-        self._cache: Dict[str, CacheEntry] = {}
+        # Insertion order (oldest first); for LRU, recency order (least recent first)
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # LFU: access count -> keys with that count (least recently used first)
+        self._freq_buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_freq = 0
+        # LRU reorders _cache by recency, so it tracks creation order separately
+        self._created_order: Optional["OrderedDict[str, None]"] = (
+            OrderedDict() if invalidation_strategy == CacheInvalidationStrategy.LRU else None
+        )
+        # (discard_at, seq, key, entry); replaced or removed entries are skipped when popped
+        self._expiry_heap: List[Tuple[float, int, str, CacheEntry]] = []
+        self._expiry_seq = itertools.count()
+        # Invalidation indexes: tag -> keys, and a trie of keys for pattern lookups
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._key_trie = KeyTrie()
+        # get_or_set factory calls in flight, one per key
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._inflight_tags: Dict[str, List[str]] = {}
         self._lock = asyncio.Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
         self._stats = {
             "hits": 0,
             "misses": 0,
+            "stale_hits": 0,
+            "coalesced": 0,
             "evictions": 0,
             "total_entries": 0,
             "memory_usage": 0
@@ -95,8 +214,11 @@ class InMemoryCacheManager:
         
         self.logger = logging.getLogger("cache_manager")
         
-        # Invalidation callbacks
+        # Invalidation callbacks, indexed by exact key, or for wildcard patterns by the
+        # namespace (first key segment) their literal prefix pins down ("" if none)
         self._invalidation_callbacks: Dict[str, List[Callable]] = {}
+        self._exact_callbacks: Dict[str, List[Callable]] = {}
+        self._wildcard_callbacks: Dict[str, List[Tuple[Pattern, List[Callable]]]] = {}
 
     async def start(self):
         """Start the cache manager and cleanup task"""
@@ -127,28 +249,29 @@ class InMemoryCacheManager:
         Returns:
             Cached value or None if not found/expired
         """
-        async with self._lock:
-            entry = self._cache.get(key)
-            
-            if entry is None:
-                self._stats["misses"] += 1
-                return None
-            
-            if entry.is_expired:
-                await self._remove_entry(key)
-                self._stats["misses"] += 1
-                return None
-            
-            entry.touch()
+        # Lock-free: nothing between the lookup and the return awaits, so no writer
+        # can interleave, and readers never queue behind one awaiting callbacks
+        entry = self._cache.get(key)
+        if entry is not None and not entry.is_expired:
+            self._record_access(key, entry)
             self._stats["hits"] += 1
             return entry.value
+        
+        self._stats["misses"] += 1
+        # Entries inside their stale window stay for get_or_set to serve
+        if entry is not None and entry.is_discardable:
+            async with self._lock:
+                if self._cache.get(key) is entry:
+                    await self._remove_entry(key)
+        return None
 
     async def set(
         self,
         key: str,
         value: Any,
         ttl: Optional[float] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        stale_ttl: float = 0.0
     ) -> bool:
         """
         Set value in cache.
@@ -158,33 +281,52 @@ class InMemoryCacheManager:
             value: Value to cache
             ttl: Time to live in seconds (uses default if None)
             tags: Tags for invalidation
+            stale_ttl: Seconds past the TTL get_or_set may serve the value while refreshing
             
         Returns:
             True if set successfully
         """
+        async with self._lock:
+            await self._store(key, value, ttl, tags, stale_ttl)
+            return True
+
+    async def _store(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float],
+        tags: Optional[List[str]],
+        stale_ttl: float
+    ):
+        """Insert or replace an entry (caller holds the lock)"""
         if ttl is None:
             ttl = self.default_ttl
         
         if tags is None:
             tags = []
 
-        async with self._lock:
-            # Check if we need to evict entries
-            if len(self._cache) >= self.max_size:
-                await self._evict_entries()
-
-            entry = CacheEntry(
-                value=value,
-                created_at=time.time(),
-                ttl=ttl,
-                tags=tags
-            )
-            
-            self._cache[key] = entry
-            self._stats["total_entries"] = len(self._cache)
-            
-            self.logger.debug(f"Cached entry: {key} (TTL: {ttl}s, Tags: {tags})")
-            return True
+        # Replacing an entry starts it over (new age, no accesses)
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._unindex_entry(key, previous)
+        
+        # Check if we need to evict entries
+        if len(self._cache) >= self.max_size:
+            await self._evict_entries()
+
+        entry = CacheEntry(
+            value=value,
+            created_at=time.time(),
+            ttl=ttl,
+            tags=tags,
+            stale_ttl=stale_ttl
+        )
+        
+        self._cache[key] = entry
+        self._index_entry(key, entry)
+        self._stats["total_entries"] = len(self._cache)
+        
+        self.logger.debug(f"Cached entry: {key} (TTL: {ttl}s, Tags: {tags})")
 
     async def delete(self, key: str) -> bool:
         """
@@ -197,6 +339,7 @@ class InMemoryCacheManager:
             True if deleted, False if not found
         """
         async with self._lock:
+            self._abandon_load(key)
             if key in self._cache:
                 await self._remove_entry(key)
                 return True
@@ -213,14 +356,12 @@ class InMemoryCacheManager:
             Number of entries invalidated
         """
         async with self._lock:
-            keys_to_remove = []
-            
-            for key, entry in self._cache.items():
-                if tag in entry.tags:
-                    keys_to_remove.append(key)
+            keys_to_remove = list(self._tag_index.get(tag, ()))
             
             for key in keys_to_remove:
                 await self._remove_entry(key)
+            for key in [key for key, load_tags in self._inflight_tags.items() if tag in load_tags]:
+                self._abandon_load(key)
             
             self.logger.info(f"Invalidated {len(keys_to_remove)} entries with tag: {tag}")
             return len(keys_to_remove)
@@ -235,17 +376,13 @@ class InMemoryCacheManager:
         Returns:
             Number of entries invalidated
         """
-        import fnmatch
-        
         async with self._lock:
-            keys_to_remove = []
-            
-            for key in self._cache.keys():
-                if fnmatch.fnmatch(key, pattern):
-                    keys_to_remove.append(key)
+            keys_to_remove = self._match_keys(pattern)
             
             for key in keys_to_remove:
                 await self._remove_entry(key)
+            for key in [key for key in self._inflight if fnmatch.fnmatchcase(key, pattern)]:
+                self._abandon_load(key)
             
             self.logger.info(f"Invalidated {len(keys_to_remove)} entries matching pattern: {pattern}")
             return len(keys_to_remove)
@@ -255,33 +392,102 @@ class InMemoryCacheManager:
         key: str,
         factory: Callable,
         ttl: Optional[float] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        stale_ttl: float = 0.0
     ) -> Any:
         """
         Get value from cache, or set it using factory function if not found.
         
+        Concurrent misses on the same key await a single factory call. With
+        stale_ttl, an entry up to stale_ttl seconds past its TTL is returned
+        as-is while one background refresh replaces it.
+        
         Args:
             key: Cache key
             factory: Function to generate value if not cached
             ttl: Time to live in seconds
             tags: Tags for invalidation
+            stale_ttl: Seconds past the TTL to serve the old value while refreshing
             
         Returns:
             Cached or newly generated value
         """
-        value = await self.get(key)
-        
-        if value is not None:
-            return value
+        entry = self._cache.get(key)
+        if entry is not None and not entry.is_expired:
+            self._record_access(key, entry)
+            self._stats["hits"] += 1
+            return entry.value
         
-        # Generate new value
-        if asyncio.iscoroutinefunction(factory):
-            value = await factory()
-        else:
-            value = factory()
+        async with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and not entry.is_expired:
+                self._record_access(key, entry)
+                self._stats["hits"] += 1
+                return entry.value
+            
+            if entry is not None and not entry.is_discardable:
+                self._stats["stale_hits"] += 1
+                self._start_load(key, factory, ttl, tags, stale_ttl)
+                return entry.value
+            
+            self._stats["misses"] += 1
+            if key in self._inflight:
+                self._stats["coalesced"] += 1
+            load = self._start_load(key, factory, ttl, tags, stale_ttl)
         
-        await self.set(key, value, ttl, tags)
-        return value
+        # Shielded so a cancelled caller does not cancel the load others are awaiting
+        return await asyncio.shield(load)
+
+    def _start_load(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: Optional[float],
+        tags: Optional[List[str]],
+        stale_ttl: float
+    ) -> asyncio.Task:
+        """Return the in-flight factory call for key, starting one if there is none"""
+        load = self._inflight.get(key)
+        if load is None:
+            load = asyncio.ensure_future(self._load(key, factory, ttl, tags, stale_ttl))
+            load.add_done_callback(self._on_load_done)
+            self._inflight[key] = load
+            self._inflight_tags[key] = tags or []
+        return load
+
+    async def _load(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: Optional[float],
+        tags: Optional[List[str]],
+        stale_ttl: float
+    ) -> Any:
+        load = asyncio.current_task()
+        try:
+            if asyncio.iscoroutinefunction(factory):
+                value = await factory()
+            else:
+                value = factory()
+            
+            # Skip the write if the key was invalidated while the factory ran
+            async with self._lock:
+                if self._inflight.get(key) is load:
+                    await self._store(key, value, ttl, tags, stale_ttl)
+            return value
+        finally:
+            if self._inflight.get(key) is load:
+                self._abandon_load(key)
+
+    def _on_load_done(self, load: asyncio.Task):
+        # Background refreshes have no awaiting caller, so failures are logged here
+        if not load.cancelled() and load.exception() is not None:
+            self.logger.warning(f"⚠️ Cache factory failed: {load.exception()}")
+
+    def _abandon_load(self, key: str):
+        """Detach an in-flight load so its result is not written back after an invalidation"""
+        self._inflight.pop(key, None)
+        self._inflight_tags.pop(key, None)
 
     async def clear(self) -> int:
         """
@@ -293,6 +499,15 @@ class InMemoryCacheManager:
         async with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._freq_buckets.clear()
+            self._min_freq = 0
+            self._expiry_heap.clear()
+            if self._created_order is not None:
+                self._created_order.clear()
+            self._tag_index.clear()
+            self._key_trie.clear()
+            self._inflight.clear()
+            self._inflight_tags.clear()
             self._stats["total_entries"] = 0
             self._stats["evictions"] += count
             
@@ -300,21 +515,20 @@ class InMemoryCacheManager:
             return count
 
     async def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        async with self._lock:
-            hit_rate = 0.0
-            total_requests = self._stats["hits"] + self._stats["misses"]
-            if total_requests > 0:
-                hit_rate = self._stats["hits"] / total_requests
-
-            return {
-                **self._stats,
-                "hit_rate": hit_rate,
-                "current_size": len(self._cache),
-                "max_size": self.max_size,
-                "oldest_entry_age": await self._get_oldest_entry_age(),
-                "cleanup_interval": self.cleanup_interval
-            }
+        """Get cache statistics (read without the lock; may lag a writer in progress)"""
+        hit_rate = 0.0
+        total_requests = self._stats["hits"] + self._stats["misses"]
+        if total_requests > 0:
+            hit_rate = self._stats["hits"] / total_requests
+
+        return {
+            **self._stats,
+            "hit_rate": hit_rate,
+            "current_size": len(self._cache),
+            "max_size": self.max_size,
+            "oldest_entry_age": await self._get_oldest_entry_age(),
+            "cleanup_interval": self.cleanup_interval
+        }
 
     async def register_invalidation_callback(self, pattern: str, callback: Callable):
         """
@@ -326,32 +540,101 @@ class InMemoryCacheManager:
         """
         if pattern not in self._invalidation_callbacks:
             self._invalidation_callbacks[pattern] = []
+            prefix = _literal_prefix(pattern)
+            if prefix == pattern:
+                self._exact_callbacks[pattern] = self._invalidation_callbacks[pattern]
+            else:
+                namespace = prefix.split(KEY_SEPARATOR, 1)[0] if KEY_SEPARATOR in prefix else ""
+                self._wildcard_callbacks.setdefault(namespace, []).append(
+                    (re.compile(fnmatch.translate(pattern)), self._invalidation_callbacks[pattern])
+                )
         
         self._invalidation_callbacks[pattern].append(callback)
 
     async def _remove_entry(self, key: str):
         """Remove entry and trigger callbacks"""
-        if key in self._cache:
-            del self._cache[key]
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._unindex_entry(key, entry)
             self._stats["total_entries"] = len(self._cache)
             
             # Trigger invalidation callbacks
             await self._trigger_invalidation_callbacks(key)
 
+    def _record_access(self, key: str, entry: CacheEntry):
+        """Count a hit and keep the eviction order up to date (O(1))"""
+        if self.invalidation_strategy == CacheInvalidationStrategy.LFU:
+            count = entry.access_count
+            bucket = self._freq_buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._freq_buckets[count]
+                if self._min_freq == count:
+                    self._min_freq = count + 1
+            self._freq_buckets.setdefault(count + 1, OrderedDict())[key] = None
+        elif self.invalidation_strategy == CacheInvalidationStrategy.LRU:
+            self._cache.move_to_end(key)
+        entry.touch()
+
+    def _match_keys(self, pattern: str) -> List[str]:
+        """Keys matching an fnmatch pattern, checking only keys under its literal prefix"""
+        prefix = _literal_prefix(pattern)
+        if prefix == pattern:
+            return [pattern] if pattern in self._cache else []
+        regex = re.compile(fnmatch.translate(pattern))
+        return [key for key in self._key_trie.keys_with_prefix(prefix) if regex.match(key)]
+
+    def _index_entry(self, key: str, entry: CacheEntry):
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._key_trie.add(key)
+        if self._created_order is not None:
+            self._created_order[key] = None
+        self._schedule_expiry(key, entry)
+        if self.invalidation_strategy == CacheInvalidationStrategy.LFU:
+            # New entries have no accesses yet, so they are always in the lowest bucket
+            self._freq_buckets.setdefault(entry.access_count, OrderedDict())[key] = None
+            self._min_freq = entry.access_count
+
+    def _unindex_entry(self, key: str, entry: CacheEntry):
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        self._key_trie.remove(key)
+        if self._created_order is not None:
+            self._created_order.pop(key, None)
+        if self.invalidation_strategy == CacheInvalidationStrategy.LFU:
+            bucket = self._freq_buckets.get(entry.access_count)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._freq_buckets[entry.access_count]
+
     async def _trigger_invalidation_callbacks(self, key: str):
         """Trigger invalidation callbacks for key"""
-        import fnmatch
-        
-        for pattern, callbacks in self._invalidation_callbacks.items():
-            if fnmatch.fnmatch(key, pattern):
-                for callback in callbacks:
-                    try:
-                        if asyncio.iscoroutinefunction(callback):
-                            await callback(key)
-                        else:
-                            callback(key)
-                    except Exception as e:
-                        self.logger.error(f"Error in invalidation callback for {key}: {e}")
+        for callbacks in self._callbacks_for_key(key):
+            for callback in callbacks:
+                try:
+                    if asyncio.iscoroutinefunction(callback):
+                        await callback(key)
+                    else:
+                        callback(key)
+                except Exception as e:
+                    self.logger.error(f"Error in invalidation callback for {key}: {e}")
+
+    def _callbacks_for_key(self, key: str) -> Iterator[List[Callable]]:
+        """Callback lists whose pattern matches key, checking only the key's own namespace"""
+        exact = self._exact_callbacks.get(key)
+        if exact:
+            yield exact
+        namespace = key.split(KEY_SEPARATOR, 1)[0] if KEY_SEPARATOR in key else None
+        for group in (namespace, ""):
+            for regex, callbacks in self._wildcard_callbacks.get(group, ()):
+                if regex.match(key):
+                    yield callbacks
 
     async def _evict_entries(self):
         """Evict entries based on invalidation strategy"""
@@ -363,29 +646,34 @@ class InMemoryCacheManager:
             await self._evict_oldest()
 
     async def _evict_lru(self):
-        """Evict least recently used entry"""
+        """Evict least recently used entry (front of the recency-ordered dict)"""
         if not self._cache:
             return
         
-        lru_key = min(self._cache.keys(), key=lambda k: self._cache[k].last_accessed)
+        lru_key = next(iter(self._cache))
         await self._remove_entry(lru_key)
         self._stats["evictions"] += 1
 
     async def _evict_lfu(self):
-        """Evict least frequently used entry"""
+        """Evict least frequently used entry (least recent within the lowest access-count bucket)"""
         if not self._cache:
             return
         
-        lfu_key = min(self._cache.keys(), key=lambda k: self._cache[k].access_count)
+        bucket = self._freq_buckets.get(self._min_freq)
+        if not bucket:
+            # Lowest bucket emptied by a delete/expiry: re-derive from the bucket counts
+            self._min_freq = min(self._freq_buckets)
+            bucket = self._freq_buckets[self._min_freq]
+        lfu_key = next(iter(bucket))
         await self._remove_entry(lfu_key)
         self._stats["evictions"] += 1
 
     async def _evict_oldest(self):
-        """Evict oldest entry"""
+        """Evict oldest entry (front of the insertion-ordered dict)"""
         if not self._cache:
             return
         
-        oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k].created_at)
+        oldest_key = next(iter(self._cache))
         await self._remove_entry(oldest_key)
         self._stats["evictions"] += 1
 
@@ -400,13 +688,25 @@ class InMemoryCacheManager:
             except Exception as e:
                 self.logger.error(f"Error in cleanup loop: {e}")
 
+    def _schedule_expiry(self, key: str, entry: CacheEntry):
+        heapq.heappush(self._expiry_heap, (entry.discard_at, next(self._expiry_seq), key, entry))
+        # Compact once skipped (replaced/removed) items outnumber live ones
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                (live.discard_at, next(self._expiry_seq), live_key, live)
+                for live_key, live in self._cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
     async def _cleanup_expired(self):
-        """Remove expired entries"""
+        """Remove expired entries (pops only the heap items that are due)"""
         async with self._lock:
             expired_keys = []
+            now = time.time()
             
-            for key, entry in self._cache.items():
-                if entry.is_expired:
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                _, _, key, entry = heapq.heappop(self._expiry_heap)
+                if self._cache.get(key) is entry:
                     expired_keys.append(key)
             
             for key in expired_keys:
@@ -420,8 +720,8 @@ class InMemoryCacheManager:
         if not self._cache:
             return 0.0
         
-        oldest_time = min(entry.created_at for entry in self._cache.values())
-        return time.time() - oldest_time
+        order = self._created_order if self._created_order is not None else self._cache
+        return time.time() - self._cache[next(iter(order))].created_at
 
 
 class RobotStatusCache:
@@ -449,6 +749,18 @@ class RobotStatusCache:
         tags = ["robot_status", f"robot:{robot_id}"]
         return await self.cache_manager.set(key, status, ttl, tags)
 
+    async def get_or_fetch_robot_status(
+        self,
+        robot_id: str,
+        fetch: Callable,
+        ttl: float = 30.0,
+        stale_ttl: float = 0.0
+    ) -> Dict[str, Any]:
+        """Get cached robot status, fetching it once for all concurrent callers on a miss"""
+        key = f"{CacheKey.ROBOT_STATUS.value}:{robot_id}"
+        tags = ["robot_status", f"robot:{robot_id}"]
+        return await self.cache_manager.get_or_set(key, fetch, ttl, tags, stale_ttl)
+
     async def invalidate_robot_status(self, robot_id: str) -> bool:
         """Invalidate specific robot status"""
         key = f"{CacheKey.ROBOT_STATUS.value}:{robot_id}"
@@ -0,0 +1,100 @@
+"""
+Per-robot I/O channel for synchronous robot SDK calls.
+Provides one ordered command thread, a status thread and a motion-control
+thread per robot.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class RobotIOChannel:
+    """
+    Dedicated threads for a single robot's blocking SDK calls.
+
+    - command thread: motion, configuration, activation, homing and WaitIdle.
+      A single worker means commands execute in submission order by construction.
+    - status thread: status reads, pings and emergency stop. These never queue
+      behind a long WaitIdle or a streamed program on the command thread.
+    - control thread: ClearMotion, ResumeMotion, ResetError and PauseMotion. Fault
+      recovery must not wait for a blocked wait on the command thread to give up;
+      ClearMotion also interrupts that wait.
+
+    Thread count stays at three per robot regardless of load.
+    """
+
+    def __init__(self, robot_id: str):
+        self.robot_id = robot_id
+        self.command_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"robot_{robot_id}_cmd"
+        )
+        self.status_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"robot_{robot_id}_status"
+        )
+        self.control_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"robot_{robot_id}_control"
+        )
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "command": {"submitted": 0, "pending": 0, "max_pending": 0, "busy_time": 0.0},
+            "status": {"submitted": 0, "pending": 0, "max_pending": 0, "busy_time": 0.0},
+            "control": {"submitted": 0, "pending": 0, "max_pending": 0, "busy_time": 0.0}
+        }
+        self._closed = False
+
+    async def run_command(self, func: Callable, *args) -> Any:
+        """Run a blocking call on the ordered command thread"""
+        return await self._run("command", self.command_executor, func, *args)
+
+    async def run_status(self, func: Callable, *args) -> Any:
+        """Run a blocking call on the status thread"""
+        return await self._run("status", self.status_executor, func, *args)
+
+    async def run_control(self, func: Callable, *args) -> Any:
+        """Run a motion-control call (clear/resume/reset/pause) on the control thread"""
+        return await self._run("control", self.control_executor, func, *args)
+
+    async def _run(self, lane: str, executor: ThreadPoolExecutor, func: Callable, *args) -> Any:
+        stats = self._stats[lane]
+        with self._stats_lock:
+            stats["submitted"] += 1
+            stats["pending"] += 1
+            stats["max_pending"] = max(stats["max_pending"], stats["pending"])
+
+        def _timed():
+            started = time.time()
+            try:
+                return func(*args)
+            finally:
+                with self._stats_lock:
+                    stats["busy_time"] += time.time() - started
+
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(executor, _timed)
+        finally:
+            with self._stats_lock:
+                stats["pending"] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "threads": 3,
+                "command": dict(self._stats["command"]),
+                "status": dict(self._stats["status"]),
+                "control": dict(self._stats["control"])
+            }
+
+    def shutdown(self, wait: bool = True):
+        if self._closed:
+            return
+        self._closed = True
+        self.command_executor.shutdown(wait=wait)
+        self.status_executor.shutdown(wait=wait)
+        self.control_executor.shutdown(wait=wait)
@@ -0,0 +1,249 @@
+"""
+Event-driven robot status feed.
+Keeps a lock-free latest-status snapshot per robot and fires asyncio events on
+error, pause and connection edges so consumers can await changes instead of polling.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .robot_io_channel import RobotIOChannel
+
+
+@dataclass(frozen=True)
+class RobotStatusSnapshot:
+    """Immutable view of the robot state at one point in time"""
+    robot_id: str
+    connected: bool = False
+    activated: bool = False
+    homed: bool = False
+    error: bool = False
+    paused: bool = False
+    end_of_block: bool = False
+    gripper_holding: Optional[bool] = None
+    position: Optional[Tuple[float, ...]] = None
+    sequence: int = 0
+    timestamp: float = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+    @property
+    def faulted(self) -> bool:
+        """True when motion cannot continue (error, paused or disconnected)"""
+        return self.error or self.paused or not self.connected
+
+    def to_status_dict(self) -> Dict[str, Any]:
+        """Status in the same shape as MecademicDriver._get_status_sync"""
+        status = {
+            "connected": self.connected,
+            "timestamp": self.timestamp,
+            "robot_id": self.robot_id,
+            "activation_status": self.activated,
+            "homing_status": self.homed,
+            "error_status": self.error,
+            "paused": self.paused,
+            "end_of_cycle": self.end_of_block,
+            "motion_complete": self.end_of_block,
+            "sequence": self.sequence
+        }
+        if self.gripper_holding is not None:
+            status["gripper_holding"] = self.gripper_holding
+        if self.position is not None:
+            status["position"] = dict(zip(("x", "y", "z", "alpha", "beta", "gamma"), self.position))
+        return status
+
+
+# Snapshot fields whose transitions are reported as edges
+EDGE_FIELDS = ("connected", "activated", "homed", "error", "paused")
+
+
+class RobotStatusFeed:
+    """
+    Background status subscription for one robot.
+
+    Readers call latest() and get the current snapshot in O(1) without taking
+    any lock. Writers (the refresh loop on the status thread, or SDK callbacks
+    pushed through publish()) swap in a new immutable snapshot.
+
+    Edges on error/paused/connected are mirrored into asyncio Events:
+    - error_event / paused_event / disconnected_event are set while the condition holds
+    - fault_event is set while any of them holds
+    """
+
+    def __init__(
+        self,
+        robot_id: str,
+        reader: Callable[[], Dict[str, Any]],
+        io_channel: RobotIOChannel,
+        poll_interval: float = 0.05,
+        heartbeat_interval: float = 1.0
+    ):
+        self.robot_id = robot_id
+        self._reader = reader
+        self._io_channel = io_channel
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+
+        self._snapshot = RobotStatusSnapshot(robot_id=robot_id)
+        self._applied = self._snapshot
+        self._write_lock = threading.Lock()
+        self._last_push = 0.0
+
+        self.error_event = asyncio.Event()
+        self.paused_event = asyncio.Event()
+        self.disconnected_event = asyncio.Event()
+        self.fault_event = asyncio.Event()
+        self._changed = asyncio.Event()
+        self.disconnected_event.set()
+        self.fault_event.set()
+
+        self._edge_listeners: List[Callable[[str, Any, Any, RobotStatusSnapshot], None]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"updates": 0, "pushed_updates": 0, "edges": 0, "read_failures": 0}
+
+        self.logger = logging.getLogger(f"status_feed.{robot_id}")
+
+    def latest(self) -> RobotStatusSnapshot:
+        """Current snapshot (O(1), no lock)"""
+        return self._snapshot
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self.running and self._snapshot.timestamp > 0 and self._snapshot.age <= max_age
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_edge_listener(self, listener: Callable[[str, Any, Any, RobotStatusSnapshot], None]):
+        """Register listener(field, old_value, new_value, snapshot), called on the event loop"""
+        self._edge_listeners.append(listener)
+
+    def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_event_loop()
+        self._task = asyncio.create_task(self._refresh_loop())
+        self.logger.info(f"Status feed started for robot {self.robot_id}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.publish({"connected": False})
+
+    def publish(self, raw: Dict[str, Any], pushed: bool = False):
+        """
+        Publish a status reading. Safe to call from any thread (e.g. SDK callbacks).
+
+        Keys not present in raw keep their previous value.
+        """
+        with self._write_lock:
+            previous = self._snapshot
+            changes = {k: raw[k] for k in (
+                "connected", "activated", "homed", "error", "paused", "end_of_block", "gripper_holding"
+            ) if k in raw}
+            if "position" in raw and raw["position"] is not None:
+                changes["position"] = tuple(raw["position"])
+            snapshot = replace(previous, sequence=previous.sequence + 1, timestamp=time.time(), **changes)
+            self._snapshot = snapshot
+            self._stats["updates"] += 1
+            if pushed:
+                self._stats["pushed_updates"] += 1
+                self._last_push = snapshot.timestamp
+
+        if self._loop is None:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._apply(snapshot)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._apply, snapshot)
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> RobotStatusSnapshot:
+        """Wait for the next published snapshot"""
+        changed = self._changed
+        await asyncio.wait_for(changed.wait(), timeout=timeout)
+        return self._snapshot
+
+    async def wait_for_fault(self, timeout: Optional[float] = None) -> RobotStatusSnapshot:
+        """Wait until the robot reports an error, pause or disconnect"""
+        await asyncio.wait_for(self.fault_event.wait(), timeout=timeout)
+        return self._snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            **self._stats,
+            "running": self.running,
+            "sequence": snapshot.sequence,
+            "snapshot_age": snapshot.age if snapshot.timestamp else None,
+            "push_active": self._push_active()
+        }
+
+    def _push_active(self) -> bool:
+        return self._last_push > 0 and time.time() - self._last_push < self.heartbeat_interval * 2
+
+    def _apply(self, snapshot: RobotStatusSnapshot):
+        """Process edges for a snapshot (event loop thread only)"""
+        if snapshot.sequence <= self._applied.sequence:
+            return
+        previous = self._applied
+        self._applied = snapshot
+
+        for name in EDGE_FIELDS:
+            old, new = getattr(previous, name), getattr(snapshot, name)
+            if old != new:
+                self._stats["edges"] += 1
+                self.logger.info(f"Robot {self.robot_id} status edge: {name} {old} -> {new}")
+                for listener in self._edge_listeners:
+                    try:
+                        listener(name, old, new, snapshot)
+                    except Exception as e:
+                        self.logger.error(f"Status edge listener failed: {e}")
+
+        self._set_event(self.error_event, snapshot.error)
+        self._set_event(self.paused_event, snapshot.paused)
+        self._set_event(self.disconnected_event, not snapshot.connected)
+        self._set_event(self.fault_event, snapshot.faulted)
+
+        # Wake everyone waiting for the next change, then arm a fresh event
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    @staticmethod
+    def _set_event(event: asyncio.Event, active: bool):
+        if active and not event.is_set():
+            event.set()
+        elif not active and event.is_set():
+            event.clear()
+
+    async def _refresh_loop(self):
+        """Refresh the snapshot from the robot's mirrored state on the status thread"""
+        while True:
+            try:
+                raw = await self._io_channel.run_status(self._reader)
+                self.publish(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["read_failures"] += 1
+                self.logger.warning(f"Status feed read failed for robot {self.robot_id}: {e}")
+                self.publish({"connected": False})
+
+            # When the SDK pushes updates we only need a slow heartbeat
+            interval = self.heartbeat_interval if self._push_active() else self.poll_interval
+            await asyncio.sleep(interval)
@@ -132,6 +132,11 @@ class RoboticsSettings(BaseSettings):
     meca_timeout: float = Field(default=30.0, gt=0)
     meca_retry_attempts: int = Field(default=3, ge=1)
     meca_retry_delay: float = Field(default=1.0, gt=0)
+    meca_lookahead_window: int = Field(default=8, ge=1, le=64)  # Motion commands kept queued ahead on the robot
+    meca_simulate: bool = Field(default=False)  # Drive the in-process robot simulator instead of hardware
+    meca_simulation_time_scale: float = Field(default=1.0, ge=0)  # Simulator speed: 1.0 real time, 0 instant
+    meca_checkpoint_journal: str = Field(default="data/meca_checkpoints.jsonl")  # Compiled-sequence progress journal
+    meca_standby_monitor: bool = Field(default=False)  # Keep a monitoring-only socket open for fast failover
 
     # Meca Movement Parameters (from legacy Meca_FullCode.py)
     meca_force: float = Field(default=100.0, gt=0)  # Gripper force
@@ -144,6 +149,7 @@ class RoboticsSettings(BaseSettings):
     meca_close_width: float = Field(default=1.0, gt=0)  # CLOSE_WIDTH - gripper close width
     meca_spread_wait: float = Field(default=2.0, gt=0)  # SPREAD_WAIT - spreading wait time
     meca_gap_wafers: float = Field(default=2.7, gt=0)  # GAP_WAFERS - distance between wafers
+    meca_confirmed_actions: bool = Field(default=False)  # End gripper/settle delays on hardware confirmation
     
     # Meca Position Coordinates (JSON format: [x, y, z, alpha, beta, gamma])
     meca_first_wafer: str = Field(default="[173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059]")
@@ -396,6 +402,8 @@ class RoboticsSettings(BaseSettings):
                 "timeout": self.meca_timeout,
                 "retry_attempts": self.meca_retry_attempts,
                 "retry_delay": self.meca_retry_delay,
+                "checkpoint_journal": self.meca_checkpoint_journal,
+                "standby_monitor": self.meca_standby_monitor,
                 "movement_params": {
                     "force": self.meca_force,
                     "acceleration": self.meca_acceleration,
@@ -407,6 +415,7 @@ class RoboticsSettings(BaseSettings):
                     "close_width": self.meca_close_width,
                     "spread_wait": self.meca_spread_wait,
                     "gap_wafers": self.meca_gap_wafers,
+                    "confirmed_actions": self.meca_confirmed_actions,
                 },
                 "positions": {
                     "first_wafer": self._parse_position_json(self.meca_first_wafer),
@@ -8,11 +8,16 @@ import time
 import logging
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Optional, List, Callable, Any, Set
+from typing import Dict, Optional, List, Callable, Any, Set, Awaitable, TypeVar
 from dataclasses import dataclass, field
 from collections import defaultdict
 
-from .exceptions import StateTransitionError, ValidationError
+from .exceptions import StateTransitionError, ValidationError, EmergencyStopTriggered
+
+T = TypeVar("T")
+
+# How long an emergency stop waits for a cancelled wait to release the robot call it was blocked on
+ESTOP_UNWIND_TIMEOUT = 1.0
 
 
 class RobotState(Enum):
@@ -189,6 +194,16 @@ class AtomicStateManager:
         
         # Robot state tracking
         self._robots: Dict[str, RobotInfo] = {}
+        
+        # Robots currently in EMERGENCY_STOP, mirrored on every transition so
+        # hot paths can check e-stop without taking the state lock
+        self._emergency_stopped: Set[str] = set()
+        
+        # Per-robot signals sequences await directly instead of polling:
+        # resume event is set while the robot's current step is not paused,
+        # e-stop event is set while the robot is in EMERGENCY_STOP
+        self._resume_events: Dict[str, asyncio.Event] = {}
+        self._estop_events: Dict[str, asyncio.Event] = {}
         self._system_state = SystemState.INITIALIZING
         
         # State change history
@@ -243,6 +258,9 @@ class AtomicStateManager:
             )
             
             self._robots[robot_id] = robot_info
+            if initial_state == RobotState.EMERGENCY_STOP:
+                self._emergency_stopped.add(robot_id)
+                self.emergency_stop_event(robot_id).set()
             self._stats[f"robot_{robot_type}_registered"] += 1
             
             self.logger.info(
@@ -312,6 +330,12 @@ class AtomicStateManager:
             
             # Update robot state
             robot_info.current_state = new_state
+            if new_state == RobotState.EMERGENCY_STOP:
+                self._emergency_stopped.add(robot_id)
+                self.emergency_stop_event(robot_id).set()
+            else:
+                self._emergency_stopped.discard(robot_id)
+                self.emergency_stop_event(robot_id).clear()
             robot_info.last_updated = transition.timestamp
             robot_info.last_transition = transition
             
@@ -352,6 +376,90 @@ class AtomicStateManager:
         """Check if state transition is valid"""
         return to_state in self.VALID_TRANSITIONS.get(from_state, set())
     
+    def is_emergency_stopped(self, robot_id: str) -> bool:
+        """Lock-free e-stop check for per-command hot paths"""
+        return robot_id in self._emergency_stopped
+    
+    def emergency_stop_event(self, robot_id: str) -> asyncio.Event:
+        """Event set while the robot is emergency stopped"""
+        event = self._estop_events.get(robot_id)
+        if event is None:
+            event = self._estop_events[robot_id] = asyncio.Event()
+            if robot_id in self._emergency_stopped:
+                event.set()
+        return event
+    
+    def resume_event(self, robot_id: str) -> asyncio.Event:
+        """Event set while the robot's current step is not paused"""
+        event = self._resume_events.get(robot_id)
+        if event is None:
+            event = self._resume_events[robot_id] = asyncio.Event()
+            robot_info = self._robots.get(robot_id)
+            if robot_info is None or robot_info.current_step is None or not robot_info.current_step.paused:
+                event.set()
+        return event
+    
+    async def wait_until_resumed(self, robot_id: str) -> bool:
+        """
+        Wait while the robot's current step is paused.
+        
+        Returns as soon as the step is resumed or the robot is emergency
+        stopped, whichever comes first. Returns False on emergency stop.
+        """
+        resumed = self.resume_event(robot_id)
+        estop = self.emergency_stop_event(robot_id)
+        if not resumed.is_set() and not estop.is_set():
+            resume_task = asyncio.ensure_future(resumed.wait())
+            estop_task = asyncio.ensure_future(estop.wait())
+            try:
+                await asyncio.wait({resume_task, estop_task}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                resume_task.cancel()
+                estop_task.cancel()
+        return not estop.is_set()
+    
+    async def run_unless_emergency_stopped(self, robot_id: str, awaitable: Awaitable[T]) -> T:
+        """
+        Await `awaitable`, cancelling it the moment the robot is emergency stopped.
+        
+        The cancelled awaitable is given up to ESTOP_UNWIND_TIMEOUT to unwind, so a
+        robot wait it was blocked on (AsyncRobotWrapper waits abort on cancellation)
+        is released before post-e-stop commands such as reset or clear are sent.
+        The awaitable is cancelled the same way if the caller itself is cancelled
+        (operation timeout, workflow cancelled).
+        
+        Raises:
+            EmergencyStopTriggered: If the robot is (or becomes) emergency stopped
+        """
+        estop = self.emergency_stop_event(robot_id)
+        task = asyncio.ensure_future(awaitable)
+        if not estop.is_set():
+            estop_task = asyncio.ensure_future(estop.wait())
+            try:
+                await asyncio.wait({task, estop_task}, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                await self._cancel_and_unwind(task)
+                raise
+            finally:
+                estop_task.cancel()
+            if task.done() and not estop.is_set():
+                return task.result()
+        
+        await self._cancel_and_unwind(task)
+        raise EmergencyStopTriggered(
+            f"Emergency stop interrupted wait for robot {robot_id}",
+            triggered_by="state_manager",
+            robot_id=robot_id
+        )
+    
+    @staticmethod
+    async def _cancel_and_unwind(task: "asyncio.Future"):
+        """Cancel a guarded wait and give it up to ESTOP_UNWIND_TIMEOUT to let go of the robot"""
+        task.cancel()
+        # Retrieve the outcome so a cancelled or failed wait is not reported as unhandled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        await asyncio.wait({task}, timeout=ESTOP_UNWIND_TIMEOUT)
+    
     async def get_robot_state(self, robot_id: str) -> Optional[RobotInfo]:
         """Get current state information for a robot"""
         async with self._lock:
@@ -448,31 +556,36 @@ class AtomicStateManager:
     
     async def emergency_stop_all(self, reason: str = "Emergency stop triggered"):
         """Emergency stop all robots"""
+        # update_robot_state takes the (non-reentrant) state lock itself, so only
+        # the robot list is read under it
         async with self._lock:
-            robots_stopped = []
-            
-            for robot_id, robot_info in self._robots.items():
-                if robot_info.current_state != RobotState.EMERGENCY_STOP:
-                    try:
-                        await self.update_robot_state(
-                            robot_id, 
-                            RobotState.EMERGENCY_STOP, 
-                            reason=reason
-                        )
-                        robots_stopped.append(robot_id)
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to emergency stop robot {robot_id}: {e}"
-                        )
-            
-            await self.update_system_state(SystemState.ERROR, reason=reason)
-            
-            self.logger.critical(
-                f"Emergency stop executed. Stopped robots: {robots_stopped}. "
-                f"Reason: {reason}"
-            )
-            
-            return robots_stopped
+            to_stop = [
+                robot_id for robot_id, robot_info in self._robots.items()
+                if robot_info.current_state != RobotState.EMERGENCY_STOP
+            ]
+        
+        robots_stopped = []
+        for robot_id in to_stop:
+            try:
+                await self.update_robot_state(
+                    robot_id, 
+                    RobotState.EMERGENCY_STOP, 
+                    reason=reason
+                )
+                robots_stopped.append(robot_id)
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to emergency stop robot {robot_id}: {e}"
+                )
+        
+        await self.update_system_state(SystemState.ERROR, reason=reason)
+        
+        self.logger.critical(
+            f"Emergency stop executed. Stopped robots: {robots_stopped}. "
+            f"Reason: {reason}"
+        )
+        
+        return robots_stopped
     
     async def get_operational_robots(self) -> List[str]:
         """Get list of robots that are operational (idle or busy)"""
@@ -503,6 +616,9 @@ class AtomicStateManager:
             
             for robot_id in to_remove:
                 del self._robots[robot_id]
+                self._emergency_stopped.discard(robot_id)
+                self._resume_events.pop(robot_id, None)
+                self._estop_events.pop(robot_id, None)
                 self.logger.info(f"Removed disconnected robot: {robot_id}")
             
             return to_remove
@@ -532,6 +648,7 @@ class AtomicStateManager:
             )
             
             self._robots[robot_id].current_step = step_state
+            self.resume_event(robot_id).set()
             self.logger.info(f"Started step {step_index} ({step_name}) for robot {robot_id}")
     
     async def update_step_progress(
@@ -571,6 +688,7 @@ class AtomicStateManager:
             robot_info.current_step.paused = True
             robot_info.current_step.paused_at = time.time()
             robot_info.current_step.pause_reason = reason
+            self.resume_event(robot_id).clear()
             
             self.logger.info(f"Paused step {robot_info.current_step.step_index} for robot {robot_id}: {reason}")
             return robot_info.current_step
@@ -588,6 +706,7 @@ class AtomicStateManager:
             robot_info.current_step.paused = False
             robot_info.current_step.paused_at = None
             robot_info.current_step.pause_reason = None
+            self.resume_event(robot_id).set()
             
             self.logger.info(f"Resumed step {robot_info.current_step.step_index} for robot {robot_id}")
             return robot_info.current_step
@@ -604,6 +723,7 @@ class AtomicStateManager:
             
             completed_step = robot_info.current_step
             robot_info.current_step = None
+            self.resume_event(robot_id).set()
             
             self.logger.info(f"Completed step {completed_step.step_index} ({completed_step.step_name}) for robot {robot_id}")
             return completed_step
@@ -624,6 +744,5 @@ class AtomicStateManager:
             }
     
     async def is_step_paused(self, robot_id: str) -> bool:
-        """Check if robot's current step is paused"""
-        step_state = await self.get_step_state(robot_id)
-        return step_state is not None and step_state.paused
\ No newline at end of file
+        """Check if robot's current step is paused (lock-free, mirrors the resume event)"""
+        return not self.resume_event(robot_id).is_set()
\ No newline at end of file
@@ -147,10 +147,10 @@ class DependencyContainer:
             meca_wrapper = AsyncRobotWrapper(
                 robot_id="meca",
                 robot_driver=meca_driver,
-                max_workers=4,
                 command_timeout=self._settings.meca_timeout,
                 batch_size=10,
                 batch_timeout=0.1,
+                lookahead_window=self._settings.meca_lookahead_window,
             )
 
             # Create MecaService
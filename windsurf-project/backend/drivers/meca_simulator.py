@@ -0,0 +1,791 @@
+"""
+Deterministic in-process Mecademic robot simulator.
+
+Implements the subset of the mecademicpy Robot API used by MecademicDriver and
+AsyncRobotWrapper so sequences can run without an arm. Motion time is modelled
+from distance, speed, acceleration and blending; faults (collision, pause,
+disconnect) can be injected immediately or after a given number of motions.
+
+Time runs on a virtual clock:
+- time_scale=1.0 runs in real time, 0.01 runs 100x faster
+- time_scale=0 never sleeps: blocking waits jump the virtual clock forward,
+  so a run's simulated duration depends only on the commands sent
+"""
+
+import math
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+# Motion model (approximating a Meca500)
+MAX_POSE_LINEAR_SPEED = 1000.0   # mm/s for MovePose at 100% joint velocity
+MAX_POSE_ANGULAR_SPEED = 300.0   # deg/s for MovePose at 100% joint velocity
+MAX_POSE_ACCELERATION = 4000.0   # mm/s^2 for MovePose at 100% joint acceleration
+GRIPPER_MOVE_TIME = 0.3          # s for a full gripper open/close
+HOMING_TIME = 1.0                # s
+ACTIVATION_TIME = 0.5            # s
+
+FAULT_KINDS = ("collision", "pause", "disconnect")
+
+# Text protocol responses for offline program saving (Meca500 programming manual)
+RESPONSE_START_SAVING = 2060
+RESPONSE_END_SAVING = 2061
+
+# Commands that may be stored in an offline program
+PROGRAM_COMMANDS = frozenset({
+    "MovePose", "MoveLin", "MoveJoints", "GripperOpen", "GripperClose", "MoveGripper", "Delay",
+    "SetCheckpoint", "SetJointVel", "SetJointAcc", "SetCartLinVel", "SetCartAcc", "SetBlending",
+    "SetConf", "SetGripperForce", "SetTorqueLimits", "SetTorqueLimitsCfg"
+})
+
+_TEXT_COMMAND = re.compile(r"^\s*([A-Za-z]+)\s*(?:\((.*)\))?\s*$")
+
+
+def trapezoid_time(distance: float, speed: float, acceleration: float) -> float:
+    """Time to cover distance with a trapezoidal (or triangular) velocity profile"""
+    if distance <= 0 or speed <= 0 or acceleration <= 0:
+        return 0.0
+    ramp_distance = speed * speed / acceleration
+    if distance >= ramp_distance:
+        return distance / speed + speed / acceleration
+    return 2.0 * math.sqrt(distance / acceleration)
+
+
+def pose_motion_time(
+    start: Tuple[float, ...],
+    target: Tuple[float, ...],
+    linear: bool,
+    joint_vel: float,
+    joint_acc: float,
+    cart_lin_vel: float,
+    cart_acc: float
+) -> Tuple[float, float]:
+    """
+    (duration, acceleration ramp time) of a MovePose/MoveLin between two poses.
+
+    joint_vel/joint_acc/cart_acc are percentages as sent with SetJointVel,
+    SetJointAcc and SetCartAcc; cart_lin_vel is in mm/s (SetCartLinVel).
+    """
+    distance = math.dist(start[:3], target[:3])
+    rotation = max(abs(a - b) for a, b in zip(start[3:], target[3:])) if len(target) > 3 else 0.0
+
+    if linear:
+        speed = cart_lin_vel
+        acceleration = cart_acc / 100.0 * MAX_POSE_ACCELERATION
+        angular_speed = MAX_POSE_ANGULAR_SPEED * 0.5
+    else:
+        speed = joint_vel / 100.0 * MAX_POSE_LINEAR_SPEED
+        acceleration = joint_acc / 100.0 * MAX_POSE_ACCELERATION
+        angular_speed = joint_vel / 100.0 * MAX_POSE_ANGULAR_SPEED
+
+    linear_time = trapezoid_time(distance, speed, acceleration)
+    angular_time = rotation / angular_speed if angular_speed > 0 else 0.0
+    ramp = speed / acceleration if acceleration > 0 else 0.0
+    return max(linear_time, angular_time), ramp
+
+
+def blend_overlap(blending: float, duration: float, ramp: float) -> float:
+    """Time a blended move may start before the previous move finishes"""
+    return min(blending / 100.0 * ramp, duration * 0.5)
+
+
+class TimeoutException(Exception):
+    """Raised when a wait exceeds its timeout (same name as mecademicpy's)"""
+
+
+class InterruptException(Exception):
+    """Raised when a wait is interrupted by an error or cleared motion"""
+
+
+class DisconnectError(Exception):
+    """Raised when the simulated robot is disconnected"""
+
+
+class InvalidStateError(Exception):
+    """Raised when a command is not allowed in the current robot state"""
+
+
+@dataclass
+class SimRobotStatus:
+    """Mirror of mecademicpy RobotStatus fields used by the backend"""
+    activation_state: bool = False
+    homing_state: bool = False
+    simulation_mode: bool = True
+    error_status: bool = False
+    pause_motion_status: bool = False
+    end_of_block_status: bool = True
+    brakes_engaged: bool = True
+
+
+@dataclass
+class SimTimestampedData:
+    data: List[float]
+    timestamp: float = 0.0
+
+
+@dataclass
+class SimRobotRtData:
+    rt_cart_pos: SimTimestampedData
+    rt_target_cart_pos: SimTimestampedData
+
+
+@dataclass
+class SimGripperState:
+    holding_part: bool = False
+    target_pos_reached: bool = True
+    opened: bool = True
+    closed: bool = False
+
+
+@dataclass
+class _Segment:
+    """One queued item in the simulated motion queue"""
+    seq: int
+    kind: str  # "move" | "gripper" | "delay" | "checkpoint" | "home"
+    end_time: float
+    duration: float
+    pose: Optional[Tuple[float, ...]] = None
+    gripper_closed: Optional[bool] = None
+
+
+class SimCheckpoint:
+    """Returned by SetCheckpoint(); wait() blocks until the robot reaches it"""
+
+    def __init__(self, robot: "SimulatedMecaRobot", checkpoint_id: int, seq: int):
+        self.id = checkpoint_id
+        self._robot = robot
+        self._seq = seq
+
+    def wait(self, timeout: Optional[float] = None):
+        self._robot._wait_for_seq(self._seq, timeout)
+
+
+class SimExternalCheckpoint(SimCheckpoint):
+    """Returned by ExpectExternalCheckpoint(); bound when a running offline program sets it"""
+
+    def __init__(self, robot: "SimulatedMecaRobot", checkpoint_id: int):
+        super().__init__(robot, checkpoint_id, 0)
+
+    def wait(self, timeout: Optional[float] = None):
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._robot._cond:
+            while not self._seq:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutException(f"Checkpoint {self.id} not reached within {timeout}s")
+                self._robot._cond.wait(remaining if remaining is not None else 0.1)
+        self._robot._wait_for_seq(self._seq, timeout)
+
+
+class SimResponseEvent:
+    """Returned by SendCustomCommand() with expected_responses; already complete"""
+
+    def __init__(self, code: int, message: str = ""):
+        self.code = code
+        self.message = message
+
+    def wait(self, timeout: Optional[float] = None) -> "SimResponseEvent":
+        return self
+
+
+@dataclass
+class _ScheduledFault:
+    kind: str
+    after_motions: int
+
+
+class SimulatedMecaRobot:
+    """
+    Fake mecademicpy.robot.Robot.
+
+    Commands are queued on a virtual motion queue exactly like the real robot:
+    motion, gripper, Delay and checkpoints return immediately and complete in
+    order; WaitIdle / WaitHomed / checkpoint waits block until they do.
+    """
+
+    def __init__(
+        self,
+        time_scale: float = 1.0,
+        initial_pose: Tuple[float, ...] = (135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308)
+    ):
+        self.time_scale = time_scale
+        self._cond = threading.Condition()
+
+        # Virtual clock: anchored to the wall clock unless time_scale == 0
+        self._virtual_now = 0.0
+        self._anchor_wall = time.monotonic()
+        self._anchor_virtual = 0.0
+
+        # Robot state
+        self._connected = False
+        self._activated = False
+        self._homed = False
+        self._error = False
+        self._paused = False
+        self._pause_started: Optional[float] = None
+        self._pose = tuple(initial_pose)
+        self._gripper_closed = False
+        self._holding_part = False
+
+        # Motion queue and planning state (parameters apply in queue order)
+        self._queue: Deque[_Segment] = deque()
+        self._next_seq = 1
+        self._completed_seq = 0
+        self._aborted_below = 0
+        self._tail_time = 0.0
+        self._tail_pose = tuple(initial_pose)
+        self._last_gripper_seq = 0
+        self._homing_seq = 0
+        self._joint_vel = 25.0
+        self._joint_acc = 100.0
+        self._cart_lin_vel = 150.0
+        self._cart_acc = 50.0
+        self._blending = 0.0
+
+        # Offline programs: number -> stored text commands, plus the one being saved
+        self._programs: Dict[int, List[Tuple[str, Tuple[Any, ...]]]] = {}
+        self._saving: Optional[Tuple[int, List[Tuple[str, Tuple[Any, ...]]]]] = None
+        self._external_checkpoints: Dict[int, Deque[SimExternalCheckpoint]] = {}
+
+        # Fault injection and callbacks
+        self._scheduled_faults: List[_ScheduledFault] = []
+        self._callbacks: Any = None
+        self._in_callback = False
+        self._last_notified: Optional[Tuple[bool, ...]] = None
+
+        # Report
+        self._stats: Dict[str, Any] = {
+            "commands": {},
+            "motions_completed": 0,
+            "motion_time": 0.0,
+            "gripper_time": 0.0,
+            "delay_time": 0.0,
+            "blending_saved": 0.0,
+            "faults": []
+        }
+
+    # ------------------------------------------------------------------
+    # Virtual clock and queue processing (call with self._cond held)
+    # ------------------------------------------------------------------
+
+    def _clock(self) -> float:
+        if self.time_scale <= 0:
+            return self._virtual_now
+        return self._anchor_virtual + (time.monotonic() - self._anchor_wall) / self.time_scale
+
+    def _advance(self):
+        """Complete every queued segment whose end time has passed"""
+        if self._paused:
+            return
+        now = self._clock()
+        while self._queue and self._queue[0].end_time <= now:
+            segment = self._queue.popleft()
+            self._complete(segment)
+            if self._error or self._paused or not self._connected:
+                break
+        if self.time_scale <= 0:
+            self._virtual_now = max(self._virtual_now, now)
+
+    def _complete(self, segment: _Segment):
+        self._completed_seq = segment.seq
+        if segment.pose is not None:
+            self._pose = segment.pose
+        if segment.kind == "move":
+            self._stats["motions_completed"] += 1
+            self._stats["motion_time"] += segment.duration
+            self._trigger_scheduled_faults()
+        elif segment.kind == "gripper":
+            self._gripper_closed = bool(segment.gripper_closed)
+            self._holding_part = self._gripper_closed
+            self._stats["gripper_time"] += segment.duration
+        elif segment.kind == "delay":
+            self._stats["delay_time"] += segment.duration
+        elif segment.kind == "home":
+            self._homed = True
+        self._notify()
+
+    def _trigger_scheduled_faults(self):
+        motions = self._stats["motions_completed"]
+        due = [f for f in self._scheduled_faults if f.after_motions <= motions]
+        for fault in due:
+            self._scheduled_faults.remove(fault)
+            self._apply_fault(fault.kind)
+
+    def _enqueue(
+        self,
+        kind: str,
+        duration: float,
+        pose: Optional[Tuple[float, ...]] = None,
+        gripper_closed: Optional[bool] = None,
+        blend_overlap: float = 0.0
+    ) -> int:
+        self._require_connected()
+        self._advance()
+        now = self._clock()
+        # Blending only overlaps with a motion still in the queue
+        overlap = blend_overlap if self._tail_time > now and self._queue and self._queue[-1].kind == "move" else 0.0
+        start = max(now, self._tail_time - overlap)
+        self._stats["blending_saved"] += max(0.0, self._tail_time - start) if overlap else 0.0
+        segment = _Segment(
+            seq=self._next_seq,
+            kind=kind,
+            end_time=start + duration,
+            duration=duration,
+            pose=pose,
+            gripper_closed=gripper_closed
+        )
+        self._next_seq += 1
+        self._queue.append(segment)
+        self._tail_time = max(self._tail_time, segment.end_time)
+        if pose is not None:
+            self._tail_pose = pose
+        self._notify()
+        return segment.seq
+
+    def _wait_for_seq(self, seq: int, timeout: Optional[float]):
+        """Block until segment `seq` completes, the timeout elapses, or the robot faults"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                self._advance()
+                if self._completed_seq >= seq:
+                    return
+                if not self._connected:
+                    raise DisconnectError("Robot disconnected while waiting")
+                if self._error:
+                    raise InterruptException("Robot is in error while waiting")
+                if seq < self._aborted_below:
+                    raise InterruptException("Motion was cleared while waiting")
+
+                pending = next((s for s in self._queue if s.seq == seq), None)
+                if pending is None:
+                    return
+                if self.time_scale <= 0 and not self._paused:
+                    # Instant mode: jump the virtual clock to the segment's end
+                    self._virtual_now = max(self._virtual_now, pending.end_time)
+                    continue
+
+                remaining_real = None if deadline is None else deadline - time.monotonic()
+                if remaining_real is not None and remaining_real <= 0:
+                    raise TimeoutException(f"Timeout after {timeout}s waiting for robot")
+                if self._paused:
+                    sleep_for = 0.1
+                else:
+                    sleep_for = max(0.0, (pending.end_time - self._clock()) * self.time_scale)
+                if remaining_real is not None:
+                    sleep_for = min(sleep_for, remaining_real)
+                self._cond.wait(sleep_for)
+
+    def _notify(self):
+        self._cond.notify_all()
+        # Like the real robot, only report status changes; callbacks usually read the
+        # status back, so nested notifications from that read are skipped
+        callbacks = self._callbacks
+        if callbacks is None or self._in_callback or not getattr(callbacks, "on_status_updated", None):
+            return
+        status = (self._connected, self._activated, self._homed, self._error, self._paused, not self._queue)
+        if status == self._last_notified:
+            return
+        self._last_notified = status
+        self._in_callback = True
+        try:
+            callbacks.on_status_updated()
+        except Exception:
+            pass
+        finally:
+            self._in_callback = False
+
+    def _notify_disconnected(self):
+        callbacks = self._callbacks
+        if callbacks is not None and getattr(callbacks, "on_disconnected", None):
+            try:
+                callbacks.on_disconnected()
+            except Exception:
+                pass
+
+    def _require_connected(self):
+        if not self._connected:
+            raise DisconnectError("Robot is not connected")
+
+    def _require_ready_for_motion(self):
+        self._require_connected()
+        if self._error:
+            raise InvalidStateError("Robot is in error")
+        if not self._activated or not (self._homed or self._homing_seq):
+            raise InvalidStateError("Robot must be activated and homed before motion")
+
+    def _count(self, name: str):
+        commands = self._stats["commands"]
+        commands[name] = commands.get(name, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Motion model
+    # ------------------------------------------------------------------
+
+    def _pose_motion_time(self, target: Tuple[float, ...], linear: bool) -> Tuple[float, float]:
+        """(duration, acceleration ramp time) from the queue's tail pose to target"""
+        return pose_motion_time(
+            self._tail_pose, target, linear,
+            self._joint_vel, self._joint_acc, self._cart_lin_vel, self._cart_acc
+        )
+
+    def _queue_move(self, name: str, pose: Tuple[float, ...], linear: bool):
+        with self._cond:
+            self._require_ready_for_motion()
+            self._count(name)
+            duration, ramp = self._pose_motion_time(tuple(float(v) for v in pose), linear)
+            overlap = blend_overlap(self._blending, duration, ramp)
+            self._enqueue("move", duration, pose=tuple(float(v) for v in pose), blend_overlap=overlap)
+
+    # ------------------------------------------------------------------
+    # mecademicpy API surface
+    # ------------------------------------------------------------------
+
+    def Connect(self, address: str = "192.168.0.100", enable_synchronous_mode: bool = False,
+                disconnect_on_exception: bool = True, timeout: float = 1.0, **kwargs):
+        with self._cond:
+            self._connected = True
+            self._count("Connect")
+            self._notify()
+
+    def Disconnect(self):
+        with self._cond:
+            self._connected = False
+            self._queue.clear()
+            self._aborted_below = self._next_seq
+            self._count("Disconnect")
+            self._cond.notify_all()
+        self._notify_disconnected()
+
+    def IsConnected(self) -> bool:
+        return self._connected
+
+    def SetDisconnectOnException(self, value: bool):
+        pass
+
+    def RegisterCallbacks(self, callbacks: Any, run_callbacks_in_separate_thread: bool = False):
+        self._callbacks = callbacks
+
+    def ActivateRobot(self):
+        with self._cond:
+            self._require_connected()
+            self._count("ActivateRobot")
+            if self.time_scale <= 0:
+                self._virtual_now += ACTIVATION_TIME
+            self._activated = True
+            self._notify()
+
+    def DeactivateRobot(self):
+        with self._cond:
+            self._require_connected()
+            self._activated = False
+            self._homed = False
+            self._homing_seq = 0
+            self._queue.clear()
+            self._aborted_below = self._next_seq
+            self._notify()
+
+    def Home(self):
+        with self._cond:
+            self._require_connected()
+            if not self._activated:
+                raise InvalidStateError("Robot must be activated before homing")
+            self._count("Home")
+            self._homing_seq = self._enqueue("home", HOMING_TIME)
+
+    def WaitActivated(self, timeout: Optional[float] = None):
+        if not self._activated:
+            raise TimeoutException("Robot is not activated")
+
+    def WaitHomed(self, timeout: Optional[float] = None):
+        if self._homed:
+            return
+        if not self._homing_seq:
+            raise TimeoutException("Robot is not homing")
+        self._wait_for_seq(self._homing_seq, timeout)
+
+    def IsHomed(self) -> bool:
+        return self._homed
+
+    def IsActivated(self) -> bool:
+        return self._activated
+
+    def BrakesOn(self):
+        pass
+
+    def BrakesOff(self):
+        pass
+
+    def MovePose(self, x: float, y: float, z: float, alpha: float, beta: float, gamma: float):
+        self._queue_move("MovePose", (x, y, z, alpha, beta, gamma), linear=False)
+
+    def MoveLin(self, x: float, y: float, z: float, alpha: float, beta: float, gamma: float):
+        self._queue_move("MoveLin", (x, y, z, alpha, beta, gamma), linear=True)
+
+    def MoveJoints(self, *joints: float):
+        # Joint targets are not kinematically modelled; charge a fixed move at the current speed
+        with self._cond:
+            self._require_ready_for_motion()
+            self._count("MoveJoints")
+            self._enqueue("move", trapezoid_time(90.0, self._joint_vel / 100.0 * MAX_POSE_ANGULAR_SPEED,
+                                                       MAX_POSE_ANGULAR_SPEED))
+
+    def _queue_gripper(self, name: str, closed: bool):
+        with self._cond:
+            self._require_connected()
+            self._count(name)
+            self._last_gripper_seq = self._enqueue("gripper", GRIPPER_MOVE_TIME, gripper_closed=closed)
+
+    def GripperOpen(self):
+        self._queue_gripper("GripperOpen", False)
+
+    def GripperClose(self):
+        self._queue_gripper("GripperClose", True)
+
+    def MoveGripper(self, target: Any):
+        closed = target is False or (isinstance(target, (int, float)) and not isinstance(target, bool) and target <= 1.0)
+        self._queue_gripper("MoveGripper", closed)
+
+    def Delay(self, t: float):
+        with self._cond:
+            self._count("Delay")
+            self._enqueue("delay", float(t))
+
+    def SetCheckpoint(self, n: int) -> SimCheckpoint:
+        with self._cond:
+            self._count("SetCheckpoint")
+            seq = self._enqueue("checkpoint", 0.0)
+            return SimCheckpoint(self, n, seq)
+
+    def ExpectExternalCheckpoint(self, n: int, timeout: Optional[float] = None) -> SimExternalCheckpoint:
+        """Checkpoint set by an offline program rather than by this client"""
+        with self._cond:
+            checkpoint = SimExternalCheckpoint(self, n)
+            self._external_checkpoints.setdefault(n, deque()).append(checkpoint)
+            return checkpoint
+
+    def SendCustomCommand(self, command: str, expected_responses: Optional[List[int]] = None,
+                          timeout: Optional[float] = None) -> Optional[SimResponseEvent]:
+        """Text protocol command, e.g. "MovePose(1,2,3,4,5,6)", "StartSaving(1)", "StopSaving" """
+        match = _TEXT_COMMAND.match(command)
+        if match is None:
+            raise ValueError(f"Malformed command: {command!r}")
+        name = match.group(1)
+        args = tuple(float(a) for a in match.group(2).split(",") if a.strip()) if match.group(2) else ()
+
+        with self._cond:
+            self._require_connected()
+            if name == "StartSaving":
+                self._saving = (int(args[0]), [])
+                response = SimResponseEvent(RESPONSE_START_SAVING, f"Start saving program {int(args[0])}")
+            elif name == "StopSaving":
+                if self._saving is None:
+                    raise InvalidStateError("StopSaving without StartSaving")
+                number, commands = self._saving
+                self._programs[number] = commands
+                self._saving = None
+                self._count("StopSaving")
+                response = SimResponseEvent(RESPONSE_END_SAVING, f"{len(commands)} commands saved")
+            elif self._saving is not None:
+                if name not in PROGRAM_COMMANDS:
+                    raise InvalidStateError(f"{name} cannot be saved in a program")
+                self._saving[1].append((name, args))
+                return None
+            else:
+                response = None
+
+        if response is None:
+            getattr(self, name)(*args)
+            return None
+        return response if expected_responses else None
+
+    def StartOfflineProgram(self, n: int, timeout: Optional[float] = None):
+        """Run a stored program; its commands join the motion queue as if sent in order"""
+        with self._cond:
+            commands = self._programs.get(int(n))
+            if commands is None:
+                raise InvalidStateError(f"Offline program {n} does not exist")
+            self._require_ready_for_motion()
+            self._count("StartOfflineProgram")
+            for name, args in commands:
+                if name == "SetCheckpoint":
+                    seq = self._enqueue("checkpoint", 0.0)
+                    waiting = self._external_checkpoints.get(int(args[0]))
+                    if waiting:
+                        waiting.popleft()._seq = seq
+                else:
+                    getattr(self, name)(*args)
+            self._notify()
+
+    def get_program(self, n: int) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """Commands stored in offline program n (simulator only)"""
+        with self._cond:
+            return list(self._programs.get(int(n), []))
+
+    def WaitIdle(self, timeout: Optional[float] = None):
+        with self._cond:
+            self._advance()
+            last_seq = self._next_seq - 1
+        self._wait_for_seq(last_seq, timeout)
+
+    def WaitGripperMoveCompletion(self, timeout: Optional[float] = None):
+        self._wait_for_seq(self._last_gripper_seq, timeout)
+
+    def _set_param(self, name: str, attr: str, value: float):
+        with self._cond:
+            self._require_connected()
+            self._count(name)
+            setattr(self, attr, float(value))
+
+    def SetJointVel(self, p: float):
+        self._set_param("SetJointVel", "_joint_vel", p)
+
+    def SetJointAcc(self, p: float):
+        self._set_param("SetJointAcc", "_joint_acc", p)
+
+    def SetCartLinVel(self, v: float):
+        self._set_param("SetCartLinVel", "_cart_lin_vel", v)
+
+    def SetCartAcc(self, p: float):
+        self._set_param("SetCartAcc", "_cart_acc", p)
+
+    def SetBlending(self, p: float):
+        self._set_param("SetBlending", "_blending", p)
+
+    def SetConf(self, shoulder: int, elbow: int, wrist: int):
+        self._count("SetConf")
+
+    def SetGripperForce(self, p: float):
+        self._count("SetGripperForce")
+
+    def SetTorqueLimits(self, *limits: float):
+        self._count("SetTorqueLimits")
+
+    def SetTorqueLimitsCfg(self, severity: int, skip_acceleration: int = 1):
+        self._count("SetTorqueLimitsCfg")
+
+    def PauseMotion(self):
+        with self._cond:
+            self._apply_fault("pause", injected=False)
+
+    def ResumeMotion(self):
+        with self._cond:
+            if self._paused and not self._error:
+                shift = self._clock() - (self._pause_started or self._clock())
+                for segment in self._queue:
+                    segment.end_time += shift
+                self._tail_time += shift
+                self._paused = False
+                self._pause_started = None
+                self._notify()
+
+    def ClearMotion(self):
+        with self._cond:
+            self._queue.clear()
+            self._aborted_below = self._next_seq
+            self._tail_time = self._clock()
+            self._tail_pose = self._pose
+            self._notify()
+
+    def StopMotion(self):
+        self.ClearMotion()
+
+    def ResetError(self):
+        with self._cond:
+            self._error = False
+            self._notify()
+
+    def GetStatusRobot(self, synchronous_update: bool = False) -> SimRobotStatus:
+        with self._cond:
+            self._advance()
+            return SimRobotStatus(
+                activation_state=self._activated,
+                homing_state=self._homed,
+                error_status=self._error,
+                pause_motion_status=self._paused,
+                end_of_block_status=not self._queue,
+                brakes_engaged=not self._activated
+            )
+
+    def GetRobotRtData(self, synchronous_update: bool = False) -> SimRobotRtData:
+        with self._cond:
+            self._advance()
+            now = self._clock()
+            return SimRobotRtData(
+                rt_cart_pos=SimTimestampedData(list(self._pose), now),
+                rt_target_cart_pos=SimTimestampedData(list(self._tail_pose), now)
+            )
+
+    def GetRtGripperState(self, include_timestamp: bool = False, synchronous_update: bool = False) -> SimGripperState:
+        with self._cond:
+            self._advance()
+            return SimGripperState(
+                holding_part=self._holding_part,
+                target_pos_reached=self._completed_seq >= self._last_gripper_seq,
+                opened=not self._gripper_closed,
+                closed=self._gripper_closed
+            )
+
+    # ------------------------------------------------------------------
+    # Fault injection and reporting
+    # ------------------------------------------------------------------
+
+    def inject_fault(self, kind: str, after_motions: int = 0):
+        """
+        Inject a fault now, or once `after_motions` more motions have completed.
+
+        Kinds: "collision" (error + motion cleared), "pause" (motion paused,
+        resume with ResumeMotion), "disconnect" (connection lost).
+        """
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"Unknown fault kind '{kind}', expected one of {FAULT_KINDS}")
+        with self._cond:
+            if after_motions > 0:
+                self._scheduled_faults.append(
+                    _ScheduledFault(kind, self._stats["motions_completed"] + after_motions)
+                )
+            else:
+                self._apply_fault(kind)
+
+    def _apply_fault(self, kind: str, injected: bool = True):
+        if injected:
+            self._stats["faults"].append({"kind": kind, "virtual_time": self._clock(),
+                                          "motions_completed": self._stats["motions_completed"]})
+        if kind == "collision":
+            self._error = True
+            self._queue.clear()
+            self._aborted_below = self._next_seq
+            self._tail_time = self._clock()
+            self._tail_pose = self._pose
+        elif kind == "pause":
+            if not self._paused:
+                self._paused = True
+                self._pause_started = self._clock()
+        elif kind == "disconnect":
+            self._connected = False
+            self._queue.clear()
+            self._aborted_below = self._next_seq
+            self._notify_disconnected()
+        self._notify()
+
+    def get_simulation_report(self) -> Dict[str, Any]:
+        """Deterministic accounting of simulated robot time"""
+        with self._cond:
+            self._advance()
+            return {
+                "virtual_time": self._clock(),
+                "busy_until": self._tail_time,
+                "time_scale": self.time_scale,
+                "motions_completed": self._stats["motions_completed"],
+                "motion_time": self._stats["motion_time"],
+                "gripper_time": self._stats["gripper_time"],
+                "delay_time": self._stats["delay_time"],
+                "blending_saved": self._stats["blending_saved"],
+                "commands": dict(self._stats["commands"]),
+                "faults": list(self._stats["faults"]),
+                "queued": len(self._queue)
+            }
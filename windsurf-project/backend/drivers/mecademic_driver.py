@@ -4,21 +4,27 @@ Provides async wrapper for mecademicpy.Robot with proper error handling and conn
 """
 
 import asyncio
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor
-import mecademicpy
+from types import SimpleNamespace
+from typing import Dict, Any, Callable, List, Optional
 
 try:
+    import mecademicpy
     from mecademicpy.robot import Robot as MecademicRobot
     mecademicpy_available = True
 except ImportError:
+    mecademicpy = None
     MecademicRobot = None
     mecademicpy_available = False
 
+from core.async_robot_wrapper import WAIT_SLICE
 from core.exceptions import ConnectionError, HardwareError, ConfigurationError
 from core.hardware_manager import BaseRobotDriver
+from core.robot_io_channel import RobotIOChannel
+from core.robot_status_feed import RobotStatusFeed
+from drivers.meca_simulator import SimulatedMecaRobot
 from utils.logger import get_logger
 
 
@@ -34,7 +40,11 @@ class MecademicDriver(BaseRobotDriver):
         super().__init__(robot_id, config)
         self.logger = get_logger(f"meca_driver_{robot_id}")
         
-        if not mecademicpy_available:
+        # Offline mode: drive the in-process simulator instead of a real arm
+        self.simulate = bool(config.get("simulate", False))
+        self.simulation_time_scale = float(config.get("simulation_time_scale", 1.0))
+        
+        if not mecademicpy_available and not self.simulate:
             raise ConfigurationError(
                 "mecademicpy library not available. Install with: pip install mecademicpy",
                 robot_id=robot_id
@@ -53,16 +63,55 @@ class MecademicDriver(BaseRobotDriver):
         self.speed = config["speed"]
         
         # Mecademic robot instance
-        self._robot: Optional[mecademicpy.Robot] = None
-        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"meca_{robot_id}")
+        self._robot: Optional[Any] = None
+        # One ordered command thread plus a status thread, shared with AsyncRobotWrapper
+        self.io_channel = RobotIOChannel(robot_id)
+        
+        # Latest-status snapshot fed from the robot's monitoring stream
+        self.status_feed = RobotStatusFeed(robot_id, self._read_status_feed_sync, self.io_channel)
         
         # Connection state
         self._last_status = {}
         self._last_status_time = 0.0
         self._status_cache_duration = 1.0  # Cache for 1 second
         
+        # Reconnect fast path: connection mode that worked last time, when the
+        # control connection was lost, and an optional monitoring-only standby socket
+        self.standby_monitor = bool(config.get("standby_monitor", False))
+        self._standby: Optional[Any] = None
+        self._preferred_connection_mode: Optional[str] = None
+        self._connection_lost_at: Optional[float] = None
+        # Bumped on every successful connect; the robot instance itself is reused
+        self._connection_generation = 0
+        self._reconnect_stats = {
+            "connects": 0,
+            "reconnects": 0,
+            "instance_reused": 0,
+            "waits_skipped": 0,
+            "connection_mode": None,
+            "last_time_to_ready": None,
+            "best_time_to_ready": None,
+            "worst_time_to_ready": None,
+            "total_time_to_ready": 0.0
+        }
+        self.status_feed.add_edge_listener(self._on_status_edge)
+        
+        # Called after every ClearMotion: queued Set* commands were discarded with the motions
+        self._motion_cleared_listeners: List[Callable[[], None]] = []
+        
         self.logger.info(f"Initialized Mecademic driver for {robot_id} at {self.ip_address}:{self.port}")
     
+    def add_motion_cleared_listener(self, callback: Callable[[], None]):
+        """Register a callback run after each ClearMotion sent by this driver"""
+        self._motion_cleared_listeners.append(callback)
+    
+    def _notify_motion_cleared(self):
+        for callback in self._motion_cleared_listeners:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.warning(f"Motion-cleared listener failed for {self.robot_id}: {e}")
+    
     def set_settings(self, settings):
         """Set settings reference for debug logging"""
         self._settings = settings
@@ -103,8 +152,9 @@ class MecademicDriver(BaseRobotDriver):
             if self._connected:
                 await self.disconnect()
         finally:
-            # Shutdown executor
-            self._executor.shutdown(wait=True)
+            self._close_standby_sync()
+            # Shutdown command/status threads
+            self.io_channel.shutdown(wait=True)
             self.logger.info(f"Mecademic driver for {self.robot_id} shutdown complete")
     
     async def _connect_impl(self) -> bool:
@@ -113,11 +163,24 @@ class MecademicDriver(BaseRobotDriver):
             self.debug_log("_connect_impl", "entry", "Starting MecademicDriver connection process")
             self.logger.info(f"🔄 Starting MecademicDriver connection process for {self.robot_id}")
             
+            connect_started = time.time()
+            
             # Create robot instance
             self.debug_log("_connect_impl", "create_instance", "Creating mecademicpy Robot() instance")
-            self.logger.info(f"📦 Creating mecademicpy Robot() instance for {self.robot_id}")
             try:
-                self._robot = MecademicRobot()
+                if self._robot is not None:
+                    # Connection was lost but not torn down: reconnect the same instance
+                    # (keeps registered callbacks; the simulator keeps its arm state)
+                    self._reconnect_stats["instance_reused"] += 1
+                    self.logger.info(f"♻️ Reusing robot instance for {self.robot_id}")
+                else:
+                    self.logger.info(f"📦 Creating mecademicpy Robot() instance for {self.robot_id}")
+                    if self.simulate:
+                        self._robot = SimulatedMecaRobot(time_scale=self.simulation_time_scale)
+                        self.logger.info(f"🧪 Using simulated Mecademic robot for {self.robot_id} (time_scale={self.simulation_time_scale})")
+                    else:
+                        self._robot = MecademicRobot()
+                    self._register_status_callbacks()
                 self.debug_log("_connect_impl", "instance_success", "mecademicpy instance created successfully")
                 self.logger.info(f"✅ mecademicpy Robot() instance created successfully for {self.robot_id}")
             except Exception as robot_create_error:
@@ -138,7 +201,7 @@ class MecademicDriver(BaseRobotDriver):
                               {"ip": self.ip_address, "port": self.port, "timeout": self.timeout})
                 connect_success = await asyncio.wait_for(
                     loop.run_in_executor(
-                        self._executor,
+                        self.io_channel.command_executor,
                         self._connect_sync
                     ),
                     timeout=self.timeout + 5.0  # Add 5s buffer for thread pool overhead
@@ -154,11 +217,16 @@ class MecademicDriver(BaseRobotDriver):
             if connect_success:
                 self.debug_log("_connect_impl", "tcp_success", "mecademicpy Robot.Connect() succeeded")
                 self.logger.info(f"🎉 mecademicpy Robot.Connect() succeeded for {self.robot_id}")
+                self._connection_generation += 1
                 
-                # Activate robot before setting parameters
-                self.debug_log("_connect_impl", "stabilization", "Waiting for connection stabilization")
-                self.logger.info(f"⏳ Waiting 1s for connection stabilization before activation for {self.robot_id}")
-                await asyncio.sleep(1.0)  # Give connection more time to stabilize
+                # Activate robot before setting parameters. The stabilization wait is only
+                # needed when the robot's status stream is not yet readable
+                self.debug_log("_connect_impl", "stabilization", "Checking connection stabilization")
+                if await self.io_channel.run_status(self._connection_ready_sync):
+                    self._reconnect_stats["waits_skipped"] += 1
+                else:
+                    self.logger.info(f"⏳ Waiting 1s for connection stabilization before activation for {self.robot_id}")
+                    await asyncio.sleep(1.0)  # Give connection more time to stabilize
                 
                 try:
                     self.debug_log("_connect_impl", "activation_start", "Starting robot activation sequence")
@@ -182,7 +250,12 @@ class MecademicDriver(BaseRobotDriver):
                 # Clear status cache to ensure fresh status on next get_status() call
                 self.debug_log("_connect_impl", "cache_clear", "Clearing status cache after successful connection")
                 self.clear_status_cache()
+                self.status_feed.start()
+                
+                if self.standby_monitor:
+                    await self.io_channel.run_status(self._open_standby_sync)
                 
+                self._record_time_to_ready(connect_started)
                 self.logger.info(f"🏆 MecademicDriver fully initialized and connected for {self.robot_id}")
                 return True
             else:
@@ -249,6 +322,14 @@ class MecademicDriver(BaseRobotDriver):
                 {"enable_synchronous_mode": False, "mode_name": "async"},
                 {"enable_synchronous_mode": True, "mode_name": "sync"}
             ]
+            # Try the mode that worked last time first
+            connection_modes.sort(key=lambda mode: mode["mode_name"] != self._preferred_connection_mode)
+            
+            if hasattr(self._robot, 'IsConnected') and self._robot.IsConnected():
+                # Reused instance whose connection is still up
+                self.logger.info(f"✅ Robot {self.robot_id} is still connected")
+                connection_modes = []
+                connection_succeeded = True
             
             for mode_config in connection_modes:
                 try:
@@ -265,6 +346,8 @@ class MecademicDriver(BaseRobotDriver):
                     )
                     
                     self.logger.info(f"✅ Connection successful in {mode_name} mode for {self.robot_id}")
+                    self._preferred_connection_mode = mode_name
+                    self._reconnect_stats["connection_mode"] = mode_name
                     connection_succeeded = True
                     break
                     
@@ -298,9 +381,12 @@ class MecademicDriver(BaseRobotDriver):
             connect_duration = time.time() - start_time
             self.logger.info(f"⏱️ mecademicpy Robot.Connect() completed in {connect_duration:.2f}s for {self.robot_id}")
             
-            # Wait for connection to be established
-            self.logger.info(f"⏳ Waiting 0.5s for connection stabilization for {self.robot_id}")
-            time.sleep(0.5)
+            # Wait up to 0.5s for the connection to be reported as established
+            if not hasattr(self._robot, 'IsConnected'):
+                self.logger.info(f"⏳ Waiting 0.5s for connection stabilization for {self.robot_id}")
+                time.sleep(0.5)
+            elif self._wait_until(self._robot.IsConnected, 0.5):
+                self._reconnect_stats["waits_skipped"] += 1
             
             # Check if connected
             if hasattr(self._robot, 'IsConnected'):
@@ -348,7 +434,7 @@ class MecademicDriver(BaseRobotDriver):
             if self._robot:
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(
-                    self._executor,
+                    self.io_channel.command_executor,
                     self._activate_robot_sync_internal
                 )
         except Exception as e:
@@ -361,6 +447,7 @@ class MecademicDriver(BaseRobotDriver):
             self.logger.info(f"🔧 Starting robot activation sequence for {self.robot_id}")
             
             # Check robot status before activation
+            already_activated = already_homed = False
             try:
                 if hasattr(self._robot, 'GetStatusRobot'):
                     status = self._robot.GetStatusRobot()
@@ -373,19 +460,29 @@ class MecademicDriver(BaseRobotDriver):
                         if hasattr(self._robot, 'ResetError'):
                             self._robot.ResetError()
                             self.logger.info(f"✅ Error reset attempted for {self.robot_id}")
+                    else:
+                        # After a network blip the arm usually stays activated and homed
+                        already_activated = bool(getattr(status, 'activation_state', False))
+                        already_homed = already_activated and bool(getattr(status, 'homing_state', False))
             except Exception as status_e:
                 self.logger.warning(f"⚠️ Could not check robot status before activation for {self.robot_id}: {status_e}")
             
             # Step 1: Activate Robot
-            if hasattr(self._robot, 'ActivateRobot'):
+            if already_activated:
+                self.logger.info(f"✅ Robot {self.robot_id} already activated - skipping activation")
+                self._reconnect_stats["waits_skipped"] += 1
+            elif hasattr(self._robot, 'ActivateRobot'):
                 self.logger.info(f"🔋 Activating robot {self.robot_id}...")
                 try:
                     self._robot.ActivateRobot()
                     self.logger.info(f"✅ Robot {self.robot_id} activation command sent")
                     
                     # Wait for activation to complete
-                    self.logger.info(f"⏳ Waiting 2s for activation to complete for {self.robot_id}")
-                    time.sleep(2.0)
+                    if hasattr(self._robot, 'WaitActivated'):
+                        self._robot.WaitActivated(timeout=10.0)
+                    else:
+                        self.logger.info(f"⏳ Waiting 2s for activation to complete for {self.robot_id}")
+                        time.sleep(2.0)
                     
                     # Verify activation if possible
                     if hasattr(self._robot, 'GetStatusRobot'):
@@ -402,7 +499,9 @@ class MecademicDriver(BaseRobotDriver):
                 self.logger.warning(f"⚠️ Robot {self.robot_id} does not support ActivateRobot method")
             
             # Step 2: Home Robot (required before movements per mecademicpy docs)
-            if hasattr(self._robot, 'Home'):
+            if already_homed:
+                self.logger.info(f"✅ Robot {self.robot_id} already homed - skipping homing")
+            elif hasattr(self._robot, 'Home'):
                 self.logger.info(f"🏠 Homing robot {self.robot_id}...")
                 try:
                     self._robot.Home()
@@ -452,7 +551,10 @@ class MecademicDriver(BaseRobotDriver):
                             self.logger.info(f"✅ ResumeMotion() completed for {self.robot_id}")
 
                             # Wait briefly and verify motion resumed
-                            time.sleep(1.0)
+                            if not self._wait_until(
+                                lambda: not getattr(self._robot.GetStatusRobot(), 'pause_motion_status', True), 1.0
+                            ):
+                                self.logger.debug(f"Pause status not cleared within 1s for {self.robot_id}")
                             verify_status = self._robot.GetStatusRobot()
                             verify_paused = getattr(verify_status, 'pause_motion_status', True)
 
@@ -480,7 +582,7 @@ class MecademicDriver(BaseRobotDriver):
             if self._robot:
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(
-                    self._executor,
+                    self.io_channel.command_executor,
                     self._set_parameters_sync
                 )
         except Exception as e:
@@ -514,10 +616,14 @@ class MecademicDriver(BaseRobotDriver):
     async def _disconnect_impl(self) -> bool:
         """Implementation-specific disconnection logic"""
         try:
+            await self.status_feed.stop()
+            # A deliberate disconnect is not a connection loss
+            self._connection_lost_at = None
+            await self.io_channel.run_status(self._close_standby_sync)
             if self._robot:
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(
-                    self._executor,
+                    self.io_channel.command_executor,
                     self._disconnect_sync
                 )
             return True
@@ -547,7 +653,7 @@ class MecademicDriver(BaseRobotDriver):
             # Use status check as ping
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                self._executor,
+                self.io_channel.status_executor,
                 self._ping_sync
             )
             
@@ -579,6 +685,10 @@ class MecademicDriver(BaseRobotDriver):
         
         self.debug_log("_get_status_impl", "entry", "Getting robot status")
         
+        # Serve from the status feed snapshot when it is live (O(1), no robot round trip)
+        if self.status_feed.is_fresh(self._status_cache_duration):
+            return self.status_feed.latest().to_status_dict()
+        
         # Use cached status if available and fresh
         if (self._last_status and 
             current_time - self._last_status_time < self._status_cache_duration):
@@ -596,7 +706,7 @@ class MecademicDriver(BaseRobotDriver):
             self.debug_log("_get_status_impl", "fetching", "Executing status fetch in thread pool")
             loop = asyncio.get_event_loop()
             status = await loop.run_in_executor(
-                self._executor,
+                self.io_channel.status_executor,
                 self._get_status_sync
             )
             
@@ -683,6 +793,63 @@ class MecademicDriver(BaseRobotDriver):
                 "timestamp": time.time()
             }
     
+    def _read_status_feed_sync(self) -> Dict[str, Any]:
+        """
+        Lightweight status read for the status feed (runs on the status thread).
+        
+        mecademicpy mirrors the monitoring stream locally, so GetStatusRobot()
+        without a synchronous update does not round-trip to the robot.
+        """
+        robot = self._robot
+        connected = robot is not None and (robot.IsConnected() if hasattr(robot, 'IsConnected') else True)
+        if not connected and self.standby_connected:
+            # Control connection down: keep reporting arm state from the monitoring socket
+            robot = self._standby
+        if robot is None:
+            return {"connected": False}
+        
+        raw = {"connected": connected}
+        robot_status = robot.GetStatusRobot() if hasattr(robot, 'GetStatusRobot') else None
+        if robot_status:
+            raw.update({
+                "activated": bool(getattr(robot_status, 'activation_state', False)),
+                "homed": bool(getattr(robot_status, 'homing_state', False)),
+                "error": bool(getattr(robot_status, 'error_status', False)),
+                "paused": bool(getattr(robot_status, 'pause_motion_status', False)),
+                "end_of_block": bool(getattr(robot_status, 'end_of_block_status', False))
+            })
+        
+        if hasattr(robot, 'GetRobotRtData'):
+            rt_data = robot.GetRobotRtData()
+            cart_pos = getattr(rt_data, 'rt_cart_pos', None) if rt_data else None
+            if cart_pos is not None and getattr(cart_pos, 'data', None):
+                raw["position"] = tuple(cart_pos.data[:6])
+        
+        if hasattr(robot, 'GetRtGripperState'):
+            gripper_state = robot.GetRtGripperState()
+            if gripper_state is not None and hasattr(gripper_state, 'holding_part'):
+                raw["gripper_holding"] = bool(gripper_state.holding_part)
+        
+        return raw
+    
+    def _register_status_callbacks(self):
+        """Push status updates into the feed from mecademicpy's callback thread when supported"""
+        if not hasattr(self._robot, 'RegisterCallbacks'):
+            return
+        try:
+            if self.simulate and not mecademicpy_available:
+                callbacks = SimpleNamespace()
+            else:
+                from mecademicpy.robot import RobotCallbacks
+                callbacks = RobotCallbacks()
+            
+            callbacks.on_status_updated = lambda: self.status_feed.publish(self._read_status_feed_sync(), pushed=True)
+            callbacks.on_disconnected = lambda: self.status_feed.publish({"connected": False}, pushed=True)
+            self._robot.RegisterCallbacks(callbacks=callbacks, run_callbacks_in_separate_thread=True)
+            self.logger.info(f"📡 Status callbacks registered for {self.robot_id}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Status callbacks unavailable for {self.robot_id}, status feed will poll: {e}")
+    
     async def _emergency_stop_impl(self) -> bool:
         """Implementation-specific emergency stop logic"""
         try:
@@ -691,7 +858,7 @@ class MecademicDriver(BaseRobotDriver):
             
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                self._executor,
+                self.io_channel.status_executor,
                 self._emergency_stop_sync
             )
             
@@ -724,6 +891,7 @@ class MecademicDriver(BaseRobotDriver):
             if hasattr(self._robot, 'ClearMotion'):
                 self.logger.critical(f"🚨 Executing ClearMotion() to clear queue on {self.robot_id}")
                 self._robot.ClearMotion()
+                self._notify_motion_cleared()
                 emergency_executed = True
                 self.logger.critical(f"✅ ClearMotion() queue cleared for {self.robot_id}")
                 
@@ -767,7 +935,7 @@ class MecademicDriver(BaseRobotDriver):
             
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
-                self._executor,
+                self.io_channel.command_executor,
                 self._home_robot_sync
             )
             
@@ -812,7 +980,7 @@ class MecademicDriver(BaseRobotDriver):
                 
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(
-                    self._executor,
+                    self.io_channel.command_executor,
                     self._activate_robot_sync
                 )
                 
@@ -853,7 +1021,7 @@ class MecademicDriver(BaseRobotDriver):
         if hasattr(self._robot, 'IsConnected'):
             loop = asyncio.get_event_loop()
             is_connected = await loop.run_in_executor(
-                self._executor,
+                self.io_channel.status_executor,
                 lambda: self._robot.IsConnected()
             )
             
@@ -897,7 +1065,7 @@ class MecademicDriver(BaseRobotDriver):
                     if activated and homed and error:
                         self.logger.info(f"🔧 Robot {self.robot_id} activated/homed but has error, only resetting error")
                         if hasattr(self._robot, 'ResetError'):
-                            await loop.run_in_executor(self._executor, self._robot.ResetError)
+                            await self.io_channel.run_control(self._robot.ResetError)
                             self.logger.info(f"✅ Error reset for {self.robot_id}")
                         return
                         
@@ -908,7 +1076,7 @@ class MecademicDriver(BaseRobotDriver):
             if hasattr(self._robot, 'DeactivateRobot'):
                 self.logger.info(f"🔧 Calling DeactivateRobot() to clear occupation for {self.robot_id}")
                 await loop.run_in_executor(
-                    self._executor,
+                    self.io_channel.command_executor,
                     self._robot.DeactivateRobot
                 )
                 self.logger.info(f"✅ DeactivateRobot() completed for {self.robot_id}")
@@ -921,10 +1089,8 @@ class MecademicDriver(BaseRobotDriver):
             # Step 2: Clear any pending motions
             if hasattr(self._robot, 'ClearMotion'):
                 self.logger.info(f"🔧 Calling ClearMotion() for {self.robot_id}")
-                await loop.run_in_executor(
-                    self._executor,
-                    self._robot.ClearMotion
-                )
+                await self.io_channel.run_control(self._robot.ClearMotion)
+                self._notify_motion_cleared()
                 self.logger.info(f"✅ ClearMotion() completed for {self.robot_id}")
             else:
                 self.logger.warning(f"⚠️ ClearMotion() not available for {self.robot_id}")
@@ -932,10 +1098,7 @@ class MecademicDriver(BaseRobotDriver):
             # Step 3: Reset any error states
             if hasattr(self._robot, 'ResetError'):
                 self.logger.info(f"🔧 Calling ResetError() for {self.robot_id}")
-                await loop.run_in_executor(
-                    self._executor,
-                    self._robot.ResetError
-                )
+                await self.io_channel.run_control(self._robot.ResetError)
                 self.logger.info(f"✅ ResetError() completed for {self.robot_id}")
             else:
                 self.logger.warning(f"⚠️ ResetError() not available for {self.robot_id}")
@@ -957,7 +1120,7 @@ class MecademicDriver(BaseRobotDriver):
             if self._robot and hasattr(self._robot, 'Disconnect'):
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(
-                    self._executor,
+                    self.io_channel.command_executor,
                     self._robot.Disconnect
                 )
                 self.logger.info(f"🔌 Disconnected stale connection for {self.robot_id}")
@@ -1005,14 +1168,11 @@ class MecademicDriver(BaseRobotDriver):
                 
             self.debug_log("clear_motion", "clearing", "Calling ClearMotion() on robot instance")
             self.logger.info(f"🔧 Clearing motion queue for {self.robot_id}")
-            loop = asyncio.get_event_loop()
             
             if hasattr(self._robot, 'ClearMotion'):
-                self.debug_log("clear_motion", "executing", "Executing ClearMotion() in thread pool")
-                await loop.run_in_executor(
-                    self._executor,
-                    self._robot.ClearMotion
-                )
+                self.debug_log("clear_motion", "executing", "Executing ClearMotion() on the control thread")
+                await self.io_channel.run_control(self._robot.ClearMotion)
+                self._notify_motion_cleared()
                 self.debug_log("clear_motion", "success", "ClearMotion() completed successfully")
                 self.logger.info(f"✅ ClearMotion() completed for {self.robot_id}")
                 return True
@@ -1037,14 +1197,10 @@ class MecademicDriver(BaseRobotDriver):
                 
             self.debug_log("resume_motion", "resuming", "Calling ResumeMotion() on robot instance")
             self.logger.info(f"🔧 Resuming motion for {self.robot_id}")
-            loop = asyncio.get_event_loop()
             
             if hasattr(self._robot, 'ResumeMotion'):
-                self.debug_log("resume_motion", "executing", "Executing ResumeMotion() in thread pool")
-                await loop.run_in_executor(
-                    self._executor,
-                    self._robot.ResumeMotion
-                )
+                self.debug_log("resume_motion", "executing", "Executing ResumeMotion() on the control thread")
+                await self.io_channel.run_control(self._robot.ResumeMotion)
                 self.debug_log("resume_motion", "success", "ResumeMotion() completed successfully")
                 self.logger.info(f"✅ ResumeMotion() completed for {self.robot_id}")
                 return True
@@ -1058,23 +1214,27 @@ class MecademicDriver(BaseRobotDriver):
             return False
 
     async def wait_idle(self, timeout: float = 30.0) -> bool:
-        """Wait for robot to become idle (motion complete)"""
+        """Wait for robot to become idle (motion complete); False on timeout"""
         try:
             if not self._robot:
                 self.logger.warning(f"⚠️ No robot connection to wait for idle for {self.robot_id}")
                 return False
                 
             self.logger.info(f"⏳ Waiting for robot {self.robot_id} to become idle (timeout: {timeout}s)")
-            loop = asyncio.get_event_loop()
             
             if hasattr(self._robot, 'WaitIdle'):
-                # WaitIdle expects timeout in milliseconds
-                timeout_ms = int(timeout * 1000)
-                await loop.run_in_executor(
-                    self._executor,
-                    self._robot.WaitIdle,
-                    timeout_ms
-                )
+                # Sliced on the command thread so an abandoned wait lets go of it
+                abort = threading.Event()
+                try:
+                    idle = await asyncio.wait_for(
+                        self.io_channel.run_command(self._wait_idle_sync, timeout, abort),
+                        timeout=timeout + WAIT_SLICE
+                    )
+                finally:
+                    abort.set()
+                if not idle:
+                    self.logger.warning(f"⚠️ Robot {self.robot_id} not idle after {timeout}s")
+                    return False
                 self.logger.info(f"✅ Robot {self.robot_id} is now idle")
                 return True
             else:
@@ -1087,6 +1247,22 @@ class MecademicDriver(BaseRobotDriver):
             self.logger.error(f"❌ Wait idle error for {self.robot_id}: {type(e).__name__}: {e}")
             return False
 
+    def _wait_idle_sync(self, timeout: float, abort: threading.Event) -> bool:
+        """WaitIdle (timeout in seconds) in WAIT_SLICE steps; False on timeout or abort"""
+        deadline = time.monotonic() + timeout
+        while not abort.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                self._robot.WaitIdle(min(WAIT_SLICE, remaining))
+                return True
+            except Exception as e:
+                # mecademicpy raises TimeoutException on timeout, other errors mean the robot faulted
+                if "timeout" not in type(e).__name__.lower():
+                    raise
+        return False
+
     async def reset_error(self) -> bool:
         """Reset robot error state with connection recovery"""
         max_attempts = 3
@@ -1098,14 +1274,10 @@ class MecademicDriver(BaseRobotDriver):
                     return False
                     
                 self.logger.info(f"🔧 Resetting error state for {self.robot_id} (attempt {attempt + 1})")
-                loop = asyncio.get_event_loop()
                 
                 # Reset errors
                 if hasattr(self._robot, 'ResetError'):
-                    await loop.run_in_executor(
-                        self._executor,
-                        self._robot.ResetError
-                    )
+                    await self.io_channel.run_control(self._robot.ResetError)
                     self.logger.info(f"✅ ResetError() completed for {self.robot_id}")
                     
                     # Wait for reset to take effect
@@ -1113,10 +1285,7 @@ class MecademicDriver(BaseRobotDriver):
                     
                     # Resume motion if paused
                     if hasattr(self._robot, 'ResumeMotion'):
-                        await loop.run_in_executor(
-                            self._executor,
-                            self._robot.ResumeMotion
-                        )
+                        await self.io_channel.run_control(self._robot.ResumeMotion)
                         self.logger.info(f"✅ ResumeMotion() completed for {self.robot_id}")
                     
                     return True
@@ -1151,6 +1320,105 @@ class MecademicDriver(BaseRobotDriver):
         """Get the underlying mecademicpy.Robot instance"""
         return self._robot
     
+    @property
+    def connection_generation(self) -> int:
+        """Number of successful connects; changes on every reconnect"""
+        return self._connection_generation
+    
+    @property
+    def standby_connected(self) -> bool:
+        """True while the monitoring-only standby socket is open (robot reachable on the network)"""
+        standby = self._standby
+        try:
+            return standby is not None and standby.IsConnected()
+        except Exception:
+            return False
+    
+    def _open_standby_sync(self):
+        """Open the monitoring-only standby connection (runs on the status thread)"""
+        if self.standby_connected:
+            return
+        if self.simulate or not mecademicpy_available:
+            self.logger.info(f"Standby monitor connection not available for {self.robot_id} in simulation")
+            return
+        try:
+            standby = MecademicRobot()
+            standby.Connect(address=self.ip_address, monitor_mode=True, disconnect_on_exception=False, timeout=self.timeout)
+            self._standby = standby
+            self.logger.info(f"🛰️ Standby monitor connection open for {self.robot_id}")
+        except Exception as e:
+            self._standby = None
+            self.logger.warning(f"⚠️ Could not open standby monitor connection for {self.robot_id}: {e}")
+    
+    def _close_standby_sync(self):
+        standby, self._standby = self._standby, None
+        if standby is not None:
+            try:
+                standby.Disconnect()
+            except Exception as e:
+                self.logger.debug(f"Error closing standby monitor connection for {self.robot_id}: {e}")
+    
+    def _connection_ready_sync(self) -> bool:
+        """True when the control connection is up and the robot's status stream is readable"""
+        robot = self._robot
+        try:
+            return (
+                robot is not None
+                and (not hasattr(robot, 'IsConnected') or robot.IsConnected())
+                and hasattr(robot, 'GetStatusRobot') and robot.GetStatusRobot() is not None
+            )
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _wait_until(predicate, timeout: float, interval: float = 0.02) -> bool:
+        """Poll predicate until it is true or timeout elapses (blocking, for SDK threads)"""
+        deadline = time.time() + timeout
+        while True:
+            try:
+                if predicate():
+                    return True
+            except Exception:
+                pass
+            if time.time() >= deadline:
+                return False
+            time.sleep(interval)
+    
+    def _on_status_edge(self, field_name: str, old: Any, new: Any, snapshot: Any):
+        if field_name == "connected" and old and not new and self._connection_lost_at is None:
+            self._connection_lost_at = time.time()
+    
+    def _record_time_to_ready(self, connect_started: float):
+        """Record connect time, and time-to-ready since the connection was lost"""
+        stats = self._reconnect_stats
+        stats["connects"] += 1
+        lost_at, self._connection_lost_at = self._connection_lost_at, None
+        if lost_at is None:
+            return
+        time_to_ready = time.time() - lost_at
+        stats["reconnects"] += 1
+        stats["last_time_to_ready"] = time_to_ready
+        stats["total_time_to_ready"] += time_to_ready
+        if stats["best_time_to_ready"] is None or time_to_ready < stats["best_time_to_ready"]:
+            stats["best_time_to_ready"] = time_to_ready
+        if stats["worst_time_to_ready"] is None or time_to_ready > stats["worst_time_to_ready"]:
+            stats["worst_time_to_ready"] = time_to_ready
+        self.logger.info(
+            f"⏱️ Robot {self.robot_id} ready {time_to_ready:.3f}s after connection loss "
+            f"(connect took {time.time() - connect_started:.3f}s)"
+        )
+    
+    def get_reconnect_stats(self) -> Dict[str, Any]:
+        stats = dict(self._reconnect_stats)
+        stats["average_time_to_ready"] = (
+            stats["total_time_to_ready"] / stats["reconnects"] if stats["reconnects"] else None
+        )
+        stats["standby_monitor"] = self.standby_monitor
+        stats["standby_connected"] = self.standby_connected
+        stats["connection_lost_at"] = self._connection_lost_at
+        stats["connection_generation"] = self._connection_generation
+        return stats
+    
     def get_connection_info(self) -> Dict[str, Any]:
         """Get connection information"""
         return {
@@ -1159,7 +1427,8 @@ class MecademicDriver(BaseRobotDriver):
             "port": self.port,
             "timeout": self.timeout,
             "connected": self._connected,
-            "config": self.config
+            "config": self.config,
+            "reconnect": self.get_reconnect_stats()
         }
 
 
@@ -1186,7 +1455,10 @@ class MecademicDriverFactory:
             "retry_delay": settings.meca_retry_delay,
             "force": settings.meca_force,
             "acceleration": settings.meca_acceleration,
-            "speed": settings.meca_speed
+            "speed": settings.meca_speed,
+            "simulate": settings.meca_simulate,
+            "simulation_time_scale": settings.meca_simulation_time_scale,
+            "standby_monitor": settings.meca_standby_monitor
         }
         
         return MecademicDriver(robot_id, config)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Body
+from typing import Optional
 from utils.logger import get_logger
 from dependencies import MecaServiceDep, OrchestratorDep, CommandServiceDep
 from services.meca_service import MecaService
@@ -6,6 +7,7 @@ from services.orchestrator import RobotOrchestrator
 from services.command_service import RobotCommandService, CommandType, CommandPriority
 from pydantic import BaseModel
 from common.helpers import RouterHelper, CommandHelper, ResponseHelper
+from core.exceptions import ValidationError
 
 
 router = APIRouter()
@@ -246,6 +248,93 @@ async def create_empty_carousel_sequence(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/compiled-sequence")
+async def run_compiled_sequence(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Compile a wafer sequence into a single pre-validated motion program and run it.
+
+    Body parameters:
+        operation: 'pickup', 'drop', 'carousel' or 'empty_carousel'
+        start: Starting wafer index (0-based). Default: 0
+        count: Number of wafers. Default: 5
+        start_instruction: Must be 0; a run is only continued mid-program
+            through /resume-compiled-sequence. Default: 0
+        dry_run: Only compile and return the program summary. Default: False
+        mode: 'stream' (sent from the host) or 'upload' (stored and run on the
+            robot as an offline program). Default: 'stream'
+
+    Progress is journaled per instruction; an interrupted run (including one
+    cut short by a restart) is continued with /resume-compiled-sequence.
+    """
+    try:
+        operation = data.get("operation", "pickup")
+        start = data.get("start", 0)
+        count = data.get("count", 5)
+        start_instruction = data.get("start_instruction", 0)
+        mode = data.get("mode", "stream")
+
+        logger.info(f"Received compiled {operation} request: start={start}, count={count}, mode={mode}")
+
+        if data.get("dry_run", False):
+            program = meca_service.compile_sequence(operation, start, count)
+            return {
+                "status": "compiled",
+                "program": program.summary(),
+                "instructions": [instruction.to_dict() for instruction in program.instructions]
+            }
+
+        result = await meca_service.execute_compiled_sequence(operation, start, count, start_instruction, mode=mode)
+
+        if not result.success:
+            logger.error(f"Compiled {operation} sequence failed: {result.error}")
+            raise HTTPException(status_code=500, detail=result.error)
+
+        return {
+            "status": "success",
+            "data": result.data,
+            "message": f"Compiled {operation} sequence completed for wafers {start+1} to {start+count}",
+        }
+    except HTTPException:
+        raise
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error executing compiled sequence: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/render-program")
+async def render_program(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Render a compiled sequence in the robot's text program format without running it.
+
+    Body parameters:
+        operation: 'pickup', 'drop', 'carousel' or 'empty_carousel'
+        start: Starting wafer index (0-based). Default: 0
+        count: Number of wafers. Default: 5
+        start_instruction: Instruction index to resume from. Default: 0
+    """
+    try:
+        rendered = meca_service.render_compiled_program(
+            data.get("operation", "pickup"),
+            data.get("start", 0),
+            data.get("count", 5),
+            data.get("start_instruction", 0)
+        )
+        return {"status": "success", "program": rendered.summary(), "text": rendered.text}
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error rendering program: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/test-wafer/{wafer_number}")
 async def test_single_wafer(
     wafer_number: int,
@@ -341,64 +430,98 @@ async def process_wafer_batch(
         total_wafers_param = data.get("total_wafers", 25)
         wafers_per_cycle_param = data.get("wafers_per_cycle", 5)
         wafers_per_carousel_param = data.get("wafers_per_carousel", 11)
+        include_ot2 = data.get("include_ot2", True) and "ot2" in orchestrator.list_robot_services()
+        ot2_parameters = data.get("ot2_parameters", {})
 
-        # Create multi-robot workflow for batch processing
+        # Build a pipelined dependency graph:
+        # - OT2 liquid handling for batch k+1 runs while Meca does pickup/drop for batch k;
+        #   batch k+2 waits for drop k, so the OT2 is never more than one batch ahead
+        # - each carousel fill starts as soon as the drops covering its wafers are done
         robot_operations = []
+        cycle_starts = list(range(0, total_wafers_param, wafers_per_cycle_param))
+        carousel_starts = list(range(0, total_wafers_param, wafers_per_carousel_param))
+        next_carousel = 0
 
-        # Phase 1: Pickup and drop operations
-        for start in range(0, total_wafers_param, wafers_per_cycle_param):
+        for batch, start in enumerate(cycle_starts):
             count = min(wafers_per_cycle_param, total_wafers_param - start)
+            pickup_deps = []
+
+            if include_ot2:
+                robot_operations.append(
+                    {
+                        "id": f"ot2_{batch}",
+                        "robot_id": "ot2",
+                        "operation_type": "run_protocol",
+                        "parameters": dict(ot2_parameters),
+                        "depends_on": [f"drop_{batch - 2}"] if batch >= 2 else [],
+                        "timeout": 3600.0,
+                    }
+                )
+                pickup_deps.append(f"ot2_{batch}")
 
-            # Pickup operation
             robot_operations.append(
                 {
+                    "id": f"pickup_{batch}",
                     "robot_id": "meca",
-                    "operation_type": "pickup_wafer_sequence",
+                    "operation_type": "execute_pickup_sequence",
                     "parameters": {"start": start, "count": count},
+                    "depends_on": pickup_deps,
+                    "resources": ["spreader"],
                     "timeout": 600.0,
                 }
             )
-
-            # Drop operation (depends on pickup)
             robot_operations.append(
                 {
+                    "id": f"drop_{batch}",
                     "robot_id": "meca",
-                    "operation_type": "drop_wafer_sequence",
+                    "operation_type": "execute_drop_sequence",
                     "parameters": {"start": start, "count": count},
+                    "depends_on": [f"pickup_{batch}"],
+                    "resources": ["spreader", "baking_tray"],
                     "timeout": 600.0,
                 }
             )
 
-        # Phase 2: Carousel operations
-        for start in range(0, total_wafers_param, wafers_per_carousel_param):
-            count = min(wafers_per_carousel_param, total_wafers_param - start)
-
-            # Carousel fill operation
-            robot_operations.append(
-                {
-                    "robot_id": "meca",
-                    "operation_type": "carousel_wafer_sequence",
-                    "parameters": {"start": start, "count": count},
-                    "timeout": 900.0,
-                }
-            )
-
-            # Carousel empty operation
-            robot_operations.append(
-                {
-                    "robot_id": "meca",
-                    "operation_type": "empty_carousel_sequence",
-                    "parameters": {"start": start, "count": count},
-                    "timeout": 900.0,
-                }
-            )
+            # Queue every carousel fill whose baking-tray slots are now all filled
+            filled = start + count
+            while next_carousel < len(carousel_starts):
+                carousel_start = carousel_starts[next_carousel]
+                carousel_count = min(wafers_per_carousel_param, total_wafers_param - carousel_start)
+                if carousel_start + carousel_count > filled:
+                    break
+
+                robot_operations.append(
+                    {
+                        "id": f"carousel_{next_carousel}",
+                        "robot_id": "meca",
+                        "operation_type": "execute_carousel_sequence",
+                        "parameters": {"start": carousel_start, "count": carousel_count},
+                        "depends_on": [f"drop_{batch}"],
+                        "resources": ["baking_tray", "carousel"],
+                        "timeout": 900.0,
+                    }
+                )
+                robot_operations.append(
+                    {
+                        "id": f"empty_carousel_{next_carousel}",
+                        "robot_id": "meca",
+                        "operation_type": "execute_empty_carousel_sequence",
+                        "parameters": {"start": carousel_start, "count": carousel_count},
+                        "depends_on": [f"carousel_{next_carousel}"],
+                        "resources": ["baking_tray", "carousel"],
+                        "timeout": 900.0,
+                    }
+                )
+                next_carousel += 1
 
-        # Final home operation
+        # Final home operation once everything else is done
         robot_operations.append(
             {
+                "id": "home",
                 "robot_id": "meca",
-                "operation_type": "home_robot",
+                "operation_type": "controlled_homing_sequence",
                 "parameters": {},
+                "depends_on": [op["id"] for op in robot_operations],
                 "timeout": 120.0,  # Default 2 minute timeout for home operation
             }
         )
@@ -408,7 +531,7 @@ async def process_wafer_batch(
         result = await orchestrator.execute_multi_robot_workflow(
             workflow_id=workflow_id,
             robot_operations=robot_operations,
-            coordination_strategy="sequential",
+            coordination_strategy="dependency_based",
         )
 
         if not result.success:
@@ -417,9 +540,12 @@ async def process_wafer_batch(
         return {
             "status": "success",
             "workflow_id": workflow_id,
-            "message": f"Batch processing workflow started for {total_wafers_param} wafers",
+            "message": f"Batch processing workflow completed for {total_wafers_param} wafers",
             "total_operations": len(robot_operations),
+            "schedule": orchestrator.get_last_workflow_schedule(),
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in batch processing: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -473,6 +599,8 @@ async def debug_connection_state(service: MecaService = MecaServiceDep()):
                 # Check robot instance
                 robot_instance = driver.get_robot_instance() if hasattr(driver, 'get_robot_instance') else None
                 debug_info["robot_instance_available"] = robot_instance is not None
+                if hasattr(driver, 'get_reconnect_stats'):
+                    debug_info["reconnect"] = driver.get_reconnect_stats()
                 
                 if robot_instance:
                     # Check socket connection status - try multiple approaches
@@ -720,9 +848,14 @@ async def preview_wafer_positions(
 
     Body parameters:
         wafer_indices: List of wafer indices (0-based) to preview. Default: [0, 27, 54]
+        operations: Operations whose poses to include ('pickup', 'drop', 'carousel',
+            'empty_carousel'). Poses are served from the precomputed position table. Default: []
+        pose_names: Optional subset of pose names to return per operation
     """
     try:
         wafer_indices = data.get("wafer_indices", [0, 27, 54])
+        operations = data.get("operations", [])
+        pose_names = data.get("pose_names")
 
         # Validate indices
         invalid_indices = [i for i in wafer_indices if i < 0 or i > 54]
@@ -738,13 +871,24 @@ async def preview_wafer_positions(
             first_baking=meca_service.FIRST_BAKING_TRAY
         )
 
+        poses = {}
+        if operations:
+            table = meca_service.get_position_table()
+            poses = {
+                operation: table.slice(operation, wafer_indices, pose_names)
+                for operation in operations
+            }
+
         return {
             "status": "success",
             "preview": preview,
+            "poses": poses,
             "config_version": meca_service.wafer_config_manager.config_version
         }
     except HTTPException:
         raise
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error previewing wafer positions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -772,3 +916,221 @@ async def reload_sequence_config(meca_service: MecaService = MecaServiceDep()):
     except Exception as e:
         logger.error(f"Error reloading sequence config: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/confirmed-actions")
+async def get_confirmed_actions_report(meca_service: MecaService = MecaServiceDep()):
+    """
+    Per-wafer timing report for confirmed-actions mode: fixed delay time versus
+    actual wait time, and seconds saved.
+    """
+    try:
+        return {"status": "success", "data": meca_service.get_confirmed_actions_report()}
+    except Exception as e:
+        logger.error(f"Error getting confirmed actions report: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/confirmed-actions")
+async def set_confirmed_actions(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Enable or disable confirmed-actions mode.
+
+    Body parameters:
+        enabled: End gripper/settle delays on hardware confirmation. Default: True
+        reset: Clear the timing report. Default: False
+    """
+    try:
+        enabled = bool(data.get("enabled", True))
+        report = meca_service.set_confirmed_actions(enabled, reset_report=bool(data.get("reset", False)))
+        return {
+            "status": "success",
+            "data": report,
+            "message": f"Confirmed actions {'enabled' if enabled else 'disabled'}",
+        }
+    except Exception as e:
+        logger.error(f"Error setting confirmed actions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/timing-trace")
+async def get_timing_trace(
+    operation: Optional[str] = None,
+    gantt: bool = False,
+    limit: int = 5000,
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Structured timing for recorded wafer sequences.
+
+    Query parameters:
+        operation: Restrict to 'pickup', 'drop', 'carousel' or 'empty_carousel'
+        gantt: Include Gantt-ready rows (sequence, wafer and step spans). Default: False
+        limit: Maximum number of Gantt rows (most recent). Default: 5000
+
+    Steps are sorted by total time, so the moves and delays that dominate
+    cycle time are listed first.
+    """
+    try:
+        return {
+            "status": "success",
+            "data": meca_service.get_timing_trace(operation, include_gantt=gantt, limit=limit),
+        }
+    except Exception as e:
+        logger.error(f"Error getting timing trace: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/estimate-cycle-time")
+async def estimate_cycle_time(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Predict how long Meca sequences will take before running them.
+
+    Body parameters:
+        operations: Sequences to estimate ('pickup', 'drop', 'carousel',
+            'empty_carousel'). Default: all four
+        start: Starting wafer index (0-based). Default: 0
+        count: Number of wafers. Default: 5
+        overrides: What-if speeds by name ('wafer_speed', 'empty_speed', 'align_speed',
+            'entry_speed', 'speed') and 'acceleration', in percent
+        include_moves: Include the per-move breakdown. Default: False
+
+    Returns predicted (model) and calibrated (scaled by recorded runs) seconds per
+    wafer and per sequence, plus the moves that dominate time or are left unblended.
+    """
+    try:
+        operations = data.get("operations", ["pickup", "drop", "carousel", "empty_carousel"])
+        if isinstance(operations, str):
+            operations = [operations]
+
+        estimate = meca_service.estimate_cycle_time(
+            operations=operations,
+            start=int(data.get("start", 0)),
+            count=int(data.get("count", 5)),
+            overrides=data.get("overrides"),
+            include_moves=bool(data.get("include_moves", False)),
+        )
+        return {"status": "success", "data": estimate}
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error estimating cycle time: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/calibrate-cycle-time")
+async def calibrate_cycle_time(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Record a measured sequence duration to calibrate cycle-time estimates.
+    Recorded sequence timings are also picked up automatically on each estimate.
+
+    Body parameters:
+        operation: Sequence that was run (required)
+        start: Starting wafer index (0-based). Default: 0
+        count: Number of wafers. Default: 5
+        measured_seconds: Wall-clock duration of the run (required)
+    """
+    try:
+        if "operation" not in data or "measured_seconds" not in data:
+            raise HTTPException(status_code=400, detail="operation and measured_seconds are required")
+
+        calibration = meca_service.calibrate_cycle_time(
+            operation=data["operation"],
+            start=int(data.get("start", 0)),
+            count=int(data.get("count", 5)),
+            measured_seconds=float(data["measured_seconds"]),
+        )
+        return {"status": "success", "data": calibration}
+    except HTTPException:
+        raise
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error calibrating cycle time: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/optimize-motion-profile")
+async def optimize_motion_profile(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Offline optimization of the per-move speed/blending schedule.
+
+    Body parameters:
+        operation: Sequence to optimize. Default: 'carousel'
+        wafers: Number of wafers to predict for. Default: 55
+        constraints: Per-move overrides, e.g. {"t_photogate": {"max_joint_vel": 25,
+            "max_blending": 50}}; velocities may name a movement speed or 'max_speed'
+        name: Profile name. Default: generated
+
+    Nothing is applied: the returned sequence_config_patch is added to
+    runtime.json under meca.sequence_config and loaded with /reload-sequence-config.
+    """
+    try:
+        result = meca_service.optimize_motion_profile(
+            operation=data.get("operation", "carousel"),
+            wafers=int(data.get("wafers", 55)),
+            constraints=data.get("constraints"),
+            name=data.get("name"),
+        )
+        return {"status": "success", "data": result}
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error optimizing motion profile: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/checkpoints")
+async def get_checkpoints(meca_service: MecaService = MecaServiceDep()):
+    """List interrupted compiled sequences that can be resumed from the checkpoint journal"""
+    try:
+        return {"status": "success", "data": meca_service.list_checkpoints()}
+    except Exception as e:
+        logger.error(f"Error reading checkpoint journal: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/resume-compiled-sequence")
+async def resume_compiled_sequence(
+    data: dict = Body(default={}),
+    meca_service: MecaService = MecaServiceDep(),
+):
+    """
+    Resume an interrupted compiled sequence from its last confirmed instruction.
+
+    Body parameters:
+        run_id: Journal run to resume. Default: the most recent interrupted run
+        dry_run: Only return the re-entry plan without moving. Default: False
+        mode: 'stream' or 'upload', as for /compiled-sequence. Default: 'stream'
+    """
+    try:
+        result = await meca_service.resume_compiled_sequence(
+            run_id=data.get("run_id"),
+            dry_run=bool(data.get("dry_run", False)),
+            mode=data.get("mode", "stream"),
+        )
+
+        if not result.success:
+            logger.error(f"Resumed compiled sequence failed: {result.error}")
+            raise HTTPException(status_code=500, detail=result.error)
+
+        return {"status": "success", "data": result.data}
+    except HTTPException:
+        raise
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error resuming compiled sequence: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,368 @@
+"""
+Checkpoint journal - durable instruction-level progress for compiled Meca sequences.
+
+Every compiled run appends a 'begin' record, one 'confirm' record each time the
+robot confirms more instructions, and an 'end' record. Records are JSON lines,
+written and flushed to the OS immediately (a process crash loses nothing) and
+fsync'ed in batches (a power loss loses at most fsync_batch records or
+fsync_interval seconds). Runs without a successful 'end' can be resumed from
+their last confirmed instruction.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.async_robot_wrapper import IDEMPOTENT_CONFIG_COMMANDS
+from core.exceptions import ValidationError
+from .meca_sequence_compiler import PROFILE_MOVE_COMMANDS, CompiledSequence, SequenceInstruction
+
+# A journal larger than this is rewritten (unfinished runs only) when a run begins
+COMPACT_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+# Re-entry: poses closer than this are treated as "already there"
+POSITION_TOLERANCE = 0.5   # mm
+ORIENTATION_TOLERANCE = 0.5  # deg
+
+
+@dataclass
+class JournalRun:
+    """State of one compiled run as reconstructed from the journal"""
+    run_id: str
+    operation: str
+    start: int
+    count: int
+    config_version: str
+    total_instructions: int
+    started_at: float
+    confirmed_index: int = 0
+    confirmed_at: Optional[float] = None
+    status: str = "running"  # running | completed | failed | aborted
+    error: Optional[str] = None
+    resumes: int = 0
+
+    @property
+    def resumable(self) -> bool:
+        return self.status != "completed" and self.confirmed_index < self.total_instructions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "operation": self.operation,
+            "start_wafer": self.start + 1,
+            "end_wafer": self.start + self.count,
+            "config_version": self.config_version,
+            "total_instructions": self.total_instructions,
+            "confirmed_index": self.confirmed_index,
+            "confirmed_at": self.confirmed_at,
+            "started_at": self.started_at,
+            "status": self.status,
+            "error": self.error,
+            "resumes": self.resumes,
+            "resumable": self.resumable
+        }
+
+
+class CheckpointJournal:
+    """
+    Append-only, fsync-batched journal of compiled sequence progress.
+
+    confirm() is called from the robot command thread while a program streams,
+    so all writes go through a lock.
+    """
+
+    def __init__(self, path: str, fsync_batch: int = 32, fsync_interval: float = 0.25):
+        self.path = Path(path)
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._last_confirmed: Dict[str, int] = {}
+        self._stats = {"records": 0, "fsyncs": 0, "compactions": 0}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, record: Dict[str, Any], sync: bool = False):
+        with self._lock:
+            self._open()
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            self._stats["records"] += 1
+            if (
+                sync
+                or self._unsynced >= self.fsync_batch
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._stats["fsyncs"] += 1
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def begin(self, run_id: str, program: CompiledSequence):
+        if self.path.exists() and self.path.stat().st_size > COMPACT_THRESHOLD_BYTES:
+            self.compact()
+        self._last_confirmed[run_id] = 0
+        self._append({
+            "type": "begin",
+            "run": run_id,
+            "operation": program.operation,
+            "start": program.start,
+            "count": program.count,
+            "config_version": program.config_version,
+            "total": len(program),
+            "ts": time.time()
+        }, sync=True)
+
+    def resume(self, run_id: str, from_index: int):
+        self._last_confirmed[run_id] = from_index
+        self._append({"type": "resume", "run": run_id, "index": from_index, "ts": time.time()}, sync=True)
+
+    def confirm(self, run_id: str, index: int):
+        """Record that instructions before `index` are done (ignored unless it advances)"""
+        if index <= self._last_confirmed.get(run_id, -1):
+            return
+        self._last_confirmed[run_id] = index
+        self._append({"type": "confirm", "run": run_id, "index": index, "ts": time.time()})
+
+    def end(self, run_id: str, status: str, index: int, error: Optional[str] = None):
+        self._last_confirmed.pop(run_id, None)
+        self._append(
+            {"type": "end", "run": run_id, "status": status, "index": index, "error": error, "ts": time.time()},
+            sync=True
+        )
+
+    def flush(self):
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _read_records(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write: everything before it is intact
+                    break
+        return records
+
+    def load_runs(self) -> Dict[str, JournalRun]:
+        """Replay the journal into per-run state (in begin order)"""
+        runs: Dict[str, JournalRun] = {}
+        for record in self._read_records():
+            run = runs.get(record.get("run"))
+            kind = record.get("type")
+            if kind == "begin":
+                runs[record["run"]] = JournalRun(
+                    run_id=record["run"],
+                    operation=record["operation"],
+                    start=record["start"],
+                    count=record["count"],
+                    config_version=record["config_version"],
+                    total_instructions=record["total"],
+                    started_at=record["ts"]
+                )
+            elif run is None:
+                continue
+            elif kind == "confirm":
+                run.confirmed_index = max(run.confirmed_index, record["index"])
+                run.confirmed_at = record["ts"]
+            elif kind == "resume":
+                run.resumes += 1
+                run.status = "running"
+                run.confirmed_index = max(run.confirmed_index, record["index"])
+            elif kind == "end":
+                run.status = record["status"]
+                run.error = record.get("error")
+                run.confirmed_index = max(run.confirmed_index, record["index"])
+        return runs
+
+    def resumable_runs(self) -> List[JournalRun]:
+        """Unfinished runs, most recently started first"""
+        runs = [run for run in self.load_runs().values() if run.resumable]
+        return sorted(runs, key=lambda run: run.started_at, reverse=True)
+
+    def discard(self, run_id: str):
+        """Mark an unfinished run as abandoned so it is no longer offered for resume"""
+        runs = self.load_runs()
+        if run_id not in runs:
+            raise ValidationError(f"Unknown checkpoint run: {run_id}", field="run_id")
+        self.end(run_id, "completed", runs[run_id].confirmed_index, error="discarded")
+
+    def compact(self):
+        """Rewrite the journal keeping only the state of unfinished runs (atomic rename)"""
+        with self._lock:
+            runs = [run for run in self.load_runs().values() if run.resumable]
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for run in runs:
+                    f.write(json.dumps({
+                        "type": "begin", "run": run.run_id, "operation": run.operation,
+                        "start": run.start, "count": run.count, "config_version": run.config_version,
+                        "total": run.total_instructions, "ts": run.started_at
+                    }, separators=(",", ":")) + "\n")
+                    f.write(json.dumps({
+                        "type": "end", "run": run.run_id, "status": run.status, "index": run.confirmed_index,
+                        "error": run.error, "ts": run.confirmed_at or run.started_at
+                    }, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._stats["compactions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "unsynced_records": self._unsynced,
+            "fsync_batch": self.fsync_batch,
+            "fsync_interval": self.fsync_interval,
+            **self._stats
+        }
+
+
+def _pose_matches(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    if math.dist(a[:3], b[:3]) > POSITION_TOLERANCE:
+        return False
+    return all(abs(x - y) <= ORIENTATION_TOLERANCE for x, y in zip(a[3:], b[3:]))
+
+
+@dataclass
+class ReentryPlan:
+    """Motion that brings the robot back onto a program before resuming it"""
+    resume_index: int
+    resume_wafer: Optional[int]
+    expected_gripper: Optional[str]  # 'open' | 'closed' | None (never commanded)
+    target_pose: Optional[Tuple[float, ...]]
+    current_pose: Optional[Tuple[float, ...]]
+    approach_index: Optional[int] = None
+    clearance_z: Optional[float] = None
+    instructions: List[SequenceInstruction] = field(default_factory=list)
+
+    @property
+    def already_in_place(self) -> bool:
+        return not self.instructions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "resume_index": self.resume_index,
+            "resume_wafer": self.resume_wafer + 1 if self.resume_wafer is not None else None,
+            "expected_gripper": self.expected_gripper,
+            "target_pose": list(self.target_pose) if self.target_pose else None,
+            "current_pose": list(self.current_pose) if self.current_pose else None,
+            "already_in_place": self.already_in_place,
+            "approach_index": self.approach_index,
+            "clearance_z": self.clearance_z,
+            "instructions": [instruction.to_dict() for instruction in self.instructions]
+        }
+
+
+def plan_reentry(
+    program: CompiledSequence,
+    resume_index: int,
+    current_pose: Optional[Tuple[float, ...]]
+) -> ReentryPlan:
+    """
+    Compute a safe path from the robot's current pose back onto a program.
+
+    The arm must be where the last move before resume_index left it. It gets
+    there the way the program did: retract straight up to the height of the
+    approach waypoint (the last earlier pose above the target since the
+    gripper last acted), then replay the program's own moves from that
+    waypoint down to the target, with the motion settings in force there.
+    """
+    if not 0 <= resume_index <= len(program):
+        raise ValidationError(
+            f"Resume index {resume_index} out of range (0-{len(program)})", field="resume_index"
+        )
+
+    prior = program.instructions[:resume_index]
+    moves = [i for i in prior if i.command_type in PROFILE_MOVE_COMMANDS]
+    grippers = [i for i in prior if i.command_type in ("GripperOpen", "GripperClose")]
+
+    plan = ReentryPlan(
+        resume_index=resume_index,
+        resume_wafer=program.wafer_at(resume_index),
+        expected_gripper=("closed" if grippers[-1].command_type == "GripperClose" else "open") if grippers else None,
+        target_pose=tuple(moves[-1].parameters) if moves else None,
+        current_pose=tuple(current_pose) if current_pose is not None else None
+    )
+    if not moves:
+        return plan
+    if plan.current_pose is None:
+        raise ValidationError(
+            "Current robot pose unknown - cannot compute a safe re-entry path", field="current_pose"
+        )
+    if _pose_matches(plan.current_pose, plan.target_pose):
+        return plan
+
+    # Approach waypoint: the last move above the target since the gripper last acted.
+    # The path is never replayed across a gripper action; with no such move the
+    # target is the highest point of that segment and is approached directly.
+    target = moves[-1]
+    since_gripper = grippers[-1].index if grippers else -1
+    approach = target
+    for move in reversed(moves[:-1]):
+        if move.index < since_gripper:
+            break
+        if move.parameters[2] > plan.target_pose[2] + POSITION_TOLERANCE:
+            approach = move
+            break
+    current = plan.current_pose
+    clearance_z = max(current[2], approach.parameters[2])
+
+    steps: List[Tuple[str, Tuple[Any, ...], str]] = [
+        (setting.command_type, setting.parameters, "reentry_settings")
+        for setting in program.settings_before(approach.index)
+    ]
+    if clearance_z > current[2] + POSITION_TOLERANCE:
+        steps.append(("MoveLin", (current[0], current[1], clearance_z) + current[3:6], "reentry_retract"))
+    for instruction in program.instructions[approach.index:target.index + 1]:
+        if instruction.command_type in PROFILE_MOVE_COMMANDS or instruction.command_type in IDEMPOTENT_CONFIG_COMMANDS:
+            steps.append((instruction.command_type, instruction.parameters, f"reentry_{instruction.label}"))
+
+    plan.approach_index = approach.index
+    plan.clearance_z = clearance_z
+    plan.instructions = [
+        SequenceInstruction(index=index, command_type=command_type, parameters=parameters,
+                            wafer_index=plan.resume_wafer, label=label)
+        for index, (command_type, parameters, label) in enumerate(steps)
+    ]
+    return plan
@@ -0,0 +1,110 @@
+"""
+Confirmed actions - replace fixed gripper/settle delays with hardware confirmation.
+
+When enabled, a Delay that follows a gripper command completes as soon as the
+robot reports the gripper move done, and a Delay that follows motion completes
+at end of block. The original delay is kept as the upper bound, so the robot
+never waits longer than before. Every replaced delay is recorded per wafer so
+the time saved can be reported.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+GRIPPER_COMMANDS = frozenset({"GripperOpen", "GripperClose", "MoveGripper"})
+MOTION_COMMANDS = frozenset({"MovePose", "MoveLin", "MoveJoints", "MoveLinRelWRF", "MoveLinRelTRF", "SetConf"})
+
+
+@dataclass
+class WaferActionTiming:
+    """Confirmed-wait timings for one wafer in one operation"""
+    operation: str
+    wafer_num: int
+    waits: int = 0
+    confirmed: int = 0
+    budget: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.budget - self.elapsed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operation": self.operation,
+            "wafer_num": self.wafer_num,
+            "waits": self.waits,
+            "confirmed": self.confirmed,
+            "fixed_delay_time": round(self.budget, 3),
+            "actual_wait_time": round(self.elapsed, 3),
+            "seconds_saved": round(self.saved, 3)
+        }
+
+
+@dataclass
+class ConfirmedActionTracker:
+    """
+    Decides which Delay commands may be confirmed and keeps the timing report.
+
+    Only the Delay immediately following a gripper or motion command is
+    confirmable; process waits (e.g. spreading time) must be sent with
+    confirm=False by the caller.
+    """
+    enabled: bool = False
+    _last_action: Optional[str] = None
+    _current: Optional[Tuple[str, int]] = None
+    _wafers: Dict[Tuple[str, int], WaferActionTiming] = field(default_factory=dict)
+    _started_at: float = field(default_factory=time.time)
+
+    def begin_wafer(self, operation: str, wafer_num: int):
+        # The last action carries over: a batch delay at the top of a wafer
+        # still settles the previous wafer's final move
+        self._current = (operation, wafer_num)
+
+    def note_command(self, command_type: str):
+        """Track the last queued action so the following Delay knows what to confirm"""
+        if command_type in GRIPPER_COMMANDS:
+            self._last_action = "gripper"
+        elif command_type in MOTION_COMMANDS:
+            self._last_action = "settle"
+        elif command_type == "Delay":
+            self._last_action = None
+
+    def pending_action(self) -> Optional[str]:
+        """Action the next Delay can wait on, or None for a plain delay"""
+        return self._last_action if self.enabled else None
+
+    def record(self, budget: float, elapsed: float, confirmed: bool):
+        operation, wafer_num = self._current or ("unassigned", 0)
+        timing = self._wafers.get((operation, wafer_num))
+        if timing is None:
+            timing = self._wafers[(operation, wafer_num)] = WaferActionTiming(operation, wafer_num)
+        timing.waits += 1
+        timing.confirmed += 1 if confirmed else 0
+        timing.budget += budget
+        timing.elapsed += min(elapsed, budget)
+
+    def report(self) -> Dict[str, Any]:
+        wafers: List[WaferActionTiming] = sorted(
+            self._wafers.values(), key=lambda t: (t.operation, t.wafer_num)
+        )
+        return {
+            "enabled": self.enabled,
+            "since": self._started_at,
+            "wafers": [t.to_dict() for t in wafers],
+            "totals": {
+                "waits": sum(t.waits for t in wafers),
+                "confirmed": sum(t.confirmed for t in wafers),
+                "fixed_delay_time": round(sum(t.budget for t in wafers), 3),
+                "actual_wait_time": round(sum(t.elapsed for t in wafers), 3),
+                "seconds_saved": round(sum(t.saved for t in wafers), 3)
+            }
+        }
+
+    def reset(self):
+        self._wafers.clear()
+        self._current = None
+        self._last_action = None
+        self._started_at = time.time()
@@ -0,0 +1,422 @@
+"""
+Cycle-time estimator - predicts how long a Meca wafer sequence will take.
+
+A compiled sequence is walked with the same motion model the simulator uses
+(distance, joint/cartesian speed and acceleration, blending), adding the
+configured delays and gripper moves. Per-wafer speed overrides from
+WaferConfigManager are applied to the labelled SetJointVel instructions.
+
+Predictions are calibrated per operation against recorded sequence timings:
+the motion part is scaled so that predicted time matches measured time, while
+delays are taken as exact.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from core.exceptions import ValidationError
+from drivers.meca_simulator import GRIPPER_MOVE_TIME, blend_overlap, pose_motion_time
+from .confirmed_actions import GRIPPER_COMMANDS
+from .meca_sequence_compiler import CompiledSequence, SUPPORTED_OPERATIONS
+
+if TYPE_CHECKING:
+    from .meca_service import MecaService
+
+
+MOVE_COMMANDS = ("MovePose", "MoveLin")
+SPEED_LABELS = ("wafer_speed", "empty_speed", "align_speed", "entry_speed", "speed")
+OVERRIDE_KEYS = SPEED_LABELS + ("acceleration",)
+
+# Calibration keeps the most recent samples per operation and bounds the scale
+# so a single bad recording cannot make predictions absurd
+CALIBRATION_WINDOW = 50
+MIN_MOTION_SCALE = 0.25
+MAX_MOTION_SCALE = 4.0
+
+# Robot defaults for parameters the sequences never set
+DEFAULT_CART_LIN_VEL = 150.0
+DEFAULT_CART_ACC = 50.0
+
+
+@dataclass
+class MoveEstimate:
+    """Predicted timing of one move instruction"""
+    index: int
+    wafer_index: Optional[int]
+    command_type: str
+    label: str
+    start: float
+    end: float
+    duration: float
+    joint_vel: float
+    blending: float
+    blend_saved: float = 0.0
+    blend_potential: float = 0.0  # extra overlap if this move were blended at 100%
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "wafer_num": self.wafer_index + 1 if self.wafer_index is not None else None,
+            "command_type": self.command_type,
+            "label": self.label,
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "duration": round(self.duration, 3),
+            "joint_vel": self.joint_vel,
+            "blending": self.blending,
+            "blend_saved": round(self.blend_saved, 3),
+            "blend_potential": round(self.blend_potential, 3)
+        }
+
+
+@dataclass
+class WaferEstimate:
+    """Predicted time attributed to one wafer (or the program preamble)"""
+    wafer_index: Optional[int]
+    motion_time: float = 0.0
+    delay_time: float = 0.0
+    gripper_time: float = 0.0
+    moves: int = 0
+
+    @property
+    def predicted(self) -> float:
+        return self.motion_time + self.delay_time + self.gripper_time
+
+    def calibrated(self, motion_scale: float) -> float:
+        return self.motion_time * motion_scale + self.delay_time + self.gripper_time
+
+    def to_dict(self, motion_scale: float = 1.0) -> Dict[str, Any]:
+        return {
+            "wafer_num": self.wafer_index + 1 if self.wafer_index is not None else None,
+            "moves": self.moves,
+            "motion_time": round(self.motion_time, 3),
+            "delay_time": round(self.delay_time, 3),
+            "gripper_time": round(self.gripper_time, 3),
+            "predicted": round(self.predicted, 3),
+            "calibrated": round(self.calibrated(motion_scale), 3)
+        }
+
+
+@dataclass
+class ProgramEstimate:
+    """Predicted timing of a whole compiled sequence"""
+    operation: str
+    start: int
+    count: int
+    preamble: WaferEstimate
+    wafers: List[WaferEstimate]
+    moves: List[MoveEstimate] = field(default_factory=list)
+    motion_scale: float = 1.0
+
+    def _parts(self) -> List[WaferEstimate]:
+        return [self.preamble] + self.wafers
+
+    @property
+    def motion_time(self) -> float:
+        return sum(part.motion_time for part in self._parts())
+
+    @property
+    def fixed_time(self) -> float:
+        """Delay and gripper time, which calibration does not scale"""
+        return sum(part.delay_time + part.gripper_time for part in self._parts())
+
+    @property
+    def predicted(self) -> float:
+        return self.motion_time + self.fixed_time
+
+    @property
+    def calibrated(self) -> float:
+        return self.motion_time * self.motion_scale + self.fixed_time
+
+    def hints(self, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Moves (grouped by label) that dominate time or leave blending savings unused"""
+        by_label: Dict[str, Dict[str, Any]] = {}
+        for move in self.moves:
+            entry = by_label.setdefault(move.label or move.command_type, {
+                "label": move.label or move.command_type,
+                "moves": 0,
+                "total_time": 0.0,
+                "blend_potential": 0.0,
+                "joint_vel": set()
+            })
+            entry["moves"] += 1
+            entry["total_time"] += move.duration
+            entry["blend_potential"] += move.blend_potential
+            entry["joint_vel"].add(move.joint_vel)
+
+        entries = []
+        for entry in by_label.values():
+            entries.append({
+                **entry,
+                "total_time": round(entry["total_time"] * self.motion_scale, 3),
+                "mean_time": round(entry["total_time"] * self.motion_scale / entry["moves"], 3),
+                "blend_potential": round(entry["blend_potential"] * self.motion_scale, 3),
+                "joint_vel": sorted(entry["joint_vel"])
+            })
+
+        slowest = sorted(entries, key=lambda e: e["total_time"], reverse=True)[:limit]
+        unblended = sorted(
+            (e for e in entries if e["blend_potential"] > 0),
+            key=lambda e: e["blend_potential"],
+            reverse=True
+        )[:limit]
+        return {"slowest_moves": slowest, "unblended_moves": unblended}
+
+    def to_dict(self, include_moves: bool = False) -> Dict[str, Any]:
+        result = {
+            "operation": self.operation,
+            "start_wafer": self.start + 1,
+            "end_wafer": self.start + self.count,
+            "motion_scale": round(self.motion_scale, 4),
+            "predicted_seconds": round(self.predicted, 3),
+            "calibrated_seconds": round(self.calibrated, 3),
+            "motion_time": round(self.motion_time, 3),
+            "fixed_time": round(self.fixed_time, 3),
+            "preamble": self.preamble.to_dict(self.motion_scale),
+            "wafers": [wafer.to_dict(self.motion_scale) for wafer in self.wafers],
+            "hints": self.hints()
+        }
+        if include_moves:
+            result["moves"] = [move.to_dict() for move in self.moves]
+        return result
+
+
+def estimate_program(
+    program: CompiledSequence,
+    initial_pose: List[float],
+    initial_params: Dict[str, float],
+    wafer_speeds: Optional[Callable[[int], Dict[str, float]]] = None,
+    overrides: Optional[Dict[str, float]] = None,
+    motion_scale: float = 1.0
+) -> ProgramEstimate:
+    """
+    Predict the robot-side duration of every instruction in a compiled program.
+
+    The robot queue is modelled the way the simulator runs it: each queued
+    move, gripper action or Delay starts when the previous one ends (earlier
+    for a blended move following another move), and WaitIdle drains the
+    queue. Time is attributed to the wafer whose instruction advanced it.
+
+    Args:
+        program: Compiled sequence to estimate
+        initial_pose: Pose the robot is at when the program starts
+        initial_params: joint_vel, joint_acc, cart_lin_vel, cart_acc, blending
+        wafer_speeds: Per-wafer speeds by label (e.g. WaferConfigManager overrides)
+        overrides: What-if speeds by label, plus 'acceleration'; these win over
+            both the program and the per-wafer values
+        motion_scale: Calibration factor applied to motion time in reports
+    """
+    overrides = overrides or {}
+    params = dict(initial_params)
+    if "acceleration" in overrides:
+        params["joint_acc"] = overrides["acceleration"]
+
+    pose = tuple(float(v) for v in initial_pose)
+    now = 0.0           # time of the last queue drain
+    tail = 0.0          # end time of the last queued segment
+    tail_is_move = False
+
+    preamble = WaferEstimate(wafer_index=None)
+    wafers: Dict[int, WaferEstimate] = {}
+    moves: List[MoveEstimate] = []
+
+    for instruction in program.instructions:
+        command = instruction.command_type
+        if instruction.wafer_index is None:
+            part = preamble
+        else:
+            part = wafers.setdefault(instruction.wafer_index, WaferEstimate(wafer_index=instruction.wafer_index))
+
+        if command == "SetJointVel":
+            value = instruction.parameters[0]
+            label = instruction.label
+            if label in overrides:
+                value = overrides[label]
+            elif wafer_speeds is not None and instruction.wafer_index is not None:
+                value = wafer_speeds(instruction.wafer_index).get(label, value)
+            params["joint_vel"] = float(value)
+        elif command == "SetJointAcc":
+            params["joint_acc"] = float(overrides.get("acceleration", instruction.parameters[0]))
+        elif command == "SetCartLinVel":
+            params["cart_lin_vel"] = float(instruction.parameters[0])
+        elif command == "SetCartAcc":
+            params["cart_acc"] = float(instruction.parameters[0])
+        elif command == "SetBlending":
+            params["blending"] = float(instruction.parameters[0])
+        elif command == "WaitIdle":
+            now = tail
+            tail_is_move = False
+        elif command in MOVE_COMMANDS:
+            target = tuple(float(v) for v in instruction.parameters)
+            duration, ramp = pose_motion_time(
+                pose, target, command == "MoveLin",
+                params["joint_vel"], params["joint_acc"], params["cart_lin_vel"], params["cart_acc"]
+            )
+            overlap = blend_overlap(params["blending"], duration, ramp) if tail_is_move else 0.0
+            potential = blend_overlap(100.0, duration, ramp) - overlap if tail_is_move else 0.0
+            start = max(now, tail - overlap)
+            end = start + duration
+            part.motion_time += max(0.0, end - tail)
+            part.moves += 1
+            moves.append(MoveEstimate(
+                index=instruction.index,
+                wafer_index=instruction.wafer_index,
+                command_type=command,
+                label=instruction.label,
+                start=start,
+                end=end,
+                duration=duration,
+                joint_vel=params["joint_vel"],
+                blending=params["blending"],
+                blend_saved=max(0.0, tail - start),
+                blend_potential=max(0.0, min(potential, start - now))
+            ))
+            tail = max(tail, end)
+            tail_is_move = True
+            pose = target
+        elif command in GRIPPER_COMMANDS or command == "Delay":
+            duration = GRIPPER_MOVE_TIME if command in GRIPPER_COMMANDS else float(instruction.parameters[0])
+            start = max(now, tail)
+            tail = start + duration
+            tail_is_move = False
+            if command == "Delay":
+                part.delay_time += duration
+            else:
+                part.gripper_time += duration
+
+    return ProgramEstimate(
+        operation=program.operation,
+        start=program.start,
+        count=program.count,
+        preamble=preamble,
+        wafers=[wafers[index] for index in sorted(wafers)],
+        moves=moves,
+        motion_scale=motion_scale
+    )
+
+
+class CycleTimeEstimator:
+    """
+    Cycle-time predictor for MecaService sequences.
+
+    Calibration samples are (predicted motion time, fixed time, measured time)
+    per operation; the motion scale is the ratio of measured-minus-fixed time
+    to predicted motion time over the recent window.
+    """
+
+    def __init__(self, service: "MecaService"):
+        self.service = service
+        self._samples: Dict[str, Deque[Tuple[float, float, float]]] = {
+            operation: deque(maxlen=CALIBRATION_WINDOW) for operation in SUPPORTED_OPERATIONS
+        }
+        self._last_span_id = 0
+
+    def _initial_params(self, overrides: Dict[str, float]) -> Dict[str, float]:
+        s = self.service
+        return {
+            "joint_vel": float(s.SPEED),
+            "joint_acc": float(overrides.get("acceleration", s.ACC)),
+            "cart_lin_vel": float(s.movement_params.get("cart_lin_vel", DEFAULT_CART_LIN_VEL)),
+            "cart_acc": float(s.movement_params.get("cart_acc", DEFAULT_CART_ACC)),
+            "blending": 0.0
+        }
+
+    def _wafer_speeds(self, wafer_index: int) -> Dict[str, float]:
+        return self.service.wafer_config_manager.get_wafer_config(wafer_index).movement_speeds
+
+    def _validate_overrides(self, overrides: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        overrides = dict(overrides or {})
+        unknown = sorted(set(overrides) - set(OVERRIDE_KEYS))
+        if unknown:
+            raise ValidationError(
+                f"Unknown cycle-time overrides {unknown} (expected any of {list(OVERRIDE_KEYS)})",
+                field="overrides"
+            )
+        try:
+            overrides = {key: float(value) for key, value in overrides.items()}
+        except (TypeError, ValueError):
+            raise ValidationError("Cycle-time overrides must be numbers", field="overrides")
+        bad = [key for key, value in overrides.items() if not 0 < value <= 100]
+        if bad:
+            raise ValidationError(f"Overrides {bad} must be within (0, 100] percent", field="overrides")
+        return overrides
+
+    def estimate_program(
+        self,
+        program: CompiledSequence,
+        overrides: Optional[Dict[str, Any]] = None,
+        calibrated: bool = True
+    ) -> ProgramEstimate:
+        overrides = self._validate_overrides(overrides)
+        return estimate_program(
+            program,
+            initial_pose=self.service.SAFE_POINT,
+            initial_params=self._initial_params(overrides),
+            wafer_speeds=self._wafer_speeds,
+            overrides=overrides,
+            motion_scale=self.motion_scale(program.operation) if calibrated else 1.0
+        )
+
+    def estimate(
+        self,
+        operation: str,
+        start: int,
+        count: int,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> ProgramEstimate:
+        """Compile (operation, start, count) and predict its duration"""
+        program = self.service.sequence_compiler.compile(operation, start, count)
+        return self.estimate_program(program, overrides)
+
+    def motion_scale(self, operation: str) -> float:
+        samples = self._samples.get(operation)
+        if not samples:
+            return 1.0
+        motion = sum(sample[0] for sample in samples)
+        if motion <= 0:
+            return 1.0
+        scale = sum(measured - fixed for _, fixed, measured in samples) / motion
+        return min(MAX_MOTION_SCALE, max(MIN_MOTION_SCALE, scale))
+
+    def calibrate(self, operation: str, start: int, count: int, measured_seconds: float) -> Dict[str, Any]:
+        """Record one measured run of (operation, start, count)"""
+        if measured_seconds <= 0:
+            raise ValidationError("Measured time must be positive", field="measured_seconds")
+        estimate = self.estimate(operation, start, count)
+        self._samples[operation].append((estimate.motion_time, estimate.fixed_time, float(measured_seconds)))
+        return self.get_calibration()[operation]
+
+    def calibrate_from_tracer(self) -> int:
+        """Add every finished, successful sequence span not yet used; returns samples added"""
+        added = 0
+        for span in self.service.sequence_tracer.spans(kind="sequence"):
+            if span.span_id <= self._last_span_id:
+                continue
+            self._last_span_id = span.span_id
+            if not span.success or span.operation not in self._samples:
+                continue
+            start, count = span.metadata.get("start"), span.metadata.get("count")
+            if start is None or not count or span.duration <= 0:
+                continue
+            try:
+                self.calibrate(span.operation, start, count, span.duration)
+                added += 1
+            except ValidationError:
+                continue
+        return added
+
+    def get_calibration(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            operation: {
+                "samples": len(samples),
+                "motion_scale": round(self.motion_scale(operation), 4),
+                "last_measured": samples[-1][2] if samples else None,
+                "last_predicted": round(samples[-1][0] + samples[-1][1], 3) if samples else None
+            }
+            for operation, samples in self._samples.items()
+        }
+
+    def reset_calibration(self):
+        for samples in self._samples.values():
+            samples.clear()
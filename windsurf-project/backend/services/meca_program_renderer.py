@@ -0,0 +1,143 @@
+"""
+Meca program renderer - Turns compiled sequences into robot-side programs.
+
+The robot can store a program and run it from its own controller, the way the
+legacy "Fill+Empty Carousel" text programs were run. Rendering a compiled
+sequence into that format lets the whole program execute without per-command
+host round trips; a SetCheckpoint after every motion-queue instruction reports
+progress back through the status stream so the checkpoint journal and resume
+keep working at instruction granularity.
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from core.async_robot_wrapper import MAX_CHECKPOINT_ID, MOTION_QUEUE_COMMANDS
+from core.exceptions import ValidationError
+from .meca_sequence_compiler import CompiledSequence, SequenceInstruction
+
+
+# Section comments, matching the legacy program files
+SECTION_TITLES = {
+    "pickup": "Pick Wafer {n} from Inert Tray to Spreader",
+    "drop": "Drop Wafer {n} from Spreader to Baking Tray",
+    "carousel": "Pick Wafer {n} from Baking Tray to Carousel",
+    "empty_carousel": "Return Wafer {n} from Carousel to Baking Tray",
+}
+
+# Host-side barriers; a stored program already runs its motion queue in order
+HOST_ONLY_COMMANDS = frozenset({"WaitIdle"})
+
+
+@dataclass(frozen=True)
+class RenderedProgram:
+    """A compiled sequence rendered as a robot-side text program"""
+    number: int
+    name: str
+    lines: Tuple[str, ...]
+    checkpoints: Tuple[Tuple[int, int], ...]  # (checkpoint id, confirmed instruction index)
+    start_index: int
+    total_instructions: int
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+    @property
+    def commands(self) -> List[str]:
+        """Program lines as sent to the robot, without comments or blank lines"""
+        commands = []
+        for line in self.lines:
+            command = line.split("//", 1)[0].strip()
+            if command:
+                commands.append(command)
+        return commands
+
+    def summary(self) -> dict:
+        return {
+            "number": self.number,
+            "name": self.name,
+            "lines": len(self.lines),
+            "commands": len(self.commands),
+            "checkpoints": len(self.checkpoints),
+            "start_index": self.start_index,
+            "total_instructions": self.total_instructions
+        }
+
+
+def format_number(value: Any) -> str:
+    """Format a parameter the way the legacy programs do (no trailing zeros)"""
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    text = ("%.4f" % float(value)).rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def format_instruction(instruction: SequenceInstruction) -> str:
+    line = f"{instruction.command_type}({','.join(format_number(p) for p in instruction.parameters)})"
+    return f"{line} //{instruction.label}" if instruction.label else line
+
+
+def render_program(program: CompiledSequence, start_instruction: int = 0, program_number: int = 1) -> RenderedProgram:
+    """
+    Render a compiled sequence as a robot-side program.
+
+    Args:
+        program: Compiled sequence to render
+        start_instruction: First instruction to include (for resume); the motion
+            parameters set by skipped instructions are restored first
+        program_number: Offline program slot the program is meant for
+
+    Raises:
+        ValidationError: If the start index is out of range or the program needs
+            more checkpoints than the robot accepts
+    """
+    if not 0 <= start_instruction <= len(program):
+        raise ValidationError(
+            f"Program start index {start_instruction} out of range (0-{len(program)})",
+            field="start_instruction"
+        )
+
+    name = f"{program.operation} wafers {program.start + 1}-{program.start + program.count}"
+    lines = [f"//{name} ({program.config_version})"]
+    checkpoints: List[Tuple[int, int]] = []
+
+    if start_instruction > 0:
+        lines.append(f"//Resume at instruction {start_instruction}:")
+        lines.extend(format_instruction(i) for i in program.settings_before(start_instruction))
+
+    title = SECTION_TITLES.get(program.operation, "Wafer {n}")
+    current_wafer: Optional[int] = None
+    if start_instruction == 0:
+        lines.append("//Initial Statements:")
+
+    for instruction in program.instructions[start_instruction:]:
+        if instruction.wafer_index is not None and instruction.wafer_index != current_wafer:
+            current_wafer = instruction.wafer_index
+            lines.append("")
+            lines.append(f"//{title.format(n=current_wafer + 1)}")
+
+        if instruction.command_type in HOST_ONLY_COMMANDS:
+            continue
+
+        lines.append(format_instruction(instruction))
+        if instruction.command_type in MOTION_QUEUE_COMMANDS:
+            checkpoint_id = len(checkpoints) + 1
+            if checkpoint_id > MAX_CHECKPOINT_ID:
+                raise ValidationError(
+                    f"Program needs more than {MAX_CHECKPOINT_ID} checkpoints - upload fewer wafers at a time",
+                    field="count"
+                )
+            checkpoints.append((checkpoint_id, instruction.index + 1))
+            lines.append(f"SetCheckpoint({checkpoint_id})")
+
+    return RenderedProgram(
+        number=program_number,
+        name=name,
+        lines=tuple(lines),
+        checkpoints=tuple(checkpoints),
+        start_index=start_instruction,
+        total_instructions=len(program)
+    )
@@ -0,0 +1,496 @@
+"""
+Meca sequence compiler - Turns wafer sequences into pre-validated motion programs.
+
+A compiled sequence is an immutable list of robot instructions built up front
+for an (operation, start, count) request. Every instruction is validated once at
+compile time so the whole program can be streamed to the robot's motion queue in
+a single executor hop, and progress can be checkpointed by instruction index.
+"""
+
+import copy
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from core.async_robot_wrapper import IDEMPOTENT_CONFIG_COMMANDS
+from core.exceptions import ValidationError
+
+if TYPE_CHECKING:
+    from .meca_service import MecaService
+
+
+SUPPORTED_OPERATIONS = ("pickup", "drop", "carousel", "empty_carousel")
+PROFILE_MOVE_COMMANDS = ("MovePose", "MoveLin")
+
+
+@dataclass(frozen=True)
+class SequenceInstruction:
+    """A single robot instruction inside a compiled sequence"""
+    index: int
+    command_type: str
+    parameters: Tuple[Any, ...] = ()
+    wafer_index: Optional[int] = None
+    label: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "command_type": self.command_type,
+            "parameters": list(self.parameters),
+            "wafer_index": self.wafer_index,
+            "label": self.label
+        }
+
+
+@dataclass(frozen=True)
+class CompiledSequence:
+    """Immutable, pre-validated motion program for one wafer sequence request"""
+    operation: str
+    start: int
+    count: int
+    config_version: str
+    instructions: Tuple[SequenceInstruction, ...]
+    wafer_offsets: Tuple[Tuple[int, int], ...] = ()  # (wafer_index, first instruction index)
+    compiled_at: float = field(default_factory=time.time)
+    eliminated_config: int = 0  # redundant config instructions removed by the peephole pass
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+    def first_instruction_for_wafer(self, wafer_index: int) -> int:
+        """Return the index of the first instruction belonging to a wafer"""
+        for index, offset in self.wafer_offsets:
+            if index == wafer_index:
+                return offset
+        raise ValidationError(
+            f"Wafer {wafer_index + 1} is not part of this {self.operation} program",
+            field="wafer_index"
+        )
+
+    def wafer_at(self, instruction_index: int) -> Optional[int]:
+        """Return the wafer index an instruction belongs to (None for preamble)"""
+        if 0 <= instruction_index < len(self.instructions):
+            return self.instructions[instruction_index].wafer_index
+        return None
+
+    def settings_before(self, instruction_index: int) -> List[SequenceInstruction]:
+        """
+        Last instruction for each motion parameter set before instruction_index.
+
+        Redundant settings are removed program-wide, so a run resumed mid-program
+        re-sends these first to put the robot in the state the program expects.
+        """
+        latest: Dict[str, SequenceInstruction] = {}
+        for instruction in self.instructions[:instruction_index]:
+            if instruction.command_type in IDEMPOTENT_CONFIG_COMMANDS:
+                latest[instruction.command_type] = instruction
+        return sorted(latest.values(), key=lambda instruction: instruction.index)
+
+    def command_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for instruction in self.instructions:
+            counts[instruction.command_type] = counts.get(instruction.command_type, 0) + 1
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "operation": self.operation,
+            "start_wafer": self.start + 1,
+            "end_wafer": self.start + self.count,
+            "config_version": self.config_version,
+            "total_instructions": len(self.instructions),
+            "command_counts": self.command_counts(),
+            "wafer_offsets": {index + 1: offset for index, offset in self.wafer_offsets},
+            "eliminated_config": self.eliminated_config,
+            "compiled_at": self.compiled_at
+        }
+
+
+class _ProgramBuilder:
+    """Accumulates instructions while a sequence is being compiled"""
+
+    def __init__(self):
+        self.instructions: List[SequenceInstruction] = []
+        self.wafer_offsets: List[Tuple[int, int]] = []
+        self.wafer_index: Optional[int] = None
+
+    def begin_wafer(self, wafer_index: int):
+        self.wafer_index = wafer_index
+        self.wafer_offsets.append((wafer_index, len(self.instructions)))
+
+    def emit(self, command_type: str, parameters: Optional[List[Any]] = None, label: str = ""):
+        self.instructions.append(SequenceInstruction(
+            index=len(self.instructions),
+            command_type=command_type,
+            parameters=tuple(parameters or ()),
+            wafer_index=self.wafer_index,
+            label=label
+        ))
+
+
+def apply_motion_profile(program: CompiledSequence, profile: Dict[str, Any]) -> CompiledSequence:
+    """
+    Re-time a compiled program with a motion profile.
+
+    profile["moves"] maps a move label to the joint velocity and/or blending it
+    must run with. Inside wafer blocks the hand-written SetJointVel/SetBlending
+    instructions are replaced by the minimal set needed so every move runs with
+    its profile value, or with the value it had before for moves (and fields)
+    the profile does not mention. Preamble instructions are kept as they are.
+    A setting the program never sets before a move is left as the robot has it.
+    """
+    moves = profile.get("moves", {})
+    fields = {"SetJointVel": "joint_vel", "SetBlending": "blending"}
+    base: Dict[str, Tuple[Any, str]] = {setting: (None, "") for setting in fields}
+    sent: Dict[str, Any] = {setting: None for setting in fields}
+    builder = _ProgramBuilder()
+
+    for instruction in program.instructions:
+        command = instruction.command_type
+        if instruction.wafer_index is not None and instruction.wafer_index != builder.wafer_index:
+            builder.begin_wafer(instruction.wafer_index)
+
+        if command in fields:
+            base[command] = (instruction.parameters[0], instruction.label)
+            if instruction.wafer_index is None:
+                sent[command] = instruction.parameters[0]
+                builder.emit(command, list(instruction.parameters), instruction.label)
+            continue
+
+        if command in PROFILE_MOVE_COMMANDS and instruction.wafer_index is not None:
+            wanted = moves.get(instruction.label, {})
+            for setting, key in fields.items():
+                value, label = (wanted[key], "motion_profile") if key in wanted else base[setting]
+                if value is not None and value != sent[setting]:
+                    builder.emit(setting, [value], label)
+                    sent[setting] = value
+
+        builder.emit(command, list(instruction.parameters), instruction.label)
+
+    # Leave the robot with the settings the original program ended with
+    for setting in fields:
+        value, label = base[setting]
+        if value is not None and value != sent[setting]:
+            builder.emit(setting, [value], label)
+
+    return CompiledSequence(
+        operation=program.operation,
+        start=program.start,
+        count=program.count,
+        config_version=program.config_version,
+        instructions=tuple(builder.instructions),
+        wafer_offsets=tuple(builder.wafer_offsets),
+        compiled_at=program.compiled_at,
+        eliminated_config=program.eliminated_config
+    )
+
+
+def eliminate_redundant_config(program: CompiledSequence) -> CompiledSequence:
+    """
+    Peephole pass removing configuration instructions that cannot change anything:
+    a setting re-sent with the value already active, and a setting overwritten
+    before any motion, gripper, delay or wait instruction has used it.
+    """
+    instructions = program.instructions
+
+    # Dead stores: a write followed by another write of the same setting with
+    # nothing but other settings in between
+    dead = set()
+    pending: Dict[str, int] = {}
+    for instruction in instructions:
+        if instruction.command_type in IDEMPOTENT_CONFIG_COMMANDS:
+            if instruction.command_type in pending:
+                dead.add(pending[instruction.command_type])
+            pending[instruction.command_type] = instruction.index
+        else:
+            pending.clear()
+
+    builder = _ProgramBuilder()
+    active: Dict[str, Tuple[Any, ...]] = {}
+    eliminated = 0
+    for instruction in instructions:
+        if instruction.wafer_index is not None and instruction.wafer_index != builder.wafer_index:
+            builder.begin_wafer(instruction.wafer_index)
+        if instruction.command_type in IDEMPOTENT_CONFIG_COMMANDS:
+            if instruction.index in dead or active.get(instruction.command_type) == instruction.parameters:
+                eliminated += 1
+                continue
+            active[instruction.command_type] = instruction.parameters
+        builder.emit(instruction.command_type, list(instruction.parameters), instruction.label)
+
+    return CompiledSequence(
+        operation=program.operation,
+        start=program.start,
+        count=program.count,
+        config_version=program.config_version,
+        instructions=tuple(builder.instructions),
+        wafer_offsets=tuple(builder.wafer_offsets),
+        compiled_at=program.compiled_at,
+        eliminated_config=program.eliminated_config + eliminated
+    )
+
+
+class MecaSequenceCompiler:
+    """
+    Compiles Meca wafer sequences into immutable instruction lists.
+
+    The emitted command streams mirror execute_pickup_sequence, execute_drop_sequence,
+    execute_carousel_sequence and execute_empty_carousel_sequence step for step.
+    """
+
+    def __init__(self, service: "MecaService"):
+        self.service = service
+
+    def compile(self, operation: str, start: int, count: int) -> CompiledSequence:
+        """
+        Compile a wafer sequence into a validated motion program.
+
+        Args:
+            operation: One of 'pickup', 'drop', 'carousel', 'empty_carousel'
+            start: Starting wafer index (0-based)
+            count: Number of wafers to process
+
+        Raises:
+            ValidationError: If the request or any instruction is invalid
+        """
+        if operation not in SUPPORTED_OPERATIONS:
+            raise ValidationError(
+                f"Unknown sequence operation: {operation} (expected one of {list(SUPPORTED_OPERATIONS)})",
+                field="operation"
+            )
+        if start < 0 or count <= 0 or start + count > 55:
+            raise ValidationError(
+                f"Invalid wafer range start={start} count={count} (must be within wafers 1-55)",
+                field="wafer_range"
+            )
+
+        builder = _ProgramBuilder()
+        getattr(self, f"_compile_{operation}")(builder, start, count)
+        program = CompiledSequence(
+            operation=operation,
+            start=start,
+            count=count,
+            config_version=self.service.wafer_config_manager.config_version,
+            instructions=tuple(builder.instructions),
+            wafer_offsets=tuple(builder.wafer_offsets)
+        )
+
+        profile = self.service.wafer_config_manager.get_motion_profile(operation)
+        if profile:
+            program = apply_motion_profile(program, profile)
+        program = eliminate_redundant_config(program)
+
+        for instruction in program.instructions:
+            try:
+                self.service._validate_robot_parameters(instruction.command_type, list(instruction.parameters))
+            except ValidationError as e:
+                raise ValidationError(
+                    f"Instruction {instruction.index} ({instruction.label or instruction.command_type}) "
+                    f"failed validation: {e}",
+                    field="instruction"
+                )
+
+        return program
+
+    def _compile_pickup(self, b: _ProgramBuilder, start: int, count: int):
+        """Inert tray to spreader - mirrors execute_pickup_sequence"""
+        s = self.service
+
+        if start == 0:
+            b.emit("SetGripperForce", [s.FORCE])
+            b.emit("SetJointAcc", [s.ACC])
+            b.emit("SetTorqueLimits", [40, 40, 40, 40, 40, 40])
+            b.emit("SetTorqueLimitsCfg", [2, 1])
+            b.emit("SetBlending", [0])
+
+        b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+        b.emit("SetConf", [1, 1, 1])
+        b.emit("GripperOpen", [])
+        b.emit("Delay", [1])
+
+        for i in range(start, start + count):
+            b.begin_wafer(i)
+            positions = s.calculate_intermediate_positions(i, "pickup")
+            pickup_position = s.calculate_wafer_position(i, "inert")
+
+            b.emit("MovePose", positions["pickup_high"], "pickup_high")
+            b.emit("MovePose", pickup_position, "pickup")
+            b.emit("Delay", [1])
+            b.emit("GripperClose", [], "grip_wafer")
+            b.emit("Delay", [1])
+            b.emit("SetJointVel", [s.WAFER_SPEED], "wafer_speed")
+            b.emit("MovePose", positions["intermediate_1"], "intermediate_1")
+            b.emit("SetBlending", [100])
+            b.emit("MovePose", positions["intermediate_2"], "intermediate_2")
+            b.emit("MoveLin", positions["intermediate_3"], "intermediate_3")
+            b.emit("SetBlending", [0])
+            b.emit("MovePose", s.SAFE_POINT, "safe_point")
+            b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+            b.emit("MovePose", positions["above_spreader"], "above_spreader")
+            b.emit("MovePose", positions["spreader"], "spreader")
+            b.emit("Delay", [1])
+            b.emit("GripperOpen", [], "release_wafer")
+            b.emit("Delay", [1])
+            b.emit("MovePose", positions["above_spreader_exit"], "above_spreader_exit")
+            b.emit("SetJointVel", [s.EMPTY_SPEED], "empty_speed")
+            b.emit("MovePose", s.SAFE_POINT, "safe_point")
+            # Drain the motion queue at the end of every wafer (60s, as in the live sequence)
+            b.emit("WaitIdle", [60.0], "wafer_complete")
+
+            if (4 - (i % 5)) == 0:
+                b.emit("Delay", [s.SPREAD_WAIT], "spread_wait")
+
+    def _compile_drop(self, b: _ProgramBuilder, start: int, count: int):
+        """Spreader to baking tray - mirrors execute_drop_sequence"""
+        s = self.service
+
+        for i in range(start, start + count):
+            b.begin_wafer(i)
+            positions = s.calculate_intermediate_positions(i, "drop")
+
+            b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+            b.emit("MovePose", positions["above_spreader"], "above_spreader")
+            b.emit("Delay", [1])
+            b.emit("MovePose", positions["spreader"], "spreader")
+            b.emit("Delay", [1])
+            b.emit("GripperClose", [], "grip_wafer")
+            b.emit("Delay", [1])
+            b.emit("MovePose", positions["above_spreader_pickup"], "above_spreader_pickup")
+            b.emit("SetJointVel", [s.SPEED], "speed")
+            b.emit("MovePose", s.SAFE_POINT, "safe_point")
+            b.emit("MovePose", positions["baking_align1"], "baking_align1")
+            b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+            b.emit("SetBlending", [100])
+            b.emit("MovePose", positions["baking_align2"], "baking_align2")
+            b.emit("MovePose", positions["baking_align3"], "baking_align3")
+            b.emit("MovePose", positions["baking_align4"], "baking_align4")
+            b.emit("Delay", [1])
+            b.emit("GripperOpen", [], "release_wafer")
+            b.emit("Delay", [0.5])
+            b.emit("MovePose", positions["baking_up"], "baking_up")
+            b.emit("SetJointVel", [s.SPEED], "speed")
+            b.emit("SetBlending", [0])
+            b.emit("MovePose", s.SAFE_POINT, "safe_point")
+
+    def _compile_carousel(self, b: _ProgramBuilder, start: int, count: int):
+        """Baking tray to carousel - mirrors execute_carousel_sequence"""
+        s = self.service
+
+        if start == 0:
+            b.emit("SetConf", [1, 1, -1])
+            b.emit("Delay", [3])
+
+        for i in range(start, start + count):
+            b.begin_wafer(i)
+            wafer_num = i + 1
+            positions = s.calculate_intermediate_positions(i, "carousel")
+            baking_position = s.calculate_wafer_position(i, "baking")
+
+            if wafer_num % 11 == 1:
+                b.emit("Delay", [5], "carousel_batch_wait")
+
+            b.emit("GripperOpen", [])
+            b.emit("Delay", [1])
+            b.emit("SetJointVel", [s.SPEED], "speed")
+            b.emit("MovePose", positions["above_baking"], "above_baking")
+            b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+            b.emit("SetBlending", [0])
+            b.emit("MovePose", baking_position, "baking")
+            b.emit("Delay", [0.5])
+            b.emit("GripperClose", [], "grip_wafer")
+            b.emit("Delay", [0.5])
+            b.emit("SetBlending", [100])
+            b.emit("MovePose", positions["move1"], "move1")
+            b.emit("SetJointVel", [s.SPEED], "speed")
+            b.emit("MovePose", positions["move2"], "move2")
+            b.emit("MovePose", positions["move3"], "move3")
+            b.emit("MovePose", positions["move4"], "move4")
+            b.emit("Delay", [0.5])
+            b.emit("SetBlending", [80])
+            b.emit("MovePose", s.T_PHOTOGATE, "t_photogate")
+            b.emit("MovePose", s.C_PHOTOGATE, "c_photogate")
+            b.emit("MovePose", positions["y_away1"], "y_away1")
+            b.emit("SetBlending", [0])
+            b.emit("Delay", [1])
+            b.emit("SetJointVel", [s.ENTRY_SPEED], "entry_speed")
+            b.emit("MovePose", positions["y_away2"], "y_away2")
+            b.emit("MovePose", positions["above_carousel1"], "above_carousel1")
+            b.emit("MovePose", positions["above_carousel2"], "above_carousel2")
+            b.emit("MovePose", positions["above_carousel3"], "above_carousel3")
+            b.emit("MovePose", s.CAROUSEL, "carousel")
+            b.emit("Delay", [0.5])
+            b.emit("MoveGripper", [2.9], "release_wafer")
+            b.emit("Delay", [0.5])
+            b.emit("SetJointVel", [s.EMPTY_SPEED], "empty_speed")
+            b.emit("MovePose", positions["above_carousel3"], "exit_above_carousel3")
+            b.emit("MovePose", positions["above_carousel2"], "exit_above_carousel2")
+            b.emit("MovePose", positions["above_carousel1"], "exit_above_carousel1")
+            b.emit("MovePose", positions["y_away2"], "exit_y_away2")
+            b.emit("MovePose", positions["y_away1"], "exit_y_away1")
+            b.emit("MovePose", s.CAROUSEL_SAFEPOINT, "carousel_safe")
+            b.emit("SetBlending", [100])
+
+    def _compile_empty_carousel(self, b: _ProgramBuilder, start: int, count: int):
+        """Carousel back to baking tray - mirrors execute_empty_carousel_sequence"""
+        s = self.service
+
+        def carousel_at(y: Optional[float] = None, z: Optional[float] = None) -> List[float]:
+            pose = copy.deepcopy(s.CAROUSEL)
+            if y is not None:
+                pose[1] = y
+            if z is not None:
+                pose[2] = z
+            return pose
+
+        for i in range(start, start + count):
+            b.begin_wafer(i)
+            wafer_num = i + 1
+            positions = s.calculate_intermediate_positions(i, "empty_carousel")
+
+            if wafer_num % 11 == 1:
+                b.emit("Delay", [7.5], "carousel_batch_wait")
+            else:
+                b.emit("Delay", [1])
+
+            b.emit("GripperOpen", [])
+            b.emit("Delay", [1])
+            b.emit("MovePose", positions["y_away1"], "y_away1")
+            b.emit("MovePose", positions["y_away2"], "y_away2")
+            b.emit("MovePose", positions["above_carousel"], "above_carousel")
+            b.emit("SetBlending", [0])
+            b.emit("SetJointVel", [s.ENTRY_SPEED], "entry_speed")
+            b.emit("MoveGripper", [3.7])
+            b.emit("Delay", [0.5])
+            b.emit("MovePose", carousel_at(z=109.9), "above_carousel5")
+            b.emit("MovePose", carousel_at(z=103.9), "above_carousel4")
+            b.emit("MovePose", s.CAROUSEL, "carousel")
+            b.emit("Delay", [0.5])
+            b.emit("GripperClose", [], "grip_wafer")
+            b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+            b.emit("Delay", [0.5])
+            b.emit("MovePose", carousel_at(z=103.9), "above_carousel4")
+            b.emit("MovePose", carousel_at(z=109.9), "above_carousel2")
+            b.emit("MovePose", carousel_at(z=115.9), "above_carousel1")
+            b.emit("MovePose", carousel_at(y=-245.95, z=115.9), "y_away1_rev")
+            b.emit("Delay", [0.5])
+            b.emit("SetBlending", [80])
+            b.emit("SetJointVel", [s.SPEED], "speed")
+            b.emit("MovePose", carousel_at(y=-216.95, z=120.0), "y_away2_rev")
+            b.emit("MovePose", s.C_PHOTOGATE, "c_photogate")
+            b.emit("MovePose", s.T_PHOTOGATE, "t_photogate")
+            b.emit("Delay", [0.5])
+            b.emit("MovePose", positions["move4_rev"], "move4_rev")
+            b.emit("SetJointVel", [s.ALIGN_SPEED], "align_speed")
+            b.emit("Delay", [0.5])
+            b.emit("SetBlending", [100])
+            b.emit("MovePose", positions["move3_rev"], "move3_rev")
+            b.emit("MovePose", positions["move2_rev"], "move2_rev")
+            b.emit("MovePose", positions["move1_rev"], "move1_rev")
+            b.emit("Delay", [1])
+            b.emit("GripperOpen", [], "release_wafer")
+            b.emit("Delay", [0.5])
+            b.emit("MovePose", positions["above_baking_rev"], "above_baking_rev")
+            b.emit("SetJointVel", [s.EMPTY_SPEED], "empty_speed")
+            b.emit("Delay", [0.2])
+            b.emit("SetBlending", [100])
+            b.emit("MovePose", s.CAROUSEL_SAFEPOINT, "carousel_safe")
@@ -7,7 +7,9 @@ import asyncio
 import copy
 import math
 import time
-from typing import Dict, Any, List, Optional, Tuple
+import uuid
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Awaitable, Callable
 from dataclasses import dataclass
 from enum import Enum
 
@@ -19,9 +21,26 @@ from core.settings import RoboticsSettings
 from core.exceptions import HardwareError, ValidationError, ResourceLockTimeout
 from .base import RobotService, ServiceResult, OperationContext
 from .wafer_config_manager import WaferConfigManager, ConfigurationError
+from .meca_sequence_compiler import MecaSequenceCompiler, CompiledSequence, SequenceInstruction
+from .position_table import PositionTable
+from .confirmed_actions import ConfirmedActionTracker
+from .sequence_trace import SequenceTracer, Span
+from .cycle_time_estimator import CycleTimeEstimator
+from .motion_profile_optimizer import MotionProfileOptimizer
+from .checkpoint_journal import CheckpointJournal, JournalRun, ReentryPlan, plan_reentry
+from .meca_program_renderer import RenderedProgram, render_program
 from utils.logger import get_logger
 
 
+# Host-side overhead budget per command on the batched fast path, in seconds
+# (from the _execute_movement_command call until the command is handed to the wrapper)
+COMMAND_OVERHEAD_BUDGET = 0.0005
+
+# How execute_compiled_sequence runs a program: streamed from the host, or
+# uploaded to the robot's offline program storage and run there
+COMPILED_EXECUTION_MODES = ("stream", "upload")
+
+
 class MecaOperationType(Enum):
     """Types of Mecademic operations"""
     PICKUP_WAFER = "pickup_wafer"
@@ -97,10 +116,48 @@ class MecaService(RobotService):
                 movement_params=self.movement_params
             )
             self.logger.info(f"WaferConfigManager initialized - version {self.wafer_config_manager.config_version}")
-        except ConfigurationError as e:
+        except (ConfigurationError, ValidationError) as e:
             self.logger.error(f"Failed to initialize WaferConfigManager: {e}")
             raise
 
+        # Compiles wafer sequences into pre-validated motion programs
+        self.sequence_compiler = MecaSequenceCompiler(self)
+        
+        # Opt-in: end gripper/settle delays on hardware confirmation instead of a fixed sleep
+        self.confirmed_actions = ConfirmedActionTracker(
+            enabled=bool(self.movement_params.get("confirmed_actions", False))
+        )
+        
+        # Sequence -> wafer -> step timing spans (bounded ring buffer)
+        self.sequence_tracer = SequenceTracer()
+        
+        # Predicts sequence duration; calibrated from recorded sequence spans
+        self.cycle_time_estimator = CycleTimeEstimator(self)
+        
+        # Offline speed/blending schedule optimizer (emits sequence_config motion profiles)
+        self.motion_profile_optimizer = MotionProfileOptimizer(self)
+        
+        # Durable per-instruction progress of compiled sequences (resume after restart)
+        self.checkpoint_journal = CheckpointJournal(
+            self.robot_config.get("checkpoint_journal") or "data/meca_checkpoints.jsonl"
+        )
+        
+        # Readiness token: driver connection generation a full readiness check last
+        # passed for. Valid until the status feed reports an error, deactivation or
+        # disconnect, or the driver connects again
+        self._readiness_token: Optional[int] = None
+        self._readiness_listening = False
+        self._readiness_stats = {"token_hits": 0, "full_checks": 0, "invalidations": 0, "last_full_check_time": 0.0}
+        
+        # Batched-mode state: commands validated once per sequence and their built commands
+        self._prevalidated: Optional[frozenset] = None
+        self._command_cache: Dict[tuple, MovementCommand] = {}
+        self._command_stats = {"fast_path": 0, "full_path": 0}
+        self._command_overhead: deque = deque(maxlen=2000)
+
+        # Per-wafer pose table, built lazily once per sequence config
+        self._position_table: Optional[PositionTable] = None
+
         # Position constants from settings (externalized from Meca_FullCode.py)
         positions = self.robot_config.get("positions", {})
         self.FIRST_WAFER = positions.get("first_wafer", [173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059])
@@ -176,11 +233,17 @@ class MecaService(RobotService):
                 driver = self.async_wrapper.robot_driver
                 robot_instance = driver.get_robot_instance() if hasattr(driver, 'get_robot_instance') else None
                 
-                if not robot_instance:
-                    # TCP is working but no robot instance - check if we should attempt reconnection
+                # The instance is kept across a network blip; the status feed tells us it dropped
+                feed = self.async_wrapper.status_feed
+                snapshot = feed.latest() if feed is not None and feed.running else None
+                connection_lost = robot_instance is not None and snapshot is not None and snapshot.timestamp > 0 and not snapshot.connected
+                
+                if not robot_instance or connection_lost:
+                    # TCP is working but no robot connection - check if we should attempt reconnection.
+                    # An open standby monitor socket means the robot is reachable: skip the backoff
                     current_time = time.time()
-                    if current_time >= self._next_reconnect_time:
-                        self.logger.info(f"TCP connection OK but no robot instance for {self.robot_id} - attempting reconnection (attempt {self._reconnect_attempt_count + 1})")
+                    if current_time >= self._next_reconnect_time or getattr(driver, 'standby_connected', False):
+                        self.logger.info(f"TCP connection OK but no robot connection for {self.robot_id} - attempting reconnection (attempt {self._reconnect_attempt_count + 1})")
                         reconnected = await self._attempt_robot_reconnection()
                         if reconnected:
                             self.logger.info(f"🎉 Successfully reconnected to robot {self.robot_id}")
@@ -211,7 +274,12 @@ class MecaService(RobotService):
                 connected = await driver.connect()
                 
                 if connected:
-                    self.logger.info(f"✅ Robot reconnection successful for {self.robot_id}")
+                    reconnect_stats = driver.get_reconnect_stats() if hasattr(driver, 'get_reconnect_stats') else {}
+                    time_to_ready = reconnect_stats.get("last_time_to_ready")
+                    self.logger.info(
+                        f"✅ Robot reconnection successful for {self.robot_id}"
+                        f"{f' - ready {time_to_ready:.2f}s after connection loss' if time_to_ready is not None else ''}"
+                    )
                     # Reset backoff state on successful connection
                     self._reset_reconnect_backoff()
                     
@@ -503,13 +571,14 @@ class MecaService(RobotService):
             )
             self.carousel_positions.append(position)
     
-    @circuit_breaker("meca_robot_ready", failure_threshold=4, recovery_timeout=20)
     async def ensure_robot_ready(self, allow_busy: bool = True) -> bool:
         """
         Override base method to add hardware state verification for Mecademic robot.
         
         Ensures both software state (IDLE/BUSY) and hardware state (activated/homed)
-        are ready before allowing operations to proceed.
+        are ready before allowing operations to proceed. Once a full hardware check
+        has passed, later calls only re-check the software state until the status
+        feed reports an error, deactivation or disconnect.
         
         Args:
             allow_busy: Whether to allow BUSY state (for operations already in progress)
@@ -521,19 +590,94 @@ class MecaService(RobotService):
             ValidationError: If robot is not in valid state
             HardwareError: If hardware activation/homing fails
         """
+        if self._readiness_token_valid():
+            await super().ensure_robot_ready(allow_busy)
+            self._readiness_stats["token_hits"] += 1
+            return True
+        return await self._verify_robot_ready(allow_busy)
+    
+    def _readiness_token_valid(self) -> bool:
+        """True if the last full readiness check still holds for the connected robot"""
+        token = self._readiness_token
+        if token is None:
+            return False
+        feed = self.async_wrapper.status_feed
+        if feed is None or not feed.running or self._connection_generation() != token:
+            # No live feed to invalidate it, or the driver has connected again since
+            self.invalidate_readiness("status feed unavailable or robot reconnected")
+            return False
+        snapshot = feed.latest()
+        if not (snapshot.connected and snapshot.activated and snapshot.homed) or snapshot.error or snapshot.paused:
+            self.invalidate_readiness("robot not ready in latest status")
+            return False
+        return True
+    
+    def _connection_generation(self) -> Optional[int]:
+        """Driver connection generation, or None while there is no connected robot instance"""
+        driver = getattr(self.async_wrapper, 'robot_driver', None)
+        if not hasattr(driver, 'get_robot_instance') or driver.get_robot_instance() is None:
+            return None
+        return getattr(driver, 'connection_generation', None)
+    
+    def _issue_readiness_token(self):
+        generation = self._connection_generation()
+        feed = self.async_wrapper.status_feed
+        if generation is None or feed is None:
+            return
+        if not self._readiness_listening:
+            feed.add_edge_listener(self._on_readiness_edge)
+            self._readiness_listening = True
+        self._readiness_token = generation
+    
+    def _on_readiness_edge(self, field_name: str, old: Any, new: Any, snapshot: Any):
+        if (field_name in ("connected", "activated", "homed") and not new) or (field_name in ("error", "paused") and new):
+            self.invalidate_readiness(f"{field_name} changed to {new}")
+    
+    def invalidate_readiness(self, reason: str = ""):
+        """Force the next ensure_robot_ready() to run the full hardware check"""
+        if self._readiness_token is None:
+            return
+        self._readiness_token = None
+        self._readiness_stats["invalidations"] += 1
+        self.logger.debug(f"Readiness token for {self.robot_id} invalidated: {reason}")
+    
+    def get_readiness_stats(self) -> Dict[str, Any]:
+        return {**self._readiness_stats, "token_valid": self._readiness_token is not None}
+    
+    @circuit_breaker("meca_robot_ready", failure_threshold=4, recovery_timeout=20)
+    async def _verify_robot_ready(self, allow_busy: bool = True) -> bool:
+        """Full software and hardware readiness check; issues the readiness token on success"""
+        # Another caller may have completed a full check while this one waited on the breaker
+        if self._readiness_token_valid():
+            await super().ensure_robot_ready(allow_busy)
+            self._readiness_stats["token_hits"] += 1
+            return True
+        
         # Debug logging for comprehensive connection flow tracking
         start_time = time.time()
+        self._readiness_stats["full_checks"] += 1
         self.debug_log(self.robot_id, "ensure_robot_ready", "entry", 
                       f"Starting readiness check", {"allow_busy": allow_busy})
         
-        # First check software state using base class method
+        # Software state (base class) and the hardware status read are independent and run
+        # concurrently; nothing on the robot is changed until the software check has passed
         self.debug_log(self.robot_id, "ensure_robot_ready", "base_check", 
-                      "Calling base class ensure_robot_ready()")
-        await super().ensure_robot_ready(allow_busy)
-        self.debug_log(self.robot_id, "ensure_robot_ready", "base_complete", 
-                      "Base class check completed successfully")
-        
-        # Now check hardware state for Mecademic-specific requirements
+                      "Running base class ensure_robot_ready() alongside hardware status read")
+        base_check = asyncio.ensure_future(super().ensure_robot_ready(allow_busy))
+        try:
+            ready = await self._verify_hardware_ready(start_time, base_check)
+            await base_check
+        finally:
+            if not base_check.done():
+                base_check.cancel()
+        
+        if ready:
+            self._issue_readiness_token()
+        self._readiness_stats["last_full_check_time"] = time.time() - start_time
+        return ready
+    
+    async def _verify_hardware_ready(self, start_time: float, base_check: "asyncio.Future") -> bool:
+        """Mecademic hardware state: connect, reset, activate, home and resume as needed"""
         try:
             self.logger.debug(f"Checking Mecademic hardware state for {self.robot_id}")
             
@@ -544,6 +688,7 @@ class MecaService(RobotService):
                 self.debug_log(self.robot_id, "ensure_robot_ready", "no_driver", 
                               "No robot driver available - skipping hardware check")
                 self.logger.warning(f"No robot driver available for {self.robot_id} - skipping hardware state check")
+                await base_check
                 return True
                 
             driver = self.async_wrapper.robot_driver
@@ -555,6 +700,7 @@ class MecaService(RobotService):
                           f"Robot instance status", {"instance_available": robot_instance is not None})
             
             if not robot_instance:
+                await base_check
                 # No robot instance available - attempt to connect before proceeding
                 self.debug_log(self.robot_id, "ensure_robot_ready", "connection_attempt", 
                               "No robot instance - attempting connection")
@@ -594,6 +740,9 @@ class MecaService(RobotService):
             status = await driver.get_status()
             self.debug_log(self.robot_id, "ensure_robot_ready", "status_retrieved", 
                           f"Robot status retrieved", {"status": status})
+            await base_check
+            self.debug_log(self.robot_id, "ensure_robot_ready", "base_complete", 
+                          "Base class check completed successfully")
             activation_status = status.get('activation_status', False)
             homing_status = status.get('homing_status', False)
             error_status = status.get('error_status', False)
@@ -700,9 +849,11 @@ class MecaService(RobotService):
                         
                         # Wait for homing to complete using wait_idle
                         self.logger.info(f"⏳ Waiting for robot {self.robot_id} to complete homing...")
-                        wait_success = await driver.wait_idle(timeout=30.0)
-                        if not wait_success:
-                            self.logger.warning(f"⚠️ Wait idle timeout for robot {self.robot_id} - checking status")
+                        # Through the wrapper: bounded, sliced on the command thread and released by an e-stop
+                        try:
+                            await self.async_wrapper.wait_idle(timeout=30.0)
+                        except HardwareError as idle_error:
+                            self.logger.warning(f"⚠️ Wait idle failed for robot {self.robot_id} - checking status: {idle_error}")
                         
                         # Verify homing completed
                         verification_status = await driver.get_status()
@@ -879,19 +1030,14 @@ class MecaService(RobotService):
                             self.logger.info(f"🔄 Attempting to disconnect {self.robot_id}...")
                             await driver.disconnect()
 
-                            self.logger.info(f"⏳ Waiting 3s for clean disconnect...")
-                            await asyncio.sleep(3.0)
-
                             self.logger.info(f"🔄 Attempting to reconnect {self.robot_id}...")
                             connect_result = await driver.connect()
 
                             if connect_result:
                                 self.logger.info(f"✅ Successfully reconnected {self.robot_id} after socket closure")
 
-                                # Wait for connection to stabilize
-                                await asyncio.sleep(2.0)
-
-                                # Verify robot is ready after reconnection
+                                # connect() returns once the robot's status stream is readable,
+                                # so no fixed stabilization wait is needed before verifying
                                 reconnect_status = await driver.get_status()
                                 if reconnect_status.get('paused', False):
                                     # Try ResumeMotion again after reconnection
@@ -938,8 +1084,8 @@ class MecaService(RobotService):
             
             return True
             
-        except HardwareError:
-            # Re-raise hardware errors as-is
+        except (HardwareError, ValidationError):
+            # Re-raise hardware errors and software state failures as-is
             raise
         except Exception as e:
             error_msg = f"Unexpected error checking hardware state for {self.robot_id}: {str(e)}"
@@ -970,7 +1116,40 @@ class MecaService(RobotService):
         else:
             raise ValidationError(f"Unknown tray type: {tray_type}")
     
+    def get_position_table(self) -> PositionTable:
+        """Return the precomputed pose table, building it for the current config if needed"""
+        table = self._position_table
+        if table is None or table.config_version != self.wafer_config_manager.config_version:
+            table = PositionTable.build(
+                self._compute_intermediate_positions,
+                config_version=self.wafer_config_manager.config_version,
+                total_wafers=self.wafer_config_manager.sequence_config.get("total_wafers", 55)
+            )
+            self._position_table = table
+            self.logger.info(
+                f"📐 Position table built for config {table.config_version} "
+                f"({table.total_wafers} wafers) in {table.build_time * 1000:.1f}ms"
+            )
+        return table
+
+    def invalidate_position_table(self):
+        """Drop the precomputed pose table so it is rebuilt from the current config"""
+        self._position_table = None
+
     def calculate_intermediate_positions(self, wafer_index: int, operation: str) -> Dict[str, List[float]]:
+        """
+        Intermediate positions for a wafer, served from the precomputed position table.
+
+        Args:
+            wafer_index: Wafer index (0-54 for wafers 1-55)
+            operation: Operation type ('pickup', 'drop', 'carousel', 'empty_carousel')
+
+        Returns:
+            Dictionary of position names to coordinate lists
+        """
+        return self.get_position_table().positions(operation, wafer_index)
+
+    def _compute_intermediate_positions(self, wafer_index: int, operation: str) -> Dict[str, List[float]]:
         """
         Calculate intermediate positions for safe movement during wafer operations.
         All offset values are loaded from runtime.json via WaferConfigManager.
@@ -1446,6 +1625,7 @@ class MecaService(RobotService):
                 # Get the underlying Mecademic driver
                 if hasattr(self.async_wrapper, 'robot_driver'):
                     driver = self.async_wrapper.robot_driver
+                    self.invalidate_readiness("disconnect")
                     
                     # Attempt disconnection
                     disconnected = await driver.disconnect()
@@ -1482,6 +1662,10 @@ class MecaService(RobotService):
         emergency_success = False
         
         try:
+            # Stop any streaming compiled program at the next instruction boundary
+            self.async_wrapper.abort_program()
+            self.invalidate_readiness("emergency stop")
+            
             # Primary method: Emergency stop through AsyncRobotWrapper (now has handler)
             try:
                 await self.async_wrapper.execute_movement(
@@ -1882,6 +2066,88 @@ class MecaService(RobotService):
         
         return await self.execute_operation(context, _get_carousel_status)
 
+    def set_confirmed_actions(self, enabled: bool, reset_report: bool = False) -> Dict[str, Any]:
+        """Enable/disable confirmed-actions mode at runtime and return the timing report"""
+        self.confirmed_actions.enabled = enabled
+        if reset_report:
+            self.confirmed_actions.reset()
+        self.logger.info(f"⏱️ Confirmed actions {'enabled' if enabled else 'disabled'}")
+        return self.confirmed_actions.report()
+
+    def get_timing_trace(
+        self, operation: Optional[str] = None, include_gantt: bool = False, limit: int = 5000
+    ) -> Dict[str, Any]:
+        """Per-step percentile timings (and optionally Gantt rows) from recorded sequence spans"""
+        trace = {
+            "tracer": self.sequence_tracer.get_stats(),
+            "wafers": self.sequence_tracer.wafer_statistics(operation),
+            "steps": self.sequence_tracer.step_statistics(operation),
+            "command_overhead": self.get_command_overhead_stats(),
+            "readiness": self.get_readiness_stats()
+        }
+        if include_gantt:
+            trace["gantt"] = self.sequence_tracer.gantt(operation, limit=limit)
+        return trace
+
+    def estimate_cycle_time(
+        self,
+        operations: List[str],
+        start: int,
+        count: int,
+        overrides: Optional[Dict[str, Any]] = None,
+        include_moves: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Predict per-move, per-wafer and total duration for one or more sequences.
+
+        Recorded sequence spans are folded into the calibration first, so the
+        calibrated figures track the latest real runs.
+        """
+        added = self.cycle_time_estimator.calibrate_from_tracer()
+        if added:
+            self.logger.info(f"⏱️ Cycle-time calibration updated from {added} recorded sequence(s)")
+
+        estimates = [
+            self.cycle_time_estimator.estimate(operation, start, count, overrides)
+            for operation in operations
+        ]
+        return {
+            "operations": [estimate.to_dict(include_moves=include_moves) for estimate in estimates],
+            "predicted_seconds": round(sum(e.predicted for e in estimates), 3),
+            "calibrated_seconds": round(sum(e.calibrated for e in estimates), 3),
+            "overrides": overrides or {},
+            "calibration": self.cycle_time_estimator.get_calibration()
+        }
+
+    def calibrate_cycle_time(self, operation: str, start: int, count: int, measured_seconds: float) -> Dict[str, Any]:
+        """Record a measured sequence duration for cycle-time calibration"""
+        result = self.cycle_time_estimator.calibrate(operation, start, count, measured_seconds)
+        self.logger.info(
+            f"⏱️ Cycle-time calibration for {operation}: motion scale {result['motion_scale']} "
+            f"({result['samples']} samples)"
+        )
+        return result
+
+    def optimize_motion_profile(
+        self,
+        operation: str = "carousel",
+        wafers: int = 55,
+        constraints: Optional[Dict[str, Dict[str, Any]]] = None,
+        name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Propose the fastest legal speed/blending profile for a sequence (nothing is applied)"""
+        self.cycle_time_estimator.calibrate_from_tracer()
+        result = self.motion_profile_optimizer.optimize(operation, wafers, constraints, name)
+        self.logger.info(
+            f"🏎️ {operation} motion profile '{result['profile']['name']}': predicted "
+            f"{result['saved_per_wafer']:.2f}s/wafer, {result['saved_seconds']:.1f}s over {wafers} wafers"
+        )
+        return result
+
+    def get_confirmed_actions_report(self) -> Dict[str, Any]:
+        """Per-wafer seconds saved by confirmed gripper/settle waits"""
+        return self.confirmed_actions.report()
+
     async def reload_sequence_config(self) -> ServiceResult[Dict[str, Any]]:
         """Reload sequence configuration from runtime.json for mid-run adjustments"""
         try:
@@ -1894,26 +2160,32 @@ class MecaService(RobotService):
 
             # Reload the config manager
             self.wafer_config_manager.reload_config(new_robot_config, new_movement_params)
+            self.invalidate_position_table()
 
             # Also update local references
             self.robot_config = new_robot_config
             self.movement_params = new_movement_params
+            self.confirmed_actions.enabled = bool(new_movement_params.get("confirmed_actions", False))
 
             # Validate new config for all wafers
             errors = self.wafer_config_manager.validate_all_wafers()
 
+            # Rebuild the pose table now so offset errors surface on reload, not mid-run
+            table = self.get_position_table()
+
             self.logger.info(f"Sequence config reloaded - version {self.wafer_config_manager.config_version}")
 
             return ServiceResult(
                 success=len(errors) == 0,
                 data={
                     "version": self.wafer_config_manager.config_version,
+                    "position_table": table.summary(),
                     "validation_errors": errors,
                     "message": "Configuration reloaded successfully" if not errors else f"Configuration reloaded with {len(errors)} validation warnings"
                 },
                 error="; ".join(errors) if errors else None
             )
-        except ConfigurationError as e:
+        except (ConfigurationError, ValidationError) as e:
             self.logger.error(f"Failed to reload sequence config: {e}")
             return ServiceResult(success=False, error=str(e))
         except Exception as e:
@@ -1972,6 +2244,8 @@ class MecaService(RobotService):
             for i in range(max(start, resume_from_wafer), start + count):
                 wafer_num = i + 1
                 step_context = f"wafer {wafer_num} (index {i})"
+                self.confirmed_actions.begin_wafer("pickup", wafer_num)
+                self.sequence_tracer.begin_wafer(wafer_num)
                 
                 # Check for pause before processing each wafer
                 if await self.state_manager.is_step_paused(self.robot_id):
@@ -1981,14 +2255,12 @@ class MecaService(RobotService):
                         self.robot_id, 
                         {"current_wafer_index": i, "total_wafers": count}
                     )
-                    # Wait while paused
-                    while await self.state_manager.is_step_paused(self.robot_id):
-                        await asyncio.sleep(1.0)  # Check every second
-                    self.logger.info(f"▶️ Operation resumed at {step_context}")
+                    # Wait for resume (or e-stop) without polling
+                    if await self.state_manager.wait_until_resumed(self.robot_id):
+                        self.logger.info(f"▶️ Operation resumed at {step_context}")
                 
                 # Check for emergency stop before processing each wafer
-                robot_info = await self.state_manager.get_robot_state(self.robot_id)
-                if robot_info and robot_info.current_state == RobotState.EMERGENCY_STOP:
+                if self.state_manager.is_emergency_stopped(self.robot_id):
                     self.logger.critical(f"🚨 Emergency stop detected - aborting pickup sequence at {step_context}")
                     break  # Exit the wafer processing loop immediately
                 
@@ -2052,7 +2324,23 @@ class MecaService(RobotService):
 
                     # Check robot status before waiting (detect collisions/errors immediately)
                     driver = self.async_wrapper.robot_driver
-                    if hasattr(driver, 'get_robot_instance'):
+                    feed = self.async_wrapper.status_feed
+                    if feed is not None and feed.is_fresh(1.0):
+                        # O(1) snapshot from the status feed instead of a GetStatusRobot round trip
+                        snapshot = feed.latest()
+                        if snapshot.error:
+                            self.logger.error(f"🔴 Robot error detected after wafer {wafer_num} movements")
+                            raise HardwareError(
+                                f"Robot error after wafer {wafer_num} - possible collision or torque limit exceeded",
+                                robot_id=self.robot_id
+                            )
+                        if snapshot.paused:
+                            self.logger.error(f"⏸️ Robot paused after wafer {wafer_num} movements")
+                            raise HardwareError(
+                                f"Robot paused after wafer {wafer_num} - possible collision detected",
+                                robot_id=self.robot_id
+                            )
+                    elif hasattr(driver, 'get_robot_instance'):
                         robot_instance = driver.get_robot_instance()
                         if robot_instance and hasattr(robot_instance, 'GetStatusRobot'):
                             try:
@@ -2080,12 +2368,20 @@ class MecaService(RobotService):
 
                     # Wait for all motions to complete before proceeding to next wafer
                     # Use 60s timeout per wafer (complex movement sequence)
-                    await self.async_wrapper.wait_idle(timeout=60.0)
+                    idle_span = self.sequence_tracer.begin_step("WaitIdle")
+                    try:
+                        await self.state_manager.run_unless_emergency_stopped(
+                            self.robot_id, self.async_wrapper.wait_idle(timeout=60.0)
+                        )
+                    except Exception:
+                        self.sequence_tracer.end_step(idle_span, success=False)
+                        raise
+                    self.sequence_tracer.end_step(idle_span)
                     self.logger.info(f"✅ Wafer {wafer_num} motion sequence completed")
 
                     # Add spreading wait time when needed
                     if (4 - (i % 5)) == 0:
-                        await self._execute_movement_command("Delay", [self.SPREAD_WAIT])
+                        await self._execute_movement_command("Delay", [self.SPREAD_WAIT], confirm=False)
 
                 except Exception as e:
                     error_msg = f"❌ Failed to process {step_context}: {str(e)}"
@@ -2116,7 +2412,9 @@ class MecaService(RobotService):
             
             return result
         
-        return await self.execute_operation(context, _pickup_sequence)
+        return await self.execute_operation(
+            context, self._run_sequence, "pickup", start, count, _pickup_sequence
+        )
     
     def _validate_robot_parameters(self, command_type: str, parameters: List[Any]) -> bool:
         """
@@ -2221,32 +2519,8 @@ class MecaService(RobotService):
         
         return True
     
-    async def _execute_movement_command(self, command_type: str, parameters: List[Any] = None) -> None:
-        """
-        Helper method to execute movement commands through the async wrapper.
-        
-        Args:
-            command_type: Type of movement command (e.g., "MovePose", "SetJointVel")
-            parameters: List of parameters for the command
-        """
-        if parameters is None:
-            parameters = []
-            
-        # Check for emergency stop before executing any movement
-        robot_info = await self.state_manager.get_robot_state(self.robot_id)
-        if robot_info and robot_info.current_state == RobotState.EMERGENCY_STOP:
-            self.logger.critical(f"🚨 Emergency stop active - aborting movement: {command_type}")
-            raise RuntimeError(f"Emergency stop activated during {command_type}")
-        
-        # Validate parameters before sending to robot
-        try:
-            self._validate_robot_parameters(command_type, parameters)
-            self.logger.debug(f"Parameters validated for command {command_type}: {parameters}")
-        except ValidationError as e:
-            self.logger.error(f"Parameter validation failed for {command_type}: {e}")
-            raise
-        
-        # Convert list parameters to proper format for MovementCommand
+    def _build_movement_command(self, command_type: str, parameters: List[Any]) -> MovementCommand:
+        """Convert a Meca command name and list parameters into a MovementCommand"""
         if command_type == "MovePose" and len(parameters) == 6:
             # MovePose with 6 coordinates
             command = MovementCommand(
@@ -2289,6 +2563,11 @@ class MecaService(RobotService):
                 tool_action="grip_move",
                 parameters={"width": parameters[0]}
             )
+        elif command_type == "WaitIdle" and len(parameters) == 1:
+            command = MovementCommand(
+                command_type="WaitIdle",
+                parameters={"timeout": parameters[0]}
+            )
         elif command_type == "Delay" and len(parameters) == 1:
             command = MovementCommand(
                 command_type="Delay",
@@ -2307,28 +2586,143 @@ class MecaService(RobotService):
                 parameters={"values": parameters} if parameters else {}
             )
         
-        # Enhanced logging for pickup sequence debugging
-        command_start = time.time()
-        self.logger.info(f"🤖 EXECUTING COMMAND: {command_type} with parameters {parameters}")
+        return command
+    
+    async def _execute_movement_command(
+        self, command_type: str, parameters: List[Any] = None, confirm: bool = True
+    ) -> None:
+        """
+        Helper method to execute movement commands through the async wrapper.
         
-        # Check socket/driver status before command
-        if hasattr(self.async_wrapper, 'robot_driver'):
-            driver = self.async_wrapper.robot_driver
+        Args:
+            command_type: Type of movement command (e.g., "MovePose", "SetJointVel")
+            parameters: List of parameters for the command
+            confirm: For Delay in confirmed-actions mode, allow ending early on hardware
+                confirmation. Pass False for process waits that must run their full time.
+        """
+        if parameters is None:
+            parameters = []
+        
+        span = self.sequence_tracer.begin_step(command_type, parameters)
+        try:
+            await self._dispatch_movement_command(command_type, parameters, confirm, span)
+        except Exception:
+            self.sequence_tracer.end_step(span, success=False)
+            raise
+        self.sequence_tracer.end_step(span)
+    
+    async def _dispatch_movement_command(
+        self, command_type: str, parameters: List[Any], confirm: bool, span: Span
+    ) -> None:
+        """Check, validate and send one command; span is marked started when it reaches the robot"""
+        # Check for emergency stop through the state manager's lock-free flag
+        if self.state_manager.is_emergency_stopped(self.robot_id):
+            self.logger.critical(f"🚨 Emergency stop active - aborting movement: {command_type}")
+            raise RuntimeError(f"Emergency stop activated during {command_type}")
+        
+        # Fast path: commands already validated as part of the running sequence's
+        # compiled program skip validation, rebuilding and per-command INFO logging
+        key = (command_type, tuple(parameters))
+        fast_path = self._prevalidated is not None and key in self._prevalidated
+        
+        if not fast_path:
+            # Validate parameters before sending to robot
             try:
-                # Quick pre-command status check
-                robot_instance = driver.get_robot_instance() if hasattr(driver, 'get_robot_instance') else None
-                if robot_instance:
-                    self.logger.debug(f"🔗 SOCKET STATUS: Robot instance available for command {command_type}")
-                else:
-                    self.logger.warning(f"⚠️ SOCKET STATUS: No robot instance for command {command_type}")
-            except Exception as e:
-                self.logger.warning(f"⚠️ SOCKET CHECK: Could not verify socket status before {command_type}: {e}")
+                self._validate_robot_parameters(command_type, parameters)
+                self.logger.debug(f"Parameters validated for command {command_type}: {parameters}")
+            except ValidationError as e:
+                self.logger.error(f"Parameter validation failed for {command_type}: {e}")
+                raise
+        
+        # Confirmed-actions mode: the delay after a gripper/motion command only lasts
+        # until the robot confirms it, with the fixed delay kept as the timeout
+        pending_action = self.confirmed_actions.pending_action() if confirm else None
+        self.confirmed_actions.note_command(command_type)
+        if command_type == "Delay" and pending_action:
+            budget = float(parameters[0])
+            span.mark_started()
+            span.metadata["confirmed_action"] = pending_action
+            outcome = await self.state_manager.run_unless_emergency_stopped(
+                self.robot_id, self.async_wrapper.confirm_action(pending_action, timeout=budget)
+            )
+            self.confirmed_actions.record(budget, outcome["elapsed"], outcome["confirmed"])
+            self.logger.debug(
+                f"⏱️ Confirmed {pending_action} in {outcome['elapsed']:.3f}s "
+                f"(fixed delay {budget}s, confirmed={outcome['confirmed']})"
+            )
+            return
+        
+        if fast_path:
+            command = self._command_cache.get(key)
+            if command is None:
+                command = self._command_cache[key] = self._build_movement_command(command_type, parameters)
+            self._command_stats["fast_path"] += 1
+        else:
+            command = self._build_movement_command(command_type, parameters)
+            self._command_stats["full_path"] += 1
+            
+            self.logger.info(f"🤖 EXECUTING COMMAND: {command_type} with parameters {parameters}")
+            
+            # Check socket/driver status before command
+            if hasattr(self.async_wrapper, 'robot_driver'):
+                driver = self.async_wrapper.robot_driver
+                try:
+                    # Quick pre-command status check
+                    robot_instance = driver.get_robot_instance() if hasattr(driver, 'get_robot_instance') else None
+                    if robot_instance:
+                        self.logger.debug(f"🔗 SOCKET STATUS: Robot instance available for command {command_type}")
+                    else:
+                        self.logger.warning(f"⚠️ SOCKET STATUS: No robot instance for command {command_type}")
+                except Exception as e:
+                    self.logger.warning(f"⚠️ SOCKET CHECK: Could not verify socket status before {command_type}: {e}")
         
         # Execute the command
-        result = await self.async_wrapper.execute_movement(command)
+        span.mark_started()
+        self._command_overhead.append(span.queue_time)
+        if command_type in ("Delay", "WaitIdle"):
+            # Long waits are abandoned the moment an e-stop is raised, not at the next command
+            result = await self.state_manager.run_unless_emergency_stopped(
+                self.robot_id, self.async_wrapper.execute_movement(command)
+            )
+        else:
+            result = await self.async_wrapper.execute_movement(command)
         if not result.success:
             raise HardwareError(f"Movement command {command_type} failed: {result.error}", robot_id=self.robot_id)
     
+    async def _run_sequence(
+        self, operation: str, start: int, count: int, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run a wafer sequence traced and in batched mode: every command of the
+        sequence is validated once up front (via the sequence compiler), so the
+        per-command path only checks the e-stop flag and sends.
+        """
+        program = self.compile_sequence(operation, start, count)
+        self._prevalidated = frozenset(
+            (instruction.command_type, instruction.parameters) for instruction in program.instructions
+        )
+        self._command_cache = {}
+        try:
+            return await self.sequence_tracer.run_sequence(operation, start, count, func)
+        finally:
+            self._prevalidated = None
+            self._command_cache = {}
+    
+    def get_command_overhead_stats(self) -> Dict[str, Any]:
+        """Host-side overhead per command (call to hand-off) against COMMAND_OVERHEAD_BUDGET"""
+        samples = sorted(self._command_overhead)
+        p50 = samples[len(samples) // 2] if samples else 0.0
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else 0.0
+        return {
+            **self._command_stats,
+            "samples": len(samples),
+            "p50": p50,
+            "p99": p99,
+            "max": samples[-1] if samples else 0.0,
+            "budget": COMMAND_OVERHEAD_BUDGET,
+            "within_budget": p99 <= COMMAND_OVERHEAD_BUDGET
+        }
+    
     async def execute_drop_sequence(self, start: int, count: int) -> ServiceResult[Dict[str, Any]]:
         """
         Execute wafer drop sequence from spreader to baking tray.
@@ -2373,6 +2767,8 @@ class MecaService(RobotService):
             for i in range(max(start, resume_from_wafer), start + count):
                 wafer_num = i + 1
                 step_context = f"wafer {wafer_num} (index {i})"
+                self.confirmed_actions.begin_wafer("drop", wafer_num)
+                self.sequence_tracer.begin_wafer(wafer_num)
                 
                 # Check for pause before processing each wafer
                 if await self.state_manager.is_step_paused(self.robot_id):
@@ -2382,10 +2778,14 @@ class MecaService(RobotService):
                         self.robot_id, 
                         {"current_wafer_index": i, "total_wafers": count}
                     )
-                    # Wait while paused
-                    while await self.state_manager.is_step_paused(self.robot_id):
-                        await asyncio.sleep(1.0)  # Check every second
-                    self.logger.info(f"▶️ Drop operation resumed at {step_context}")
+                    # Wait for resume (or e-stop) without polling
+                    if await self.state_manager.wait_until_resumed(self.robot_id):
+                        self.logger.info(f"▶️ Drop operation resumed at {step_context}")
+                
+                # Check for emergency stop before processing each wafer
+                if self.state_manager.is_emergency_stopped(self.robot_id):
+                    self.logger.critical(f"🚨 Emergency stop detected - aborting drop sequence at {step_context}")
+                    break  # Exit the wafer processing loop immediately
                 
                 try:
                     self.logger.info(f"🔄 Processing wafer {wafer_num} drop from spreader to baking tray")
@@ -2480,7 +2880,9 @@ class MecaService(RobotService):
             self.logger.info(f"Drop sequence completed for wafers {start+1} to {start+count}")
             return result
         
-        return await self.execute_operation(context, _drop_sequence)
+        return await self.execute_operation(
+            context, self._run_sequence, "drop", start, count, _drop_sequence
+        )
     
     async def execute_carousel_sequence(self, start: int, count: int) -> ServiceResult[Dict[str, Any]]:
         """
@@ -2511,6 +2913,8 @@ class MecaService(RobotService):
             
             for i in range(start, start + count):
                 wafer_num = i + 1
+                self.confirmed_actions.begin_wafer("carousel", wafer_num)
+                self.sequence_tracer.begin_wafer(wafer_num)
                 self.logger.info(f"Processing wafer {wafer_num} from baking tray to carousel")
                 
                 # Add delay for each new carousel batch  
@@ -2591,7 +2995,9 @@ class MecaService(RobotService):
             self.logger.info(f"Carousel sequence completed for wafers {start+1} to {start+count}")
             return result
         
-        return await self.execute_operation(context, _carousel_sequence)
+        return await self.execute_operation(
+            context, self._run_sequence, "carousel", start, count, _carousel_sequence
+        )
     
     async def execute_empty_carousel_sequence(self, start: int, count: int) -> ServiceResult[Dict[str, Any]]:
         """
@@ -2617,6 +3023,8 @@ class MecaService(RobotService):
             
             for i in range(start, start + count):
                 wafer_num = i + 1
+                self.confirmed_actions.begin_wafer("empty_carousel", wafer_num)
+                self.sequence_tracer.begin_wafer(wafer_num)
                 self.logger.info(f"Processing wafer {wafer_num} from carousel to baking tray")
                 
                 # Add delay for each new carousel batch
@@ -2725,4 +3133,319 @@ class MecaService(RobotService):
             self.logger.info(f"Empty carousel sequence completed for wafers {start+1} to {start+count}")
             return result
         
-        return await self.execute_operation(context, _empty_carousel_sequence)
\ No newline at end of file
+        return await self.execute_operation(
+            context, self._run_sequence, "empty_carousel", start, count, _empty_carousel_sequence
+        )
+
+    def compile_sequence(self, operation: str, start: int, count: int) -> CompiledSequence:
+        """
+        Compile a wafer sequence into an immutable, pre-validated motion program.
+
+        Args:
+            operation: 'pickup', 'drop', 'carousel' or 'empty_carousel'
+            start: Starting wafer index (0-based)
+            count: Number of wafers to process
+        """
+        program = self.sequence_compiler.compile(operation, start, count)
+        self.logger.info(
+            f"📦 Compiled {operation} program for wafers {start+1} to {start+count}: "
+            f"{len(program)} instructions (config {program.config_version})"
+        )
+        return program
+
+    def render_compiled_program(
+        self, operation: str, start: int, count: int, start_instruction: int = 0
+    ) -> RenderedProgram:
+        """Render a compiled sequence as the robot-side program upload mode would store it"""
+        return render_program(
+            self.compile_sequence(operation, start, count), start_instruction,
+            self.robot_config.get("program_slot", 1)
+        )
+
+    async def execute_compiled_sequence(
+        self,
+        operation: str,
+        start: int,
+        count: int,
+        start_instruction: int = 0,
+        run_id: Optional[str] = None,
+        reentry: Optional[List[SequenceInstruction]] = None,
+        mode: str = "stream"
+    ) -> ServiceResult[Dict[str, Any]]:
+        """
+        Execute a wafer sequence as a single compiled program.
+
+        The program is validated once at compile time and streamed to the robot
+        in one executor call instead of one await per command. Progress is
+        checkpointed by instruction index so a stopped run can be resumed.
+        In "upload" mode the program is instead stored on the robot and run
+        from its controller, with progress reported through checkpoints.
+
+        Args:
+            operation: 'pickup', 'drop', 'carousel' or 'empty_carousel'
+            start: Starting wafer index (0-based)
+            count: Number of wafers to process
+            start_instruction: Instruction index to resume from; only with run_id,
+                since a new run always starts at instruction 0
+            run_id: Checkpoint journal run being resumed (a new run is journaled if omitted)
+            reentry: Moves that bring the arm back onto the program before resuming
+            mode: 'stream' (host sends each instruction) or 'upload' (robot-side program)
+        """
+        if mode not in COMPILED_EXECUTION_MODES:
+            raise ValidationError(
+                f"Unknown execution mode: {mode} (expected one of {list(COMPILED_EXECUTION_MODES)})",
+                field="mode"
+            )
+        if start_instruction and not run_id:
+            # Starting mid-program skips the re-entry plan and the gripper check
+            raise ValidationError(
+                f"Cannot start a new {operation} run at instruction {start_instruction} - "
+                f"resume an interrupted run through resume_compiled_sequence instead",
+                field="start_instruction"
+            )
+
+        context = OperationContext(
+            operation_id=f"{self.robot_id}_compiled_{operation}_{start}_{count}",
+            robot_id=self.robot_id,
+            operation_type=f"compiled_{operation}",
+            timeout=max(600.0, 120.0 * count),
+            metadata={"operation": operation, "start": start, "count": count, "mode": mode}
+        )
+
+        async def _compiled_sequence():
+            program = self.compile_sequence(operation, start, count)
+
+            await self.state_manager.start_step(
+                robot_id=self.robot_id,
+                step_index=0,
+                step_name=f"Compiled {operation} sequence",
+                operation_type=f"compiled_{operation}",
+                progress_data={
+                    "start": start,
+                    "count": count,
+                    "next_instruction_index": start_instruction,
+                    "total_instructions": len(program)
+                }
+            )
+
+            await self.ensure_robot_ready()
+
+            if self.state_manager.is_emergency_stopped(self.robot_id):
+                raise HardwareError(
+                    f"Emergency stop active - compiled {operation} sequence not started",
+                    robot_id=self.robot_id
+                )
+
+            commands = [
+                self._build_movement_command(instruction.command_type, list(instruction.parameters))
+                for instruction in program.instructions
+            ]
+
+            journal = self.checkpoint_journal
+            journal_run = run_id or f"{operation}_{start}_{count}_{uuid.uuid4().hex[:8]}"
+            if run_id:
+                journal.resume(journal_run, start_instruction)
+            else:
+                journal.begin(journal_run, program)
+                journal.confirm(journal_run, start_instruction)
+
+            try:
+                if reentry:
+                    await self._execute_reentry(journal_run, reentry)
+
+                if mode == "upload":
+                    # The rendered program restores skipped settings itself
+                    rendered = render_program(program, start_instruction, self.robot_config.get("program_slot", 1))
+                    result = await self.async_wrapper.execute_uploaded_program(
+                        program_id=context.operation_id,
+                        program_number=rendered.number,
+                        program_lines=rendered.commands,
+                        checkpoints=list(rendered.checkpoints),
+                        start_index=start_instruction,
+                        total_instructions=len(program),
+                        progress_callback=lambda index: journal.confirm(journal_run, index)
+                    )
+                else:
+                    # Redundant settings were removed program-wide, so a resumed run first
+                    # re-applies the motion parameters the skipped instructions would have set
+                    for instruction in program.settings_before(start_instruction):
+                        result = await self.async_wrapper.execute_movement(
+                            self._build_movement_command(instruction.command_type, list(instruction.parameters))
+                        )
+                        if not result.success:
+                            raise HardwareError(
+                                f"Could not restore {instruction.command_type} before resuming at "
+                                f"instruction {start_instruction}: {result.error}",
+                                robot_id=self.robot_id
+                            )
+
+                    result = await self.async_wrapper.execute_program(
+                        program_id=context.operation_id,
+                        commands=commands,
+                        start_index=start_instruction,
+                        progress_callback=lambda index: journal.confirm(journal_run, index)
+                    )
+            except Exception as e:
+                journal.end(journal_run, "failed", start_instruction, error=str(e))
+                raise
+
+            # Resume point is the last instruction the robot confirmed, not the last one sent
+            next_index = result.metadata.get("confirmed_index", start_instruction)
+            journal.end(journal_run, "completed" if result.success else "failed", next_index, error=result.error)
+            await self.state_manager.update_step_progress(
+                self.robot_id,
+                {
+                    "operation": operation,
+                    "run_id": journal_run,
+                    "next_instruction_index": next_index,
+                    "total_instructions": len(program),
+                    "current_wafer_index": program.wafer_at(next_index)
+                }
+            )
+
+            if not result.success:
+                failed_wafer = program.wafer_at(next_index)
+                raise HardwareError(
+                    f"Compiled {operation} sequence stopped at instruction {next_index}"
+                    f"{f' (wafer {failed_wafer + 1})' if failed_wafer is not None else ''}: {result.error}"
+                    f" - resume with run {journal_run}",
+                    robot_id=self.robot_id
+                )
+
+            await self.state_manager.run_unless_emergency_stopped(
+                self.robot_id, self.async_wrapper.wait_idle(timeout=60.0)
+            )
+            await self.state_manager.complete_step(self.robot_id)
+
+            self.logger.info(
+                f"✅ Compiled {operation} sequence completed for wafers {start+1} to {start+count} "
+                f"in {result.execution_time:.1f}s"
+            )
+
+            return {
+                "status": "completed",
+                "operation": operation,
+                "run_id": journal_run,
+                "wafers_processed": count,
+                "start_wafer": start + 1,
+                "end_wafer": start + count,
+                "instructions_executed": next_index - start_instruction,
+                "checkpoint": next_index,
+                "execution_time": result.execution_time,
+                "program": program.summary()
+            }
+
+        return await self.execute_operation(context, _compiled_sequence)
+
+    async def _execute_reentry(self, run_id: str, instructions: List[SequenceInstruction]):
+        """Drive the arm back onto a program along a precomputed re-entry path"""
+        self.logger.info(f"↩️ Re-entering run {run_id}: {len(instructions)} instructions")
+        result = await self.async_wrapper.execute_program(
+            program_id=f"{run_id}_reentry",
+            commands=[
+                self._build_movement_command(instruction.command_type, list(instruction.parameters))
+                for instruction in instructions
+            ]
+        )
+        if not result.success:
+            raise HardwareError(f"Re-entry path for run {run_id} failed: {result.error}", robot_id=self.robot_id)
+        await self.state_manager.run_unless_emergency_stopped(
+            self.robot_id, self.async_wrapper.wait_idle(timeout=60.0)
+        )
+
+    async def _current_pose(self) -> Tuple[Optional[Tuple[float, ...]], Optional[bool]]:
+        """Current cartesian pose and gripper-holding flag (None when unknown)"""
+        feed = self.async_wrapper.status_feed
+        if feed is not None and feed.is_fresh(1.0):
+            snapshot = feed.latest()
+            return snapshot.position, snapshot.gripper_holding
+
+        driver = self.async_wrapper.robot_driver
+        robot = driver.get_robot_instance() if hasattr(driver, 'get_robot_instance') else None
+        if robot is None or not hasattr(robot, 'GetRobotRtData'):
+            return None, None
+        rt_data = await self.async_wrapper.io_channel.run_status(robot.GetRobotRtData)
+        cart_pos = getattr(rt_data, 'rt_cart_pos', None) if rt_data else None
+        pose = tuple(cart_pos.data[:6]) if cart_pos is not None and getattr(cart_pos, 'data', None) else None
+        holding = None
+        if hasattr(robot, 'GetRtGripperState'):
+            gripper_state = await self.async_wrapper.io_channel.run_status(robot.GetRtGripperState)
+            holding = getattr(gripper_state, 'holding_part', None)
+        return pose, holding
+
+    def list_checkpoints(self) -> Dict[str, Any]:
+        """Interrupted compiled runs that can be resumed, most recent first"""
+        return {
+            "runs": [run.to_dict() for run in self.checkpoint_journal.resumable_runs()],
+            "journal": self.checkpoint_journal.get_stats()
+        }
+
+    def _find_resumable_run(self, run_id: Optional[str]) -> JournalRun:
+        runs = self.checkpoint_journal.resumable_runs()
+        if run_id is not None:
+            runs = [run for run in runs if run.run_id == run_id]
+        if not runs:
+            raise ValidationError(
+                f"No interrupted compiled sequence{f' with run id {run_id}' if run_id else ''} to resume",
+                field="run_id"
+            )
+        return runs[0]
+
+    async def plan_resume(self, run_id: Optional[str] = None) -> Tuple[JournalRun, CompiledSequence, ReentryPlan]:
+        """
+        Recover an interrupted run from the journal and plan its re-entry.
+
+        The program is recompiled and must match the journaled config version
+        and length, otherwise the confirmed index no longer means the same
+        instruction. The gripper must be in the state the program left it in.
+        """
+        run = self._find_resumable_run(run_id)
+        program = self.compile_sequence(run.operation, run.start, run.count)
+        if program.config_version != run.config_version or len(program) != run.total_instructions:
+            raise ValidationError(
+                f"Sequence configuration changed since run {run.run_id} started "
+                f"({run.config_version}, {run.total_instructions} instructions -> "
+                f"{program.config_version}, {len(program)} instructions) - cannot resume safely",
+                field="run_id"
+            )
+
+        pose, holding = await self._current_pose()
+        plan = plan_reentry(program, run.confirmed_index, pose)
+        if holding is not None and plan.expected_gripper is not None and holding != (plan.expected_gripper == "closed"):
+            raise ValidationError(
+                f"Gripper is {'holding' if holding else 'not holding'} a wafer but run {run.run_id} expects it "
+                f"{plan.expected_gripper} at instruction {run.confirmed_index} - resolve manually before resuming",
+                field="gripper"
+            )
+        return run, program, plan
+
+    async def resume_compiled_sequence(
+        self,
+        run_id: Optional[str] = None,
+        dry_run: bool = False,
+        mode: str = "stream"
+    ) -> ServiceResult[Dict[str, Any]]:
+        """
+        Resume an interrupted compiled sequence from its last confirmed instruction.
+
+        The arm is first driven back onto the program along the computed
+        re-entry path. With dry_run the plan is returned without moving.
+        """
+        run, program, plan = await self.plan_resume(run_id)
+        if dry_run:
+            return ServiceResult.success_result({"run": run.to_dict(), "reentry": plan.to_dict(), "dry_run": True})
+
+        self.logger.info(
+            f"🔁 Resuming run {run.run_id} ({run.operation}) at instruction {run.confirmed_index}/"
+            f"{run.total_instructions}{'' if plan.already_in_place else f' after {len(plan.instructions)} re-entry moves'}"
+        )
+        result = await self.execute_compiled_sequence(
+            run.operation, run.start, run.count,
+            start_instruction=run.confirmed_index,
+            run_id=run.run_id,
+            reentry=plan.instructions,
+            mode=mode
+        )
+        if result.success:
+            result.data["reentry"] = plan.to_dict()
+        return result
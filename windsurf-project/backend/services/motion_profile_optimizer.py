@@ -0,0 +1,214 @@
+"""
+Motion profile optimizer - proposes the fastest legal speed/blending schedule.
+
+Each move of a sequence belongs to a zone (tray, photogate, carousel entry,
+free space, ...) with a maximum joint velocity and a maximum blending. In the
+estimator's motion model, move time never increases with velocity or blending,
+so the fastest legal schedule runs every constrained move at its caps. The
+result is emitted as a sequence_config motion profile together with the
+predicted saving per wafer and for the whole run.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from core.exceptions import ValidationError
+from .cycle_time_estimator import ProgramEstimate
+from .meca_sequence_compiler import apply_motion_profile, eliminate_redundant_config
+
+if TYPE_CHECKING:
+    from .meca_service import MecaService
+
+
+# Per-move safety constraints: (zone, max joint velocity, max blending).
+# Velocities name a movement speed ("speed", "align_speed", "wafer_speed",
+# "empty_speed", "entry_speed") or "max_speed" from safety_bounds, or are numbers.
+# Blending is capped at 0 where the previous waypoint must be reached exactly.
+DEFAULT_CONSTRAINTS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "carousel": {
+        "above_baking": {"zone": "free", "max_joint_vel": "max_speed", "max_blending": 100},
+        "baking": {"zone": "tray", "max_joint_vel": "align_speed", "max_blending": 0},
+        "move1": {"zone": "tray", "max_joint_vel": "align_speed", "max_blending": 100},
+        "move2": {"zone": "tray", "max_joint_vel": "speed", "max_blending": 100},
+        "move3": {"zone": "tray", "max_joint_vel": "speed", "max_blending": 100},
+        "move4": {"zone": "tray", "max_joint_vel": "speed", "max_blending": 100},
+        "t_photogate": {"zone": "photogate", "max_joint_vel": "speed", "max_blending": 80},
+        "c_photogate": {"zone": "photogate", "max_joint_vel": "speed", "max_blending": 80},
+        "y_away1": {"zone": "photogate", "max_joint_vel": "wafer_speed", "max_blending": 80},
+        "y_away2": {"zone": "carousel_approach", "max_joint_vel": "wafer_speed", "max_blending": 0},
+        "above_carousel1": {"zone": "carousel_entry", "max_joint_vel": "entry_speed", "max_blending": 0},
+        "above_carousel2": {"zone": "carousel_entry", "max_joint_vel": "entry_speed", "max_blending": 0},
+        "above_carousel3": {"zone": "carousel_entry", "max_joint_vel": "entry_speed", "max_blending": 0},
+        "carousel": {"zone": "carousel_entry", "max_joint_vel": "entry_speed", "max_blending": 0},
+        "exit_above_carousel3": {"zone": "carousel_exit", "max_joint_vel": "empty_speed", "max_blending": 0},
+        "exit_above_carousel2": {"zone": "carousel_exit", "max_joint_vel": "empty_speed", "max_blending": 0},
+        "exit_above_carousel1": {"zone": "carousel_exit", "max_joint_vel": "empty_speed", "max_blending": 0},
+        "exit_y_away2": {"zone": "free", "max_joint_vel": "max_speed", "max_blending": 0},
+        "exit_y_away1": {"zone": "free", "max_joint_vel": "max_speed", "max_blending": 100},
+        "carousel_safe": {"zone": "free", "max_joint_vel": "max_speed", "max_blending": 100}
+    }
+}
+
+
+class MotionProfileOptimizer:
+    """
+    Builds motion profiles for MecaService sequences from per-move constraints.
+
+    Constraints come from DEFAULT_CONSTRAINTS, then
+    sequence_config.motion_constraints.<operation>, then the request.
+    """
+
+    def __init__(self, service: "MecaService"):
+        self.service = service
+
+    def _speed_values(self) -> Dict[str, float]:
+        s = self.service
+        return {
+            "speed": s.SPEED,
+            "align_speed": s.ALIGN_SPEED,
+            "wafer_speed": s.WAFER_SPEED,
+            "empty_speed": s.EMPTY_SPEED,
+            "entry_speed": s.ENTRY_SPEED,
+            "max_speed": s.wafer_config_manager.safety_bounds.get("max_speed", 60)
+        }
+
+    def get_constraints(
+        self, operation: str, overrides: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Merged per-move constraints with velocities resolved to numbers"""
+        configured = self.service.wafer_config_manager.sequence_config.get("motion_constraints", {})
+        merged: Dict[str, Dict[str, Any]] = {}
+        for source in (DEFAULT_CONSTRAINTS.get(operation, {}), configured.get(operation, {}), overrides or {}):
+            for label, constraint in source.items():
+                merged.setdefault(label, {}).update(constraint)
+
+        if not merged:
+            raise ValidationError(f"No motion constraints defined for {operation}", field="operation")
+
+        speeds = self._speed_values()
+        bounds = self.service.wafer_config_manager.safety_bounds
+        min_speed = bounds.get("min_speed", 0)
+        max_speed = bounds.get("max_speed", 100)
+
+        resolved = {}
+        for label, constraint in merged.items():
+            cap = constraint.get("max_joint_vel", "max_speed")
+            if isinstance(cap, str):
+                if cap not in speeds:
+                    raise ValidationError(
+                        f"{operation}.{label}: unknown speed '{cap}' (expected one of {list(speeds)})",
+                        field="constraints"
+                    )
+                cap = speeds[cap]
+            blending = constraint.get("max_blending", 0)
+            if not 0 <= blending <= 100:
+                raise ValidationError(f"{operation}.{label}: max_blending must be within [0, 100]", field="constraints")
+            resolved[label] = {
+                "zone": constraint.get("zone", "unspecified"),
+                "max_joint_vel": float(min(max(cap, min_speed), max_speed)),
+                "max_blending": float(blending)
+            }
+        return resolved
+
+    def optimize(
+        self,
+        operation: str = "carousel",
+        wafers: int = 55,
+        constraints: Optional[Dict[str, Dict[str, Any]]] = None,
+        name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Propose the fastest legal schedule for wafers 1..wafers of an operation.
+
+        The baseline is the program as it would run today (including any active
+        profile). Moves without a constraint keep their current settings and are
+        listed as unconstrained.
+        """
+        resolved = self.get_constraints(operation, constraints)
+        baseline = self.service.sequence_compiler.compile(operation, 0, wafers)
+
+        labels = []
+        for instruction in baseline.instructions:
+            if instruction.command_type in ("MovePose", "MoveLin") and instruction.label not in labels:
+                labels.append(instruction.label)
+
+        moves = {
+            label: {"joint_vel": resolved[label]["max_joint_vel"], "blending": resolved[label]["max_blending"]}
+            for label in labels if label in resolved
+        }
+        profile = {
+            "name": name or f"{operation}_optimized_{time.strftime('%Y%m%d_%H%M%S')}",
+            "operation": operation,
+            "active": True,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "base_config_version": baseline.config_version,
+            "moves": moves
+        }
+
+        optimized = eliminate_redundant_config(apply_motion_profile(baseline, profile))
+        for instruction in optimized.instructions:
+            self.service._validate_robot_parameters(instruction.command_type, list(instruction.parameters))
+
+        estimator = self.service.cycle_time_estimator
+        before = estimator.estimate_program(baseline)
+        after = estimator.estimate_program(optimized)
+
+        per_wafer = [
+            {
+                "wafer_num": old.wafer_index + 1,
+                "baseline_seconds": round(old.calibrated(before.motion_scale), 3),
+                "optimized_seconds": round(new.calibrated(after.motion_scale), 3),
+                "saved_seconds": round(old.calibrated(before.motion_scale) - new.calibrated(after.motion_scale), 3)
+            }
+            for old, new in zip(before.wafers, after.wafers)
+        ]
+        saved = before.calibrated - after.calibrated
+        profile["predicted_saving"] = {
+            "per_wafer_seconds": round(saved / wafers, 3),
+            "total_seconds": round(saved, 3),
+            "wafers": wafers
+        }
+
+        return {
+            "operation": operation,
+            "profile": profile,
+            "sequence_config_patch": {"motion_profiles": {operation: profile}},
+            "baseline_seconds": round(before.calibrated, 3),
+            "optimized_seconds": round(after.calibrated, 3),
+            "saved_seconds": round(saved, 3),
+            "saved_percent": round(100.0 * saved / before.calibrated, 2) if before.calibrated else 0.0,
+            "saved_per_wafer": round(saved / wafers, 3),
+            "per_wafer": per_wafer,
+            "moves": self._compare_moves(before, after, resolved),
+            "unconstrained_moves": [label for label in labels if label not in resolved],
+            "instructions": {"baseline": len(baseline), "optimized": len(optimized)}
+        }
+
+    @staticmethod
+    def _compare_moves(
+        before: ProgramEstimate, after: ProgramEstimate, constraints: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Per-label settings and time (summed over wafers) before and after"""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for old, new in zip(before.moves, after.moves):
+            row = rows.setdefault(old.label, {
+                "label": old.label,
+                "zone": constraints.get(old.label, {}).get("zone"),
+                "baseline_joint_vel": old.joint_vel,
+                "joint_vel": new.joint_vel,
+                "baseline_blending": old.blending,
+                "blending": new.blending,
+                "baseline_seconds": 0.0,
+                "optimized_seconds": 0.0
+            })
+            row["baseline_seconds"] += (old.duration - old.blend_saved) * before.motion_scale
+            row["optimized_seconds"] += (new.duration - new.blend_saved) * after.motion_scale
+
+        result = []
+        for row in rows.values():
+            row["saved_seconds"] = round(row["baseline_seconds"] - row["optimized_seconds"], 3) + 0.0
+            row["baseline_seconds"] = round(row["baseline_seconds"], 3)
+            row["optimized_seconds"] = round(row["optimized_seconds"], 3)
+            result.append(row)
+        result.sort(key=lambda r: r["saved_seconds"], reverse=True)
+        return result
@@ -5,14 +5,15 @@ Replaces the monolithic RobotManager with a clean service-oriented architecture.
 
 import asyncio
 import time
-from typing import Dict, Any, Optional, List, Set
+from contextlib import AsyncExitStack
+from typing import Dict, Any, Optional, List, Set, Callable, Tuple
 from dataclasses import dataclass
 
 from core.state_manager import AtomicStateManager, RobotState, SystemState
 from core.resource_lock import ResourceLockManager  
 from core.hardware_manager import HardwareConnectionManager
 from core.settings import RoboticsSettings
-from core.exceptions import ValidationError, ConfigurationError
+from core.exceptions import ValidationError, ConfigurationError, HardwareError
 from .base import BaseService, ServiceResult, OperationContext
 from utils.logger import get_logger
 
@@ -29,6 +30,23 @@ class SystemStatus:
     robot_details: Dict[str, Dict[str, Any]]
 
 
+@dataclass
+class WorkflowStep:
+    """One schedulable operation in a dependency-based workflow"""
+    step_id: str
+    index: int
+    robot_id: str
+    operation_type: str
+    method: Callable
+    parameters: Dict[str, Any]
+    depends_on: Tuple[str, ...] = ()
+    resources: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+
+
 class RobotOrchestrator(BaseService):
     """
     Central orchestrator for all robot services and system coordination.
@@ -61,6 +79,7 @@ class RobotOrchestrator(BaseService):
         # System coordination
         self._system_lock = asyncio.Lock()
         self._emergency_stop_active = False
+        self._last_workflow_schedule: Optional[Dict[str, Any]] = None
         
         # Monitoring tasks
         self._status_monitor_task: Optional[asyncio.Task] = None
@@ -400,12 +419,197 @@ class RobotOrchestrator(BaseService):
         return results
     
     async def _execute_dependency_workflow(self, operations: List[Dict[str, Any]]) -> List[Any]:
-        """Execute operations based on dependencies"""
-        # Implementation would include dependency resolution
-        # For now, fall back to sequential execution
-        self.logger.warning("Dependency-based workflow not yet implemented, using sequential")
-        return await self._execute_sequential_workflow(operations)
-    
+        """
+        Execute operations as a dependency graph across robots.
+
+        Each operation may declare:
+        - id: step identifier (defaults to "step_<index>")
+        - depends_on: ids that must complete before this step starts
+        - resources: shared resource ids held (via ResourceLockManager) while it runs
+
+        A robot runs one step at a time; among its ready steps the earliest in
+        the list goes first. Steps on different robots overlap whenever their
+        dependencies and resources allow.
+        """
+        steps = self._build_workflow_steps(operations)
+        by_id = {step.step_id: step for step in steps}
+        remaining = {step.step_id: set(step.depends_on) for step in steps}
+        busy_robots: Set[str] = set()
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+        workflow_start = time.time()
+
+        self.logger.info(
+            f"🔀 Dependency workflow: {len(steps)} steps across "
+            f"{len({step.robot_id for step in steps})} robots"
+        )
+
+        try:
+            while remaining or running:
+                # Dispatch the first ready step for every idle robot
+                for step in steps:
+                    if (
+                        step.step_id in remaining
+                        and not remaining[step.step_id]
+                        and step.robot_id not in busy_robots
+                    ):
+                        del remaining[step.step_id]
+                        busy_robots.add(step.robot_id)
+                        task = asyncio.create_task(self._run_workflow_step(step))
+                        running[task] = step
+
+                if not running:
+                    blocked = ", ".join(sorted(remaining))
+                    raise ValidationError(f"Workflow cannot make progress; blocked steps: {blocked}")
+
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    busy_robots.discard(step.robot_id)
+                    task.result()  # Re-raise the step failure, if any
+                    for waiting in remaining.values():
+                        waiting.discard(step.step_id)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+            self._last_workflow_schedule = self._summarize_schedule(steps, workflow_start)
+
+        schedule = self._last_workflow_schedule
+        self.logger.info(
+            f"✅ Dependency workflow finished in {schedule['wall_time']:.1f}s "
+            f"(busiest robot {schedule['critical_robot']}: {schedule['critical_busy_time']:.1f}s, "
+            f"efficiency {schedule['pipeline_efficiency']:.0%})"
+        )
+        return [by_id[step.step_id].result for step in steps]
+
+    def _build_workflow_steps(self, operations: List[Dict[str, Any]]) -> List['WorkflowStep']:
+        """Validate operations and resolve them into schedulable steps"""
+        steps: List[WorkflowStep] = []
+        seen: Set[str] = set()
+
+        for index, operation in enumerate(operations):
+            robot_id = operation["robot_id"]
+            operation_type = operation["operation_type"]
+            step_id = str(operation.get("id") or f"step_{index}")
+
+            if step_id in seen:
+                raise ValidationError(f"Duplicate workflow step id: {step_id}", field="id")
+            seen.add(step_id)
+
+            if robot_id not in self._robot_services:
+                raise ValidationError(f"Robot service not found: {robot_id}")
+            service = self._robot_services[robot_id]
+            if not hasattr(service, operation_type):
+                raise ValidationError(f"Operation {operation_type} not supported by {robot_id}")
+
+            steps.append(WorkflowStep(
+                step_id=step_id,
+                index=index,
+                robot_id=robot_id,
+                operation_type=operation_type,
+                method=getattr(service, operation_type),
+                parameters=operation.get("parameters", {}),
+                depends_on=tuple(str(d) for d in operation.get("depends_on", ())),
+                resources=tuple(sorted(set(operation.get("resources", ())))),
+                timeout=operation.get("timeout")
+            ))
+
+        for step in steps:
+            unknown = [d for d in step.depends_on if d not in seen]
+            if unknown:
+                raise ValidationError(
+                    f"Step {step.step_id} depends on unknown steps: {', '.join(unknown)}",
+                    field="depends_on"
+                )
+
+        # Reject cycles up front (Kahn's algorithm)
+        pending = {step.step_id: set(step.depends_on) for step in steps}
+        ready = [step_id for step_id, deps in pending.items() if not deps]
+        resolved = 0
+        while ready:
+            current = ready.pop()
+            resolved += 1
+            for step_id, deps in pending.items():
+                if current in deps:
+                    deps.discard(current)
+                    if not deps:
+                        ready.append(step_id)
+        if resolved != len(steps):
+            cyclic = ", ".join(sorted(step_id for step_id, deps in pending.items() if deps))
+            raise ValidationError(f"Workflow has a dependency cycle: {cyclic}", field="depends_on")
+
+        return steps
+
+    async def _run_workflow_step(self, step: 'WorkflowStep'):
+        """Run one step while holding its shared resources"""
+        async with AsyncExitStack() as stack:
+            # Resources are acquired in sorted order so steps never deadlock each other
+            for resource_id in step.resources:
+                await stack.enter_async_context(
+                    self.lock_manager.acquire_resource(
+                        resource_id,
+                        holder_id=step.step_id,
+                        timeout=step.timeout
+                    )
+                )
+
+            step.started_at = time.time()
+            self.logger.info(f"▶️ Step {step.step_id}: {step.robot_id}.{step.operation_type}")
+            try:
+                if step.timeout:
+                    result = await asyncio.wait_for(step.method(**step.parameters), timeout=step.timeout)
+                else:
+                    result = await step.method(**step.parameters)
+            finally:
+                step.finished_at = time.time()
+
+        # Service methods report failures through ServiceResult rather than raising
+        if isinstance(result, ServiceResult) and not result.success:
+            raise HardwareError(
+                f"Workflow step {step.step_id} ({step.operation_type}) failed: {result.error}",
+                robot_id=step.robot_id
+            )
+
+        step.result = result
+        self.logger.info(f"✅ Step {step.step_id} completed in {step.finished_at - step.started_at:.1f}s")
+
+    @staticmethod
+    def _summarize_schedule(steps: List['WorkflowStep'], workflow_start: float) -> Dict[str, Any]:
+        """Per-step timing plus how close the run came to the busiest robot's busy time"""
+        wall_time = time.time() - workflow_start
+        busy: Dict[str, float] = {}
+        timeline = []
+        for step in steps:
+            if step.started_at is None:
+                continue
+            finished = step.finished_at or time.time()
+            busy[step.robot_id] = busy.get(step.robot_id, 0.0) + (finished - step.started_at)
+            timeline.append({
+                "id": step.step_id,
+                "robot_id": step.robot_id,
+                "operation_type": step.operation_type,
+                "start": step.started_at - workflow_start,
+                "end": finished - workflow_start
+            })
+
+        critical_robot = max(busy, key=busy.get) if busy else None
+        critical_busy = busy.get(critical_robot, 0.0) if critical_robot else 0.0
+        return {
+            "wall_time": wall_time,
+            "robot_busy_time": busy,
+            "critical_robot": critical_robot,
+            "critical_busy_time": critical_busy,
+            "pipeline_efficiency": critical_busy / wall_time if wall_time > 0 else 0.0,
+            "completed_steps": sum(1 for step in steps if step.result is not None),
+            "total_steps": len(steps),
+            "timeline": timeline
+        }
+
+    def get_last_workflow_schedule(self) -> Optional[Dict[str, Any]]:
+        """Timing summary of the most recent dependency-based workflow"""
+        return self._last_workflow_schedule
+
     async def get_robot_service(self, robot_id: str) -> Optional['RobotService']:
         """Get robot service by ID"""
         return self._robot_services.get(robot_id)
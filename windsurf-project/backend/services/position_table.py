@@ -0,0 +1,140 @@
+"""
+PositionTable - Precomputed per-wafer poses for all Meca sequence operations.
+
+Built once per sequence configuration so wafer sequences do an index lookup per
+move instead of rebuilding every pose (and re-resolving every offset) per call.
+"""
+
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core.exceptions import ValidationError
+
+
+# Pose names per operation, in the order they are stored in the table
+POSE_NAMES = {
+    "pickup": (
+        "pickup_high", "intermediate_1", "intermediate_2", "intermediate_3",
+        "above_spreader", "spreader", "above_spreader_exit"
+    ),
+    "drop": (
+        "above_spreader", "spreader", "above_spreader_pickup",
+        "baking_align1", "baking_align2", "baking_align3", "baking_align4", "baking_up"
+    ),
+    "carousel": (
+        "above_baking", "move1", "move2", "move3", "move4",
+        "y_away1", "y_away2", "above_carousel1", "above_carousel2", "above_carousel3"
+    ),
+    "empty_carousel": (
+        "y_away1", "y_away2", "above_carousel",
+        "move4_rev", "move3_rev", "move2_rev", "move1_rev", "above_baking_rev"
+    )
+}
+
+POSE_WIDTH = 6  # x, y, z, alpha, beta, gamma
+
+
+class PositionTable:
+    """
+    Dense pose table: one contiguous array of doubles per operation,
+    laid out as (wafer, pose, coordinate) - i.e. shape (total_wafers, n_poses, 6).
+    """
+
+    def __init__(self, config_version: str, total_wafers: int):
+        self.config_version = config_version
+        self.total_wafers = total_wafers
+        self.built_at = 0.0
+        self.build_time = 0.0
+        self._tables: Dict[str, array] = {}
+        self._pose_index: Dict[str, Dict[str, int]] = {
+            operation: {name: i for i, name in enumerate(names)}
+            for operation, names in POSE_NAMES.items()
+        }
+
+    @classmethod
+    def build(
+        cls,
+        compute: Callable[[int, str], Dict[str, List[float]]],
+        config_version: str,
+        total_wafers: int = 55
+    ) -> "PositionTable":
+        """
+        Build the table by evaluating compute(wafer_index, operation) once per cell.
+
+        Args:
+            compute: Function returning {pose_name: [x, y, z, a, b, g]} for a wafer/operation
+            config_version: Sequence config version the table was built from
+            total_wafers: Number of wafers (rows) in the table
+        """
+        started = time.time()
+        table = cls(config_version, total_wafers)
+
+        for operation, names in POSE_NAMES.items():
+            data = array("d")
+            for wafer_index in range(total_wafers):
+                poses = compute(wafer_index, operation)
+                for name in names:
+                    pose = poses[name]
+                    if len(pose) != POSE_WIDTH:
+                        raise ValidationError(
+                            f"{operation}.{name} for wafer {wafer_index + 1} has {len(pose)} coordinates (expected 6)",
+                            field="position"
+                        )
+                    data.extend(pose)
+            table._tables[operation] = data
+
+        table.built_at = time.time()
+        table.build_time = table.built_at - started
+        return table
+
+    def _offset(self, operation: str, wafer_index: int, pose_name: str) -> int:
+        if operation not in self._tables:
+            raise ValidationError(f"Unknown operation for position table: {operation}", field="operation")
+        if not 0 <= wafer_index < self.total_wafers:
+            raise ValidationError(
+                f"Wafer index {wafer_index} out of range (0-{self.total_wafers - 1})",
+                field="wafer_index"
+            )
+        pose = self._pose_index[operation].get(pose_name)
+        if pose is None:
+            raise ValidationError(f"Unknown pose '{pose_name}' for operation {operation}", field="pose")
+        return (wafer_index * len(POSE_NAMES[operation]) + pose) * POSE_WIDTH
+
+    def pose(self, operation: str, wafer_index: int, pose_name: str) -> List[float]:
+        """Return one pose as a new list"""
+        start = self._offset(operation, wafer_index, pose_name)
+        return self._tables[operation][start:start + POSE_WIDTH].tolist()
+
+    def positions(self, operation: str, wafer_index: int) -> Dict[str, List[float]]:
+        """All poses for a wafer, in the same shape as calculate_intermediate_positions"""
+        names = POSE_NAMES.get(operation)
+        if names is None:
+            raise ValidationError(f"Unknown operation for position table: {operation}", field="operation")
+        start = self._offset(operation, wafer_index, names[0])
+        row = self._tables[operation][start:start + len(names) * POSE_WIDTH].tolist()
+        return {name: row[i * POSE_WIDTH:(i + 1) * POSE_WIDTH] for i, name in enumerate(names)}
+
+    def slice(
+        self,
+        operation: str,
+        wafer_indices: Sequence[int],
+        pose_names: Optional[Sequence[str]] = None
+    ) -> Dict[int, Dict[str, List[float]]]:
+        """Poses for several wafers, optionally restricted to some pose names"""
+        names = pose_names or POSE_NAMES.get(operation, ())
+        return {
+            wafer_index: {name: self.pose(operation, wafer_index, name) for name in names}
+            for wafer_index in wafer_indices
+        }
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "config_version": self.config_version,
+            "total_wafers": self.total_wafers,
+            "operations": {operation: list(names) for operation, names in POSE_NAMES.items()},
+            "cells": sum(len(data) for data in self._tables.values()),
+            "bytes": sum(data.itemsize * len(data) for data in self._tables.values()),
+            "built_at": self.built_at,
+            "build_time": self.build_time
+        }
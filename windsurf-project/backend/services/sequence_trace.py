@@ -0,0 +1,265 @@
+"""
+SequenceTracer - structured timing spans for Meca wafer sequences.
+
+Spans form a sequence -> wafer -> step hierarchy. Every step carries
+queued/started/finished timestamps so time spent waiting (e-stop check,
+validation, command thread) can be told apart from time spent in the robot
+call itself. Finished spans go into a bounded ring buffer.
+"""
+
+import itertools
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+@dataclass
+class Span:
+    """One timed unit of work: a sequence, a wafer within it, or a single command"""
+    span_id: int
+    kind: str  # "sequence" | "wafer" | "step"
+    name: str
+    operation: str
+    parent_id: Optional[int] = None
+    wafer_num: Optional[int] = None
+    step_index: Optional[int] = None
+    queued_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    success: bool = True
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def mark_started(self):
+        if self.started_at is None:
+            self.started_at = time.time()
+
+    @property
+    def duration(self) -> float:
+        """Time from start to finish (0 while still open)"""
+        if self.finished_at is None:
+            return 0.0
+        return self.finished_at - (self.started_at or self.queued_at)
+
+    @property
+    def queue_time(self) -> float:
+        """Time between the step being requested and it being sent to the robot"""
+        return (self.started_at or self.queued_at) - self.queued_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "name": self.name,
+            "operation": self.operation,
+            "wafer_num": self.wafer_num,
+            "step_index": self.step_index,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": self.duration,
+            "queue_time": self.queue_time,
+            "success": self.success,
+            "metadata": self.metadata
+        }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class SequenceTracer:
+    """
+    Records sequence/wafer/step spans into a bounded ring buffer.
+
+    Sequences run one at a time per robot service, so the tracer keeps the
+    currently open sequence and wafer as plain attributes. A wafer span is
+    closed when the next wafer begins or when its sequence ends.
+    """
+
+    def __init__(self, capacity: int = 20000):
+        self.capacity = capacity
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._sequence: Optional[Span] = None
+        self._wafer: Optional[Span] = None
+        self._step_counter = 0
+        self._dropped = 0
+
+    async def run_sequence(
+        self,
+        operation: str,
+        start: int,
+        count: int,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Await func() inside a sequence span (usable as an execute_operation target)"""
+        span = self._open("sequence", f"{operation}_{start + 1}_{start + count}", operation)
+        span.metadata.update({"start": start, "count": count})
+        span.started_at = span.queued_at
+        self._sequence = span
+        success = False
+        try:
+            result = await func()
+            success = True
+            return result
+        finally:
+            self._close_wafer(success)
+            self._close(span, success)
+            self._sequence = None
+
+    def begin_wafer(self, wafer_num: int):
+        """Close the current wafer span (if any) and open one for wafer_num"""
+        self._close_wafer(True)
+        if self._sequence is None:
+            return
+        span = self._open("wafer", f"wafer_{wafer_num}", self._sequence.operation, parent=self._sequence)
+        span.wafer_num = wafer_num
+        span.started_at = span.queued_at
+        self._wafer = span
+        self._step_counter = 0
+
+    def begin_step(self, name: str, parameters: Optional[List[Any]] = None) -> Span:
+        """Open a step span; the caller marks it started and ends it with end_step()"""
+        parent = self._wafer or self._sequence
+        operation = self._sequence.operation if self._sequence else "manual"
+        span = self._open("step", name, operation, parent=parent)
+        if self._wafer is not None:
+            span.wafer_num = self._wafer.wafer_num
+            span.step_index = self._step_counter
+            self._step_counter += 1
+        if parameters:
+            span.metadata["parameters"] = list(parameters)
+        return span
+
+    def end_step(self, span: Span, success: bool = True):
+        span.mark_started()
+        self._close(span, success)
+
+    def _open(self, kind: str, name: str, operation: str, parent: Optional[Span] = None) -> Span:
+        return Span(
+            span_id=next(self._ids),
+            kind=kind,
+            name=name,
+            operation=operation,
+            parent_id=parent.span_id if parent else None,
+            queued_at=time.time()
+        )
+
+    def _close(self, span: Span, success: bool):
+        span.mark_started()
+        span.finished_at = time.time()
+        span.success = success
+        if len(self._spans) == self.capacity:
+            self._dropped += 1
+        self._spans.append(span)
+
+    def _close_wafer(self, success: bool):
+        if self._wafer is not None:
+            self._close(self._wafer, success)
+            self._wafer = None
+
+    def spans(self, operation: Optional[str] = None, kind: Optional[str] = None) -> List[Span]:
+        return [
+            span for span in self._spans
+            if (operation is None or span.operation == operation)
+            and (kind is None or span.kind == kind)
+        ]
+
+    def step_statistics(self, operation: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Percentile timings per step position, sorted by total time so the moves
+        and delays that dominate cycle time come first.
+        """
+        groups: Dict[tuple, List[Span]] = {}
+        for span in self.spans(operation, "step"):
+            key = (span.operation, span.step_index, span.name)
+            groups.setdefault(key, []).append(span)
+
+        stats = []
+        for (op, step_index, name), spans in groups.items():
+            durations = sorted(span.duration for span in spans)
+            queue_times = sorted(span.queue_time for span in spans)
+            total = sum(durations)
+            stats.append({
+                "operation": op,
+                "step_index": step_index,
+                "name": name,
+                "count": len(durations),
+                "failures": sum(1 for span in spans if not span.success),
+                "total": total,
+                "mean": total / len(durations),
+                "p50": _percentile(durations, 50),
+                "p90": _percentile(durations, 90),
+                "p99": _percentile(durations, 99),
+                "max": durations[-1],
+                "queue_p50": _percentile(queue_times, 50),
+                "queue_p99": _percentile(queue_times, 99)
+            })
+        stats.sort(key=lambda s: s["total"], reverse=True)
+        return stats
+
+    def wafer_statistics(self, operation: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Per-operation wafer cycle-time percentiles"""
+        by_operation: Dict[str, List[float]] = {}
+        for span in self.spans(operation, "wafer"):
+            by_operation.setdefault(span.operation, []).append(span.duration)
+
+        result = {}
+        for op, durations in by_operation.items():
+            durations.sort()
+            result[op] = {
+                "count": len(durations),
+                "mean": sum(durations) / len(durations),
+                "p50": _percentile(durations, 50),
+                "p90": _percentile(durations, 90),
+                "p99": _percentile(durations, 99),
+                "max": durations[-1]
+            }
+        return result
+
+    def gantt(self, operation: Optional[str] = None, limit: int = 5000) -> Dict[str, Any]:
+        """
+        Gantt-ready rows (most recent `limit` spans), with times in seconds
+        relative to the earliest row. Each row's lane is its kind, or
+        "wafer N" for steps.
+        """
+        spans = self.spans(operation)[-limit:]
+        if not spans:
+            return {"origin": None, "rows": []}
+
+        origin = min(span.queued_at for span in spans)
+        rows = []
+        for span in sorted(spans, key=lambda s: s.queued_at):
+            rows.append({
+                "id": span.span_id,
+                "parent_id": span.parent_id,
+                "lane": f"wafer {span.wafer_num}" if span.kind == "step" and span.wafer_num else span.kind,
+                "kind": span.kind,
+                "name": span.name,
+                "operation": span.operation,
+                "wafer_num": span.wafer_num,
+                "queued": span.queued_at - origin,
+                "start": (span.started_at or span.queued_at) - origin,
+                "end": span.finished_at - origin,
+                "success": span.success
+            })
+        return {"origin": origin, "rows": rows}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "buffered": len(self._spans),
+            "dropped": self._dropped,
+            "active_sequence": self._sequence.name if self._sequence else None
+        }
+
+    def clear(self):
+        self._spans.clear()
+        self._dropped = 0
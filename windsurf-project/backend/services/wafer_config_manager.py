@@ -6,10 +6,13 @@ If a required value is missing, the system raises a clear error.
 """
 
 import copy
+from array import array
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import logging
 
+from core.exceptions import ValidationError
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +72,9 @@ class WaferConfigManager:
         ]
     }
 
+    SPEED_KEYS = ("wafer_speed", "empty_speed", "align_speed", "entry_speed")
+    SPEED_DEFAULTS = {"wafer_speed": 35.0, "empty_speed": 50.0, "align_speed": 20.0, "entry_speed": 15.0}
+
     def __init__(self, robot_config: Dict[str, Any], movement_params: Dict[str, Any]):
         self.robot_config = robot_config
         self.movement_params = movement_params
@@ -115,8 +121,114 @@ class WaferConfigManager:
         # Safety bounds (optional, with reasonable defaults)
         self.safety_bounds = self.sequence_config.get("safety_bounds", {})
 
+        # Motion profiles (optional): per-move speed/blending schedules by operation
+        self.motion_profiles = self.sequence_config.get("motion_profiles", {})
+        self._validate_motion_profiles()
+
+        # Dense per-wafer arrays with every override already applied
+        self.total_wafers = max(int(self.sequence_config.get("total_wafers", 55)), 55)
+        self._materialize(self.total_wafers)
+
         logger.info(f"WaferConfigManager loaded config version {self._config_version}")
 
+    @staticmethod
+    def _require_number(value: Any, field: str, source: str) -> Any:
+        """Reject a value the dense per-wafer arrays cannot hold"""
+        if not isinstance(value, (int, float)):
+            raise ValidationError(f"{source}: '{field}' must be a number, got {value!r}", field=field, value=value)
+        return value
+
+    def _resolve_gaps_and_speeds(self, total_wafers: int) -> tuple:
+        """Dense per-wafer gap, gap adjustment and speed arrays, plus the override rows"""
+        base_gap = self._require_number(self.base_gap_wafers, "gap_wafers", "movement_params")
+        gap_wafers = array("d", [base_gap]) * total_wafers
+        gap_adjustment = array("d", [0.0]) * total_wafers
+        # Speeds stay lists so values keep their configured type in reports
+        speeds = {
+            key: [self.movement_params.get(key, self.SPEED_DEFAULTS[key])] * total_wafers
+            for key in self.SPEED_KEYS
+        }
+
+        # Range overrides apply in list order, later ranges win
+        for range_override in self.range_overrides:
+            range_start, range_end = range_override.get("range", [0, 54])
+            rows = range(max(range_start, 0), min(range_end, total_wafers - 1) + 1)
+            if "gap_wafers" in range_override:
+                gap = self._require_number(
+                    range_override["gap_wafers"], "gap_wafers", f"wafer_range_overrides {range_start}-{range_end}"
+                )
+                for i in rows:
+                    gap_wafers[i] = gap
+            for key in self.SPEED_KEYS:
+                if key in range_override:
+                    for i in rows:
+                        speeds[key][i] = range_override[key]
+
+        wafer_rows = {}
+        for wafer_key, override in self.wafer_overrides.items():
+            try:
+                i = int(wafer_key)
+            except (TypeError, ValueError):
+                continue
+            if str(i) != wafer_key or not 0 <= i < total_wafers:
+                continue
+            wafer_rows[i] = override
+            source = f"wafer_specific_overrides[{wafer_key}]"
+            if "gap_adjustment" in override:
+                gap_adjustment[i] = self._require_number(override["gap_adjustment"], "gap_adjustment", source)
+            if "gap_wafers" in override:
+                gap_wafers[i] = self._require_number(override["gap_wafers"], "gap_wafers", source)
+            for key in self.SPEED_KEYS:
+                if key in override:
+                    speeds[key][i] = override[key]
+
+        return gap_wafers, gap_adjustment, speeds, wafer_rows
+
+    def _materialize(self, total_wafers: int):
+        """
+        Resolve range and per-wafer overrides once into dense per-wafer arrays:
+        gap, gap adjustment, the four speeds and every operation offset.
+        """
+        gap_wafers, gap_adjustment, speeds, wafer_rows = self._resolve_gaps_and_speeds(total_wafers)
+
+        offsets: Dict[str, Dict[str, array]] = {}
+        for operation, op_offsets in self.operation_offsets.items():
+            if not isinstance(op_offsets, dict):
+                continue
+            columns = {}
+            for offset_name, value in op_offsets.items():
+                if not isinstance(value, (int, float)):
+                    continue
+                column = array("d", [value]) * total_wafers
+                override_key = f"{operation}_{offset_name}"
+                for i, override in wafer_rows.items():
+                    if override_key in override:
+                        column[i] = self._require_number(
+                            override[override_key], override_key, f"wafer_specific_overrides[{i}]"
+                        )
+                columns[offset_name] = column
+            offsets[operation] = columns
+
+        self._gap_wafers = gap_wafers
+        self._gap_adjustment = gap_adjustment
+        self._effective_gaps = array("d", (g + a for g, a in zip(gap_wafers, gap_adjustment)))
+        self._speeds = speeds
+        self._offset_columns = offsets
+        self._override_rows = frozenset(wafer_rows)
+
+    def get_offset_column(self, operation: str, offset_name: str) -> array:
+        """Per-wafer values of one offset (index = wafer index)"""
+        column = self._offset_columns.get(operation, {}).get(offset_name)
+        if column is None:
+            # Defer to get_offset for the descriptive configuration error
+            self.get_offset(operation, offset_name, 0)
+            raise ConfigurationError(f"Offset '{offset_name}' for operation '{operation}' is not numeric")
+        return column
+
+    def get_effective_gaps(self) -> array:
+        """Per-wafer effective gap (gap_wafers + gap_adjustment)"""
+        return self._effective_gaps
+
     def _find_missing_offsets(self) -> List[tuple]:
         """Find any missing required offset values"""
         missing = []
@@ -127,6 +239,32 @@ class WaferConfigManager:
                     missing.append((operation, key))
         return missing
 
+    def _validate_motion_profiles(self):
+        """Reject profiles with speeds outside safety bounds or invalid blending"""
+        min_speed = self.safety_bounds.get("min_speed", 0)
+        max_speed = self.safety_bounds.get("max_speed", 100)
+        errors = []
+        for operation, profile in self.motion_profiles.items():
+            for label, move in profile.get("moves", {}).items():
+                joint_vel = move.get("joint_vel")
+                if joint_vel is not None and not min_speed <= joint_vel <= max_speed:
+                    errors.append(f"{operation}.{label}: joint_vel {joint_vel} outside [{min_speed}, {max_speed}]")
+                blending = move.get("blending")
+                if blending is not None and not 0 <= blending <= 100:
+                    errors.append(f"{operation}.{label}: blending {blending} outside [0, 100]")
+        if errors:
+            raise ConfigurationError(
+                "Invalid motion profile values in sequence_config.motion_profiles:\n" +
+                "\n".join(f"  - {error}" for error in errors)
+            )
+
+    def get_motion_profile(self, operation: str) -> Optional[Dict[str, Any]]:
+        """Active motion profile for an operation, or None to run the hand-written schedule"""
+        profile = self.motion_profiles.get(operation)
+        if profile and profile.get("active", True):
+            return profile
+        return None
+
     def reload_config(self, new_robot_config: Dict[str, Any], new_movement_params: Dict[str, Any]):
         """Reload configuration (for mid-sequence adjustments)"""
         self.robot_config = new_robot_config
@@ -146,6 +284,10 @@ class WaferConfigManager:
 
         Raises ConfigurationError if offset not found (no silent defaults).
         """
+        column = self._offset_columns.get(operation, {}).get(offset_name)
+        if column is not None and 0 <= wafer_index < len(column):
+            return column[wafer_index]
+
         op_offsets = self.operation_offsets.get(operation)
         if not op_offsets:
             raise ConfigurationError(f"No offsets defined for operation '{operation}'")
@@ -169,67 +311,74 @@ class WaferConfigManager:
 
     def get_wafer_config(self, wafer_index: int) -> WaferConfig:
         """Get configuration for a specific wafer (gap + speeds)"""
-        gap_wafers = self.base_gap_wafers
-        gap_adjustment = 0.0
-        movement_speeds = {
-            "wafer_speed": self.movement_params.get("wafer_speed", 35.0),
-            "empty_speed": self.movement_params.get("empty_speed", 50.0),
-            "align_speed": self.movement_params.get("align_speed", 20.0),
-            "entry_speed": self.movement_params.get("entry_speed", 15.0)
-        }
+        if 0 <= wafer_index < self.total_wafers:
+            return WaferConfig(
+                wafer_index=wafer_index,
+                gap_wafers=self._gap_wafers[wafer_index],
+                gap_adjustment=self._gap_adjustment[wafer_index],
+                movement_speeds={key: self._speeds[key][wafer_index] for key in self.SPEED_KEYS}
+            )
 
-        # Apply range overrides
-        for range_override in self.range_overrides:
-            range_start, range_end = range_override.get("range", [0, 54])
-            if range_start <= wafer_index <= range_end:
-                if "gap_wafers" in range_override:
-                    gap_wafers = range_override["gap_wafers"]
-                for speed_key in movement_speeds.keys():
-                    if speed_key in range_override:
-                        movement_speeds[speed_key] = range_override[speed_key]
-
-        # Apply per-wafer overrides
-        wafer_key = str(wafer_index)
-        if wafer_key in self.wafer_overrides:
-            override = self.wafer_overrides[wafer_key]
-            if "gap_adjustment" in override:
-                gap_adjustment = override["gap_adjustment"]
-            if "gap_wafers" in override:
-                gap_wafers = override["gap_wafers"]
-            for speed_key in movement_speeds.keys():
-                if speed_key in override:
-                    movement_speeds[speed_key] = override[speed_key]
+        if wafer_index >= self.total_wafers:
+            # Beyond the materialized range: resolve the overrides that reach this wafer
+            gap_wafers, gap_adjustment, speeds, _ = self._resolve_gaps_and_speeds(wafer_index + 1)
+            return WaferConfig(
+                wafer_index=wafer_index,
+                gap_wafers=gap_wafers[wafer_index],
+                gap_adjustment=gap_adjustment[wafer_index],
+                movement_speeds={key: speeds[key][wafer_index] for key in self.SPEED_KEYS}
+            )
 
+        # Negative indices get the base values only
         return WaferConfig(
             wafer_index=wafer_index,
-            gap_wafers=gap_wafers,
-            gap_adjustment=gap_adjustment,
-            movement_speeds=movement_speeds
+            gap_wafers=self.base_gap_wafers,
+            gap_adjustment=0.0,
+            movement_speeds={key: self.movement_params.get(key, self.SPEED_DEFAULTS[key]) for key in self.SPEED_KEYS}
         )
 
     def validate_all_wafers(self, total_wafers: int = 55) -> List[str]:
-        """Validate configuration for all wafers"""
-        errors = []
-        bounds = self.safety_bounds
-
-        for i in range(total_wafers):
-            config = self.get_wafer_config(i)
+        """Validate configuration for all wafers (whole-array checks over the materialized config)"""
+        if total_wafers > self.total_wafers:
+            # Resolve the longer arrays locally; validating must not change the loaded config
+            gap_wafers, gap_adjustment, speeds, _ = self._resolve_gaps_and_speeds(total_wafers)
+            gaps = array("d", (g + a for g, a in zip(gap_wafers, gap_adjustment)))
+        else:
+            gaps, speeds = self._effective_gaps[:total_wafers], self._speeds
 
-            # Validate gap_wafers if bounds defined
-            effective_gap = config.effective_gap
-            if "min_gap_wafers" in bounds and effective_gap < bounds["min_gap_wafers"]:
-                errors.append(f"Wafer {i+1}: gap {effective_gap} below minimum {bounds['min_gap_wafers']}")
-            if "max_gap_wafers" in bounds and effective_gap > bounds["max_gap_wafers"]:
-                errors.append(f"Wafer {i+1}: gap {effective_gap} above maximum {bounds['max_gap_wafers']}")
+        bounds = self.safety_bounds
+        findings = []  # (wafer index, check order, message) - sorted to keep per-wafer report order
 
-            # Validate speeds if bounds defined
-            for speed_name, speed_value in config.movement_speeds.items():
-                if "min_speed" in bounds and speed_value < bounds["min_speed"]:
-                    errors.append(f"Wafer {i+1}: {speed_name} {speed_value} below minimum")
-                if "max_speed" in bounds and speed_value > bounds["max_speed"]:
-                    errors.append(f"Wafer {i+1}: {speed_name} {speed_value} above maximum")
+        if "min_gap_wafers" in bounds:
+            limit = bounds["min_gap_wafers"]
+            findings.extend(
+                (i, 0, f"Wafer {i+1}: gap {gap} below minimum {limit}")
+                for i, gap in enumerate(gaps) if gap < limit
+            )
+        if "max_gap_wafers" in bounds:
+            limit = bounds["max_gap_wafers"]
+            findings.extend(
+                (i, 1, f"Wafer {i+1}: gap {gap} above maximum {limit}")
+                for i, gap in enumerate(gaps) if gap > limit
+            )
 
-        return errors
+        for order, speed_name in enumerate(self.SPEED_KEYS, start=1):
+            values = speeds[speed_name][:total_wafers]
+            if "min_speed" in bounds:
+                limit = bounds["min_speed"]
+                findings.extend(
+                    (i, order * 2, f"Wafer {i+1}: {speed_name} {speed_value} below minimum")
+                    for i, speed_value in enumerate(values) if speed_value < limit
+                )
+            if "max_speed" in bounds:
+                limit = bounds["max_speed"]
+                findings.extend(
+                    (i, order * 2 + 1, f"Wafer {i+1}: {speed_name} {speed_value} above maximum")
+                    for i, speed_value in enumerate(values) if speed_value > limit
+                )
+
+        findings.sort(key=lambda finding: (finding[0], finding[1]))
+        return [message for _, _, message in findings]
 
     def preview_wafer_positions(self, wafer_indices: List[int], first_wafer: List[float],
                                  first_baking: List[float]) -> Dict[int, Dict[str, Any]]:
@@ -249,7 +398,7 @@ class WaferConfigManager:
                 "baking_tray_x": baking_x,
                 "spreader_index": 4 - (i % 5),
                 "movement_speeds": config.movement_speeds,
-                "has_overrides": str(i) in self.wafer_overrides
+                "has_overrides": i in self._override_rows
             }
 
         return preview
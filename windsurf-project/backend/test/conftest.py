@@ -0,0 +1,65 @@
+# Shared fixtures: the simulator exposed the way MecademicDriver exposes a
+# robot, a simulated MecademicDriver, and MecaService built through its real
+# constructor with the runtime config and stub collaborators.
+
+import json
+from pathlib import Path
+
+import pytest
+
+RUNTIME_CONFIG = Path(__file__).resolve().parents[1] / "config" / "runtime.json"
+
+SIM_DRIVER_CONFIG = {
+    "ip": "192.168.0.100", "port": 10000, "timeout": 5, "retry_attempts": 1, "retry_delay": 0,
+    "force": 100, "acceleration": 50, "speed": 35, "simulate": True, "simulation_time_scale": 0
+}
+
+
+class SimDriver:
+    """Minimal driver exposing a simulator instance via get_robot_instance()"""
+
+    def __init__(self, robot):
+        self._robot = robot
+
+    def get_robot_instance(self):
+        return self._robot
+
+
+@pytest.fixture
+def make_sim_driver():
+    """SimDriver(robot) for wrappers driven directly against a SimulatedMecaRobot"""
+    return SimDriver
+
+
+@pytest.fixture
+def make_mecademic_driver():
+    """MecademicDriver in simulate mode; time_scale 0 completes every wait instantly"""
+    from drivers.mecademic_driver import MecademicDriver
+
+    def make(time_scale: float = 0.0):
+        return MecademicDriver("meca", {**SIM_DRIVER_CONFIG, "simulation_time_scale": time_scale})
+
+    return make
+
+
+@pytest.fixture
+def make_meca_service(tmp_path):
+    """
+    Async factory for MecaService("meca") around the given wrapper stub, with the
+    robot registered IDLE and the checkpoint journal kept in tmp_path.
+    """
+    from types import SimpleNamespace
+
+    from core.resource_lock import ResourceLockManager
+    from core.state_manager import AtomicStateManager, RobotState
+    from services.meca_service import MecaService
+
+    async def make(wrapper):
+        robot_config = json.loads(RUNTIME_CONFIG.read_text())["meca"]
+        robot_config["checkpoint_journal"] = str(tmp_path / "checkpoints.jsonl")
+        settings = SimpleNamespace(get_robot_config=lambda robot_type: robot_config, enable_debug_logging=False)
+        state_manager = AtomicStateManager()
+        await state_manager.register_robot("meca", "meca", initial_state=RobotState.IDLE)
+        return MecaService("meca", settings, state_manager, ResourceLockManager(), wrapper)
+
+    return make
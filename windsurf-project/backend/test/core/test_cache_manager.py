@@ -0,0 +1,269 @@
+# InMemoryCacheManager: eviction order per strategy, indexed invalidation,
+# single-flight get_or_set, heap-based expiry and the lock-free read path.
+#
+# Timing benchmarks (insert latency and expiry cleanup at 1k-100k entries, and
+# read latency with hundreds of concurrent readers) only run with
+# RUN_BENCHMARKS=1; set CACHE_BENCH_MAX_SIZE=1000000 to include 1M entries.
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from core.cache_manager import CacheInvalidationStrategy, InMemoryCacheManager, RobotStatusCache
+
+benchmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run timing benchmarks")
+
+BENCH_SIZES = [n for n in (1_000, 10_000, 100_000, 1_000_000)
+               if n <= int(os.environ.get("CACHE_BENCH_MAX_SIZE", 100_000))]
+BENCH_INSERTS = 2_000
+BENCH_READERS = 300
+
+
+def test_eviction_order_per_strategy():
+    async def run(strategy):
+        cache = InMemoryCacheManager(max_size=3, invalidation_strategy=strategy)
+        for key in ("a", "b", "c"):
+            await cache.set(key, key)
+        await cache.get("a")
+        await cache.get("a")
+        await cache.get("b")
+        await cache.set("d", "d")
+        return sorted(cache._cache)
+
+    # Oldest (insertion order), least recently used and least frequently used
+    assert asyncio.run(run(CacheInvalidationStrategy.TTL_ONLY)) == ["b", "c", "d"]
+    assert asyncio.run(run(CacheInvalidationStrategy.LRU)) == ["a", "b", "d"]
+    assert asyncio.run(run(CacheInvalidationStrategy.LFU)) == ["a", "b", "d"]
+
+
+def test_lfu_recovers_after_lowest_bucket_is_deleted():
+    async def run():
+        cache = InMemoryCacheManager(max_size=3, invalidation_strategy=CacheInvalidationStrategy.LFU)
+        for key in ("a", "b", "c"):
+            await cache.set(key, key)
+        for key in ("a", "b", "b"):
+            await cache.get(key)
+        await cache.delete("c")  # empties the zero-access bucket
+        await cache.set("c", "c")
+        await cache.set("d", "d")  # evicts "c", the only entry without hits
+        await cache.set("e", "e")  # evicts "d"
+        return sorted(cache._cache)
+
+    assert asyncio.run(run()) == ["a", "b", "e"]
+
+
+def test_indexed_invalidation_touches_only_matching_entries():
+    async def run():
+        cache = InMemoryCacheManager(max_size=10_000)
+        for robot_id in ("meca", "ot2", "arduino"):
+            await cache.set(f"robot_status:{robot_id}", {}, tags=["robot_status", f"robot:{robot_id}"])
+            await cache.set(f"robot_config:{robot_id}", {}, tags=[f"robot:{robot_id}"])
+        for i in range(5_000):
+            await cache.set(f"protocol:{i}", i, tags=["protocol"])
+
+        invalidated = []
+        await cache.register_invalidation_callback("robot_status:*", invalidated.append)
+        await cache.register_invalidation_callback("robot_config:ot2", invalidated.append)
+        await cache.register_invalidation_callback("*:meca", invalidated.append)
+
+        assert await cache.invalidate_pattern("robot_status:me*") == 1
+        assert invalidated == ["robot_status:meca", "robot_status:meca"]
+        assert await cache.invalidate_by_tag("robot:ot2") == 2
+        assert sorted(invalidated[2:]) == ["robot_config:ot2", "robot_status:ot2"]
+        assert await cache.invalidate_pattern("robot_*") == 3
+        assert await cache.invalidate_by_tag("robot_status") == 0
+        assert await cache.invalidate_pattern("protocol:49??") == 100
+        assert cache._match_keys("protocol:4") == ["protocol:4"]
+        return len(cache._cache), cache._tag_index["protocol"]
+
+    remaining, protocol_keys = asyncio.run(run())
+    assert remaining == 4_900 and len(protocol_keys) == 4_900
+
+
+def test_concurrent_misses_share_one_status_fetch():
+    async def run():
+        robot_cache = RobotStatusCache(InMemoryCacheManager())
+        fetches = []
+
+        async def fetch():
+            fetches.append(time.time())
+            await asyncio.sleep(0.05)
+            return {"connected": True, "fetch": len(fetches)}
+
+        # Cold cache: 100 readers miss together
+        cold = await asyncio.gather(*(robot_cache.get_or_fetch_robot_status("meca", fetch, ttl=0.1, stale_ttl=10)
+                                      for _ in range(100)))
+        await asyncio.sleep(0.15)
+
+        # Expired but within the stale window: readers get the old status while
+        # the single refresh is still running
+        stale = await asyncio.gather(*(robot_cache.get_or_fetch_robot_status("meca", fetch, ttl=0.1, stale_ttl=10)
+                                       for _ in range(100)))
+        refreshing = "robot_status:meca" in robot_cache.cache_manager._inflight
+        await asyncio.sleep(0.1)
+        refreshed = await robot_cache.get_or_fetch_robot_status("meca", fetch, ttl=0.1, stale_ttl=10)
+        return cold, stale, refreshing, refreshed, len(fetches), await robot_cache.cache_manager.get_stats()
+
+    cold, stale, refreshing, refreshed, fetch_count, stats = asyncio.run(run())
+    assert all(status["fetch"] == 1 for status in cold + stale)
+    assert refreshing
+    assert refreshed["fetch"] == 2 and fetch_count == 2
+    assert stats["coalesced"] == 99 and stats["stale_hits"] == 100
+
+
+def test_invalidation_during_fetch_discards_the_result():
+    async def run():
+        cache = InMemoryCacheManager()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "before e-stop"
+
+        pending = asyncio.ensure_future(cache.get_or_set("robot_status:meca", fetch, tags=["robot_status"]))
+        await asyncio.sleep(0.01)
+        await cache.invalidate_by_tag("robot_status")
+        return await pending, await cache.get("robot_status:meca")
+
+    assert asyncio.run(run()) == ("before e-stop", None)
+
+
+def test_cleanup_pops_only_expired_entries():
+    async def run():
+        cache = InMemoryCacheManager(max_size=2_000, invalidation_strategy=CacheInvalidationStrategy.LRU)
+        await cache.set("oldest", 0, ttl=3600)
+        for i in range(1_000):
+            await cache.set(f"k{i}", i, ttl=3600)
+        for i in range(100):
+            await cache.set(f"short{i}", i, ttl=0.01)
+        await cache.set("k0", 0, ttl=3600)  # replaced: its old heap item is skipped, not expired
+        await cache.get("oldest")  # most recently used under LRU, still the oldest entry
+        await asyncio.sleep(0.02)
+
+        heap_before = len(cache._expiry_heap)
+        await cache._cleanup_expired()
+        return heap_before - len(cache._expiry_heap), len(cache._cache), await cache.get_stats(), cache
+
+    popped, size, stats, cache = asyncio.run(run())
+    # Only the due items were popped; the 1001 live entries were never visited
+    assert popped == 100
+    assert size == 1_001 and not any(key.startswith("short") for key in cache._cache)
+    assert next(iter(cache._created_order)) == "oldest"
+    assert stats["oldest_entry_age"] >= 0.02
+
+
+def test_reads_do_not_wait_for_a_writer_holding_the_lock():
+    async def run():
+        cache = InMemoryCacheManager(invalidation_strategy=CacheInvalidationStrategy.LRU)
+        await cache.set("robot_status:meca", {"connected": True})
+        await cache.set("protocol:current", {})
+        release = asyncio.Event()
+
+        async def slow_listener(key):
+            await release.wait()
+
+        await cache.register_invalidation_callback("protocol:*", slow_listener)
+        writer = asyncio.ensure_future(cache.delete("protocol:current"))
+        await asyncio.sleep(0)
+        # The writer is parked inside its callback with the lock held
+        locked = cache._lock.locked()
+        value = await asyncio.wait_for(cache.get("robot_status:meca"), timeout=1.0)
+        stats = await asyncio.wait_for(cache.get_stats(), timeout=1.0)
+        release.set()
+        await writer
+        return locked, value, stats
+
+    locked, value, stats = asyncio.run(run())
+    assert locked
+    assert value == {"connected": True}
+    assert stats["hits"] == 1
+
+
+@benchmark
+@pytest.mark.parametrize("strategy", list(CacheInvalidationStrategy))
+def test_insert_latency_is_flat_at_capacity(strategy):
+    async def bench(size):
+        cache = InMemoryCacheManager(max_size=size, invalidation_strategy=strategy)
+        for i in range(size):
+            await cache.set(f"k{i}", i, tags=["bench"])
+        for i in range(0, size, max(1, size // 100)):
+            await cache.get(f"k{i}")
+
+        started = time.perf_counter()
+        for i in range(BENCH_INSERTS):
+            await cache.set(f"new{i}", i, tags=["bench"])  # every insert evicts one entry
+        elapsed = (time.perf_counter() - started) / BENCH_INSERTS
+        assert len(cache._cache) == size
+        return elapsed
+
+    # Best of three, so one noisy run does not decide the comparison
+    latencies = {size: min(asyncio.run(bench(size)) for _ in range(3)) for size in BENCH_SIZES}
+    report = f"{strategy.value}: " + ", ".join(f"{size}: {latency * 1e6:.1f}us" for size, latency in latencies.items())
+    smallest, largest = latencies[BENCH_SIZES[0]], latencies[BENCH_SIZES[-1]]
+    assert largest < smallest * 4 + 20e-6, report
+
+
+@benchmark
+@pytest.mark.parametrize("strategy", [CacheInvalidationStrategy.TTL_ONLY, CacheInvalidationStrategy.LRU])
+def test_expiry_cleanup_cost_tracks_expired_entries(strategy):
+    async def bench(size):
+        cache = InMemoryCacheManager(max_size=size + 100, invalidation_strategy=strategy)
+        for i in range(size):
+            await cache.set(f"k{i}", i, ttl=3600)
+        for i in range(100):
+            await cache.set(f"short{i}", i, ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        started = time.perf_counter()
+        await cache._cleanup_expired()
+        await cache.get_stats()
+        elapsed = time.perf_counter() - started
+        assert len(cache._cache) == size
+        return elapsed
+
+    # Best of three, so one noisy run does not decide the comparison
+    latencies = {size: min(asyncio.run(bench(size)) for _ in range(3)) for size in BENCH_SIZES}
+    report = f"{strategy.value} cleanup: " + ", ".join(f"{size}: {latency * 1e6:.0f}us" for size, latency in latencies.items())
+    smallest, largest = latencies[BENCH_SIZES[0]], latencies[BENCH_SIZES[-1]]
+    assert largest < smallest * 4 + 1e-3, report
+
+
+@benchmark
+def test_read_latency_with_concurrent_readers_and_slow_writer():
+    async def run():
+        cache = InMemoryCacheManager(invalidation_strategy=CacheInvalidationStrategy.LRU)
+        for robot_id in ("meca", "ot2", "arduino"):
+            await cache.set(f"robot_status:{robot_id}", {"connected": True})
+
+        async def slow_listener(key):
+            await asyncio.sleep(0.01)
+
+        # The writer holds the lock for ~10 ms per invalidation while its callback runs
+        await cache.register_invalidation_callback("protocol:*", slow_listener)
+        done = asyncio.Event()
+
+        async def writer():
+            while not done.is_set():
+                await cache.set("protocol:current", {})
+                await cache.delete("protocol:current")
+
+        async def reader(i):
+            latencies = []
+            for _ in range(20):
+                started = time.perf_counter()
+                assert await cache.get(f"robot_status:{('meca', 'ot2', 'arduino')[i % 3]}") is not None
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.001)
+            return latencies
+
+        writer_task = asyncio.ensure_future(writer())
+        await asyncio.sleep(0.005)
+        results = await asyncio.gather(*(reader(i) for i in range(BENCH_READERS)))
+        done.set()
+        await writer_task
+        return sorted(latency for latencies in results for latency in latencies)
+
+    latencies = asyncio.run(run())
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+    assert p99 < 0.001, f"{BENCH_READERS} readers: p50 {p50 * 1e6:.1f}us, p99 {p99 * 1e6:.1f}us"
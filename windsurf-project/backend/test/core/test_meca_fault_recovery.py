@@ -0,0 +1,91 @@
+# Fault recovery: after a pause fault, a failed wait_idle must not leave the
+# command thread blocked, and ClearMotion/ResumeMotion run on the control thread.
+
+import asyncio
+import time
+
+import pytest
+
+from core.async_robot_wrapper import AsyncRobotWrapper
+from core.exceptions import HardwareError
+
+SAFE_POINT = [135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308]
+FIRST_WAFER = [173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059]
+
+
+def test_pause_fault_does_not_block_recovery(make_mecademic_driver):
+    async def run():
+        driver = make_mecademic_driver(time_scale=1.0)
+        wrapper = AsyncRobotWrapper("meca", driver)
+        try:
+            assert await driver.connect()
+            robot = driver.get_robot_instance()
+            robot.MovePose(*FIRST_WAFER)
+            robot.MovePose(*SAFE_POINT)
+            robot.inject_fault("pause")
+
+            with pytest.raises(HardwareError):
+                await wrapper.wait_idle(timeout=1.0)
+
+            started = time.time()
+            cleared = await driver.clear_motion()
+            resumed = await driver.resume_motion()
+            recovery_time = time.time() - started
+            # The command thread is free again for the next motion
+            await asyncio.wait_for(wrapper.io_channel.run_command(robot.GetStatusRobot), timeout=1.0)
+            return cleared, resumed, recovery_time, robot.GetStatusRobot()
+        finally:
+            await wrapper.shutdown()
+            await driver.shutdown()
+
+    cleared, resumed, recovery_time, status = asyncio.run(run())
+    assert cleared and resumed
+    assert recovery_time < 1.0
+    assert not status.pause_motion_status and status.end_of_block_status
+
+
+def test_fault_edge_releases_the_blocked_wait(make_mecademic_driver):
+    async def run():
+        driver = make_mecademic_driver(time_scale=1.0)
+        wrapper = AsyncRobotWrapper("meca", driver)
+        try:
+            assert await driver.connect()
+            robot = driver.get_robot_instance()
+            robot.MovePose(*FIRST_WAFER)
+            robot.inject_fault("pause")
+
+            started = time.time()
+            with pytest.raises(HardwareError):
+                await wrapper.wait_idle(timeout=30.0)
+            # Without recovery, the next command-thread call still runs at once
+            await wrapper.io_channel.run_command(robot.GetStatusRobot)
+            return time.time() - started
+        finally:
+            await wrapper.shutdown()
+            await driver.shutdown()
+
+    assert asyncio.run(run()) < 1.0
+
+
+def test_driver_wait_idle_is_bounded_in_seconds(make_mecademic_driver):
+    async def run():
+        driver = make_mecademic_driver(time_scale=1.0)
+        wrapper = AsyncRobotWrapper("meca", driver)
+        try:
+            assert await driver.connect()
+            robot = driver.get_robot_instance()
+            robot.MovePose(*FIRST_WAFER)
+            robot.inject_fault("pause")
+
+            started = time.time()
+            idle = await driver.wait_idle(timeout=0.5)
+            # The paused arm never goes idle; the command thread is free again right after
+            await asyncio.wait_for(wrapper.io_channel.run_command(robot.GetStatusRobot), timeout=0.5)
+            return idle, time.time() - started
+        finally:
+            await wrapper.shutdown()
+            await driver.shutdown()
+
+    idle, elapsed = asyncio.run(run())
+    assert idle is False
+    assert elapsed < 1.0
@@ -0,0 +1,38 @@
+# Reconnect fast path: after a network blip the driver reconnects the same
+# robot instance in the mode that worked before, skips activation/homing the
+# arm kept, and reports time-to-ready.
+
+import asyncio
+import time
+
+
+def test_reconnect_after_blip_is_fast_and_measured(make_mecademic_driver):
+    async def run():
+        driver = make_mecademic_driver()
+        try:
+            assert await driver.connect()
+            robot = driver.get_robot_instance()
+            assert robot.IsActivated() and robot.IsHomed()
+            await asyncio.sleep(0.1)
+
+            # Network blip: the control connection drops, the arm stays activated and homed
+            robot.Disconnect()
+            await asyncio.sleep(0.1)
+            assert driver.get_reconnect_stats()["connection_lost_at"] is not None
+
+            started = time.time()
+            assert await driver.connect()
+            return driver.get_robot_instance() is robot, time.time() - started, driver.get_reconnect_stats(), robot
+        finally:
+            await driver.shutdown()
+
+    same_instance, reconnect_time, stats, robot = asyncio.run(run())
+    assert same_instance
+    assert reconnect_time < 0.5
+    assert stats["reconnects"] == 1 and stats["instance_reused"] == 1
+    assert stats["connection_generation"] == 2
+    assert stats["connection_mode"] == "async"
+    assert stats["last_time_to_ready"] is not None and stats["last_time_to_ready"] < 0.7
+    # Activation and homing were not repeated on reconnect
+    assert robot.get_simulation_report()["commands"]["ActivateRobot"] == 1
+    assert robot.get_simulation_report()["commands"]["Home"] == 1
@@ -0,0 +1,119 @@
+# Offline checks for the in-process Mecademic simulator (no hardware needed).
+# Runs with time_scale=0 so every wait completes instantly on the virtual clock.
+
+import asyncio
+
+import pytest
+
+from core.async_robot_wrapper import AsyncRobotWrapper, MovementCommand
+from drivers.meca_simulator import InterruptException, SimulatedMecaRobot
+
+SAFE_POINT = (135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308)
+FIRST_WAFER = (173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059)
+
+
+def _ready_robot(time_scale: float = 0.0) -> SimulatedMecaRobot:
+    robot = SimulatedMecaRobot(time_scale=time_scale)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+    return robot
+
+
+def _wafer_program(wafers: int):
+    """Pickup-like program: approach, descend, grip, lift and return for each wafer"""
+    commands = [MovementCommand(command_type="config", parameters={"config_type": "SetJointVel", "values": [35]})]
+    for i in range(wafers):
+        above = (FIRST_WAFER[0], FIRST_WAFER[1] - 2.7 * i, FIRST_WAFER[2] + 40.0) + FIRST_WAFER[3:]
+        wafer = (FIRST_WAFER[0], FIRST_WAFER[1] - 2.7 * i, FIRST_WAFER[2]) + FIRST_WAFER[3:]
+        for pose, kind in ((above, "MovePose"), (wafer, "MoveLin")):
+            commands.append(MovementCommand(
+                command_type=kind,
+                target_position=dict(zip(("x", "y", "z", "alpha", "beta", "gamma"), pose))
+            ))
+        commands.append(MovementCommand(command_type="GripperClose"))
+        commands.append(MovementCommand(command_type="Delay", parameters={"duration": 1.0}))
+        commands.append(MovementCommand(
+            command_type="MovePose",
+            target_position=dict(zip(("x", "y", "z", "alpha", "beta", "gamma"), SAFE_POINT))
+        ))
+        commands.append(MovementCommand(command_type="GripperOpen"))
+    return commands
+
+
+def test_motion_time_is_deterministic_and_blending_saves_time():
+    def run(blending: float) -> dict:
+        robot = _ready_robot()
+        robot.SetBlending(blending)
+        for _ in range(10):
+            robot.MovePose(*FIRST_WAFER)
+            robot.MovePose(*SAFE_POINT)
+        robot.WaitIdle(timeout=5)
+        return robot.get_simulation_report()
+
+    first, second = run(0), run(0)
+    assert first["virtual_time"] == second["virtual_time"]
+    assert first["motions_completed"] == 20
+
+    blended = run(100)
+    assert blended["blending_saved"] > 0
+    assert blended["virtual_time"] < first["virtual_time"]
+
+
+def test_collision_interrupts_wait_idle():
+    robot = _ready_robot()
+    robot.inject_fault("collision", after_motions=3)
+    for _ in range(5):
+        robot.MovePose(*FIRST_WAFER)
+        robot.MovePose(*SAFE_POINT)
+
+    with pytest.raises(InterruptException):
+        robot.WaitIdle(timeout=5)
+
+    status = robot.GetStatusRobot()
+    assert status.error_status
+    assert robot.get_simulation_report()["motions_completed"] == 3
+
+    robot.ResetError()
+    robot.MovePose(*SAFE_POINT)
+    robot.WaitIdle(timeout=5)
+
+
+def test_full_55_wafer_program_streams_through_wrapper(make_sim_driver):
+    robot = _ready_robot()
+    commands = _wafer_program(55)
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot), lookahead_window=8)
+        try:
+            return await wrapper.execute_program("sim_55", commands)
+        finally:
+            await wrapper.shutdown()
+
+    result = asyncio.run(run())
+    assert result.success, result.error
+    assert result.metadata["confirmed_index"] == len(commands)
+
+    report = robot.get_simulation_report()
+    assert report["motions_completed"] == 55 * 3
+    assert report["delay_time"] == pytest.approx(55.0)
+    # Robot time covers every move and every dwell
+    assert report["motion_time"] > 0
+    assert report["virtual_time"] >= report["motion_time"] + report["delay_time"]
+
+
+def test_streamed_program_fails_fast_on_injected_fault(make_sim_driver):
+    robot = _ready_robot()
+    robot.inject_fault("collision", after_motions=10)
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot), lookahead_window=8)
+        try:
+            return await wrapper.execute_program("sim_fault", _wafer_program(10))
+        finally:
+            await wrapper.shutdown()
+
+    result = asyncio.run(run())
+    assert not result.success
+    assert result.metadata["confirmed_index"] < len(_wafer_program(10))
@@ -0,0 +1,106 @@
+# Streamed programs against the simulator: the look-ahead window bounds how many
+# motion blocks are queued ahead of the robot, and the confirmed index only
+# advances past instructions whose checkpoint the robot reached.
+
+import asyncio
+
+import pytest
+
+from core.async_robot_wrapper import AsyncRobotWrapper, MovementCommand
+from drivers.meca_simulator import SimulatedMecaRobot
+
+SAFE_POINT = (135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308)
+FIRST_WAFER = (173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059)
+
+
+def _ready_robot() -> SimulatedMecaRobot:
+    robot = SimulatedMecaRobot(time_scale=0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+    return robot
+
+
+def _moves(count: int):
+    """Alternating moves, so instruction index i is the (i + 1)-th motion"""
+    return [
+        MovementCommand(
+            command_type="MovePose",
+            target_position=dict(zip(("x", "y", "z", "alpha", "beta", "gamma"), (FIRST_WAFER, SAFE_POINT)[i % 2]))
+        )
+        for i in range(count)
+    ]
+
+
+class _CheckpointCounter:
+    """Robot proxy that tracks how many checkpoints were set but not yet reached"""
+
+    def __init__(self, robot):
+        self._robot = robot
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def __getattr__(self, name):
+        return getattr(self._robot, name)
+
+    def SetCheckpoint(self, n):
+        checkpoint = self._robot.SetCheckpoint(n)
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        proxy = self
+
+        class _Handle:
+            def wait(self, timeout=None):
+                checkpoint.wait(timeout)
+                proxy.outstanding -= 1
+
+        return _Handle()
+
+
+@pytest.mark.parametrize("window", [1, 3, 8])
+def test_window_depth_never_exceeds_lookahead_window(make_sim_driver, window):
+    robot = _CheckpointCounter(_ready_robot())
+    commands = _moves(20)
+    confirmed = []
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot), lookahead_window=window)
+        try:
+            result = await wrapper.execute_program("window", commands, progress_callback=confirmed.append)
+            return result, (await wrapper.get_performance_stats())["streaming_stats"]
+        finally:
+            await wrapper.shutdown()
+
+    result, stats = asyncio.run(run())
+    assert result.success, result.error
+    assert robot.max_outstanding <= window
+    assert stats["max_queue_depth"] == robot.max_outstanding == window
+    assert stats["lookahead_window"] == window
+    assert result.metadata["confirmed_index"] == len(commands)
+    assert confirmed == sorted(confirmed) and confirmed[-1] == len(commands)
+
+
+def test_confirmed_index_lags_next_index_on_mid_program_fault(make_sim_driver):
+    window, completed = 4, 6
+    robot = _ready_robot()
+    robot.inject_fault("collision", after_motions=completed)
+    commands = _moves(20)
+    confirmed = []
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot), lookahead_window=window)
+        try:
+            return await wrapper.execute_program("fault", commands, progress_callback=confirmed.append)
+        finally:
+            await wrapper.shutdown()
+
+    result = asyncio.run(run())
+    metadata = result.metadata
+    assert not result.success
+    # The collision fires as the sixth motion ends and clears its checkpoint with the queue:
+    # nothing past the last reached checkpoint is confirmed, the rest of the window was sent but lost
+    assert metadata["confirmed_index"] == completed - 1
+    assert metadata["confirmed_index"] < metadata["next_index"] <= metadata["confirmed_index"] + window
+    assert metadata["failed_index"] == metadata["next_index"]
+    assert confirmed == sorted(confirmed) and confirmed[-1] == metadata["confirmed_index"]
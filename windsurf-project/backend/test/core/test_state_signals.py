@@ -0,0 +1,177 @@
+# Pause/resume and e-stop signalling through AtomicStateManager events, and
+# event-loop delays: waiters react immediately instead of at the next poll
+# or command boundary, and an e-stop (or cancelling the guarded caller) releases robot
+# waits on the command thread. emergency_stop_all must not deadlock on the state lock.
+
+import asyncio
+import time
+
+import pytest
+
+from core.async_robot_wrapper import AsyncRobotWrapper, MovementCommand
+from core.exceptions import EmergencyStopTriggered
+from core.state_manager import AtomicStateManager, RobotState, SystemState
+from drivers.meca_simulator import SimulatedMecaRobot
+
+
+async def _manager() -> AtomicStateManager:
+    manager = AtomicStateManager()
+    await manager.register_robot("meca", "meca", initial_state=RobotState.IDLE)
+    await manager.start_step("meca", 0, "pickup", "pickup")
+    return manager
+
+
+def test_resume_wakes_paused_sequence_immediately():
+    async def run():
+        manager = await _manager()
+        await manager.pause_step("meca")
+        assert await manager.is_step_paused("meca")
+
+        waiter = asyncio.ensure_future(manager.wait_until_resumed("meca"))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        started = time.monotonic()
+        await manager.resume_step("meca")
+        resumed = await waiter
+        return resumed, time.monotonic() - started
+
+    resumed, latency = asyncio.run(run())
+    assert resumed is True
+    assert latency < 0.05
+
+
+def test_emergency_stop_cancels_waits():
+    async def run():
+        manager = await _manager()
+        cancelled = asyncio.Event()
+
+        async def long_wait():
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        await manager.pause_step("meca")
+        paused_waiter = asyncio.ensure_future(manager.wait_until_resumed("meca"))
+        guarded = asyncio.ensure_future(manager.run_unless_emergency_stopped("meca", long_wait()))
+        await asyncio.sleep(0.01)
+
+        started = time.monotonic()
+        stopped = await manager.emergency_stop_all("test")
+        with pytest.raises(EmergencyStopTriggered):
+            await guarded
+        latency = time.monotonic() - started
+        await asyncio.sleep(0)
+        return stopped, await paused_waiter, cancelled.is_set(), latency, manager
+
+    stopped, resumed, cancelled, latency, manager = asyncio.run(run())
+    assert stopped == ["meca"]
+    assert resumed is False
+    assert cancelled
+    assert latency < 0.05
+    assert manager.is_emergency_stopped("meca")
+
+
+def test_delay_leaves_command_thread_free_and_stops_on_estop(make_sim_driver):
+    robot = SimulatedMecaRobot(time_scale=0)
+    robot.Connect("sim")
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            delay = asyncio.ensure_future(wrapper.execute_movement(
+                MovementCommand(command_type="Delay", parameters={"duration": 5.0})
+            ))
+            await asyncio.sleep(0.01)
+            # The command thread is not occupied by the delay
+            gripper = await asyncio.wait_for(
+                wrapper.execute_movement(MovementCommand(command_type="GripperOpen", tool_action="grip_open")),
+                timeout=1.0
+            )
+            started = time.monotonic()
+            await wrapper.execute_movement(MovementCommand(command_type="emergency_stop"))
+            delayed = await delay
+            return gripper, delayed, time.monotonic() - started, (await wrapper.get_performance_stats())["delay_stats"]
+        finally:
+            await wrapper.shutdown()
+
+    gripper, delayed, latency, stats = asyncio.run(run())
+    assert gripper.success
+    assert not delayed.success and "interrupted" in delayed.error
+    assert latency < 0.5
+    assert stats["thread_delays"] == 0 and stats["interrupted"] == 1
+
+
+def test_emergency_stop_releases_blocked_wait_idle(make_sim_driver):
+    robot = SimulatedMecaRobot(time_scale=1.0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+
+    async def run():
+        manager = await _manager()
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            robot.MovePose(173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059)
+            robot.MovePose(135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308)
+            guarded = asyncio.ensure_future(
+                manager.run_unless_emergency_stopped("meca", wrapper.wait_idle(timeout=30.0))
+            )
+            await asyncio.sleep(0.2)
+            await manager.emergency_stop_all("test")
+            with pytest.raises(EmergencyStopTriggered):
+                await guarded
+            # The WaitIdle has let go of the command thread before the e-stop is reported
+            return wrapper.io_channel.get_stats()["command"]["pending"]
+        finally:
+            await wrapper.shutdown()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_cancelled_caller_releases_blocked_wait_idle(make_sim_driver):
+    robot = SimulatedMecaRobot(time_scale=1.0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+
+    async def run():
+        manager = await _manager()
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            robot.MovePose(173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059)
+            robot.MovePose(135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308)
+            inner = asyncio.ensure_future(wrapper.wait_idle(timeout=30.0))
+            guarded = asyncio.ensure_future(manager.run_unless_emergency_stopped("meca", inner))
+            await asyncio.sleep(0.2)
+            # e.g. the operation timed out: the caller is cancelled, not the robot e-stopped
+            guarded.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await guarded
+            return inner.cancelled(), wrapper.io_channel.get_stats()["command"]["pending"]
+        finally:
+            await wrapper.shutdown()
+
+    assert asyncio.run(run()) == (True, 0)
+
+
+def test_emergency_stop_all_does_not_hold_the_state_lock_while_stopping():
+    async def run():
+        manager = AtomicStateManager()
+        await manager.register_robot("meca", "meca", initial_state=RobotState.IDLE)
+        await manager.register_robot("ot2", "ot2", initial_state=RobotState.BUSY)
+        await manager.register_robot("arduino", "arduino", initial_state=RobotState.EMERGENCY_STOP)
+        # Each robot transition takes the non-reentrant state lock itself
+        stopped = await asyncio.wait_for(manager.emergency_stop_all("test"), timeout=2.0)
+        states = {robot_id: (await manager.get_robot_state(robot_id)).current_state
+                  for robot_id in ("meca", "ot2", "arduino")}
+        return stopped, states, await manager.get_system_state(), manager.emergency_stop_event("ot2").is_set()
+
+    stopped, states, system_state, estop_set = asyncio.run(run())
+    assert stopped == ["meca", "ot2"]
+    assert set(states.values()) == {RobotState.EMERGENCY_STOP}
+    assert system_state == SystemState.ERROR and estop_set
@@ -0,0 +1,110 @@
+# Checkpoint journal: recovery after a crash mid-write, and the re-entry path
+# that brings the arm back onto a program before resuming it.
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core.exceptions import ValidationError
+from services.checkpoint_journal import CheckpointJournal, plan_reentry
+from services.meca_sequence_compiler import CompiledSequence, _ProgramBuilder
+
+SAFE_POINT = [135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308]
+FIRST_WAFER = [173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059]
+
+
+def _program(wafers: int) -> CompiledSequence:
+    b = _ProgramBuilder()
+    b.emit("SetBlending", [0])
+    b.emit("GripperOpen", [])
+    for i in range(wafers):
+        b.begin_wafer(i)
+        wafer = [FIRST_WAFER[0], FIRST_WAFER[1] - 2.7 * i] + FIRST_WAFER[2:]
+        above = wafer[:2] + [wafer[2] + 40.0] + wafer[3:]
+        b.emit("SetJointVel", [20], "align_speed")
+        b.emit("MovePose", above, "above_wafer")
+        b.emit("MoveLin", wafer, "wafer")
+        b.emit("GripperClose", [], "grip_wafer")
+        b.emit("SetJointVel", [35], "wafer_speed")
+        b.emit("MovePose", above, "lift")
+        b.emit("MovePose", SAFE_POINT, "safe_point")
+        b.emit("GripperOpen", [], "release")
+    return CompiledSequence(
+        operation="pickup", start=0, count=wafers, config_version="test",
+        instructions=tuple(b.instructions), wafer_offsets=tuple(b.wafer_offsets)
+    )
+
+
+def test_journal_recovers_last_confirmed_index(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    program = _program(3)
+    journal = CheckpointJournal(str(path), fsync_batch=4, fsync_interval=60.0)
+
+    journal.begin("done", program)
+    journal.confirm("done", 5)
+    journal.end("done", "completed", len(program))
+
+    journal.begin("crashed", program)
+    for index in (3, 3, 7, 6, 11):  # repeats and regressions are not journaled
+        journal.confirm("crashed", index)
+    # begin/end are synced immediately; the three confirms stay in the fsync batch
+    assert journal.get_stats()["fsyncs"] == 3 and journal.get_stats()["unsynced_records"] == 3
+    journal.close()
+
+    # Crash mid-write: the torn last record is ignored
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "confirm", "run": "crashed", "index": 15})[:20])
+
+    runs = CheckpointJournal(str(path)).resumable_runs()
+    assert [run.run_id for run in runs] == ["crashed"]
+    assert runs[0].confirmed_index == 11
+    assert runs[0].total_instructions == len(program)
+
+    # Compaction keeps only the unfinished run, with its progress
+    reopened = CheckpointJournal(str(path))
+    reopened.compact()
+    assert len(path.read_text().splitlines()) == 2
+    assert reopened.resumable_runs()[0].confirmed_index == 11
+
+
+def test_reentry_retracts_and_replays_the_approach():
+    program = _program(3)
+    grip = next(i for i in program.instructions if i.wafer_index == 1 and i.label == "grip_wafer")
+    wafer = next(i for i in program.instructions if i.wafer_index == 1 and i.label == "wafer")
+    above = next(i for i in program.instructions if i.wafer_index == 1 and i.label == "above_wafer")
+
+    # Stopped just before gripping: the arm should be down at the wafer
+    in_place = plan_reentry(program, grip.index, wafer.parameters)
+    assert in_place.already_in_place and in_place.expected_gripper == "open"
+
+    # After a restart the arm was jogged to one side, 10 mm above the wafer
+    moved = list(wafer.parameters)
+    moved[0] += 30.0
+    moved[2] += 10.0
+    plan = plan_reentry(program, grip.index, moved)
+
+    kinds = [(i.command_type, i.label) for i in plan.instructions]
+    assert kinds[-3:] == [
+        ("MoveLin", "reentry_retract"), ("MovePose", "reentry_above_wafer"), ("MoveLin", "reentry_wafer")
+    ]
+    retract = plan.instructions[-3].parameters
+    assert retract[:2] == tuple(moved[:2]) and retract[2] == above.parameters[2]
+    assert plan.approach_index == above.index
+    assert ("SetJointVel", (20,)) in [(i.command_type, i.parameters) for i in plan.instructions]
+
+    with pytest.raises(ValidationError):
+        plan_reentry(program, grip.index, None)
+
+
+def test_new_run_cannot_start_mid_program(make_meca_service, tmp_path):
+    async def run():
+        service = await make_meca_service(SimpleNamespace())
+        await service.execute_compiled_sequence("pickup", 0, 2, start_instruction=12)
+
+    # Without a journaled run there is no re-entry plan or gripper check to rely on
+    with pytest.raises(ValidationError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.context["field"] == "start_instruction"
+    assert not CheckpointJournal(tmp_path / "checkpoints.jsonl").resumable_runs()
@@ -0,0 +1,108 @@
+# Batched fast path of MecaService._execute_movement_command: commands of a
+# running sequence skip validation and reuse their built MovementCommand, and
+# the e-stop check still applies.
+#
+# The overhead budget benchmark only runs with RUN_BENCHMARKS=1.
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from core.async_robot_wrapper import CommandResult
+from core.state_manager import RobotState
+
+BENCH_ITERATIONS = 5000
+
+benchmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run timing benchmarks")
+
+
+class _RecordingWrapper:
+    def __init__(self):
+        self.commands = []
+
+    async def execute_movement(self, command):
+        self.commands.append(command)
+        return CommandResult(command_id="test", success=True)
+
+
+def _program_commands(service):
+    program = service.compile_sequence("pickup", 0, 2)
+    return [(instruction.command_type, list(instruction.parameters)) for instruction in program.instructions]
+
+
+def test_sequence_commands_skip_validation_and_reuse_built_commands(make_meca_service):
+    async def run():
+        wrapper = _RecordingWrapper()
+        service = await make_meca_service(wrapper)
+        validated = []
+        validate = service._validate_robot_parameters
+        service._validate_robot_parameters = lambda command_type, parameters: (
+            validated.append(command_type) or validate(command_type, parameters)
+        )
+        commands = _program_commands(service)
+
+        async def replay_twice():
+            validated.clear()  # compiling the sequence validated every command once
+            for _ in range(2):
+                for command_type, parameters in commands:
+                    await service._execute_movement_command(command_type, parameters, confirm=False)
+
+        await service._run_sequence("pickup", 0, 2, replay_twice)
+        # Outside a sequence the full path runs again
+        await service._execute_movement_command("GripperOpen", [])
+        return commands, validated, wrapper.commands, service.get_command_overhead_stats()
+
+    commands, validated, sent, stats = asyncio.run(run())
+    assert validated == ["GripperOpen"]
+    assert stats["fast_path"] == 2 * len(commands) and stats["full_path"] == 1
+    first, second = sent[:len(commands)], sent[len(commands):2 * len(commands)]
+    assert len(second) == len(commands) and all(a is b for a, b in zip(first, second))
+
+
+def test_fast_path_still_honours_emergency_stop(make_meca_service):
+    async def run():
+        wrapper = _RecordingWrapper()
+        service = await make_meca_service(wrapper)
+        commands = _program_commands(service)
+
+        async def replay():
+            await service._execute_movement_command(*commands[0])
+            await service.state_manager.update_robot_state("meca", RobotState.EMERGENCY_STOP)
+            await service._execute_movement_command(*commands[1])
+
+        with pytest.raises(RuntimeError):
+            await service._run_sequence("pickup", 0, 2, replay)
+        return wrapper.commands, service.get_command_overhead_stats()
+
+    sent, stats = asyncio.run(run())
+    assert len(sent) == 1 and stats["fast_path"] == 1
+
+
+@benchmark
+def test_fast_path_overhead_within_budget(make_meca_service):
+    async def run():
+        service = await make_meca_service(_RecordingWrapper())
+        commands = _program_commands(service)
+
+        async def bench():
+            started = time.perf_counter()
+            for i in range(BENCH_ITERATIONS):
+                command_type, parameters = commands[i % len(commands)]
+                await service._execute_movement_command(command_type, parameters, confirm=False)
+            return (time.perf_counter() - started) / BENCH_ITERATIONS
+
+        full_path = await bench()
+        service._command_overhead.clear()
+        fast_path = await service._run_sequence("pickup", 0, 2, bench)
+        return full_path, fast_path, service.get_command_overhead_stats()
+
+    full_path, fast_path, stats = asyncio.run(run())
+    report = (
+        f"per command: full path {full_path * 1e6:.1f}us, fast path {fast_path * 1e6:.1f}us; "
+        f"fast-path overhead p50 {stats['p50'] * 1e6:.1f}us, p99 {stats['p99'] * 1e6:.1f}us "
+        f"(budget {stats['budget'] * 1e6:.0f}us)"
+    )
+    assert stats["within_budget"], report
+    assert fast_path <= full_path, report
@@ -0,0 +1,116 @@
+# Redundant config elimination: the compiler peephole pass and the wrapper's
+# runtime tracking of the robot's motion parameters.
+
+import asyncio
+
+from core.async_robot_wrapper import AsyncRobotWrapper, MovementCommand
+from drivers.meca_simulator import SimulatedMecaRobot
+from services.meca_sequence_compiler import CompiledSequence, _ProgramBuilder, eliminate_redundant_config
+
+POSE = [135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308]
+
+
+def _effective_settings(program: CompiledSequence):
+    """(wafer, label) -> settings active when each move runs"""
+    settings, result = {}, []
+    for instruction in program.instructions:
+        if instruction.command_type.startswith("Set"):
+            settings[instruction.command_type] = instruction.parameters
+        elif instruction.command_type == "MovePose":
+            result.append((instruction.wafer_index, instruction.label, dict(settings)))
+    return result
+
+
+def test_peephole_removes_noops_and_dead_stores():
+    b = _ProgramBuilder()
+    b.emit("SetBlending", [0])
+    for i in range(3):
+        b.begin_wafer(i)
+        b.emit("SetJointVel", [20])           # no-op after the first wafer
+        b.emit("SetBlending", [0])            # no-op: wafer ends with 100, but that write is dead
+        b.emit("MovePose", POSE, "approach")
+        b.emit("SetJointVel", [35])
+        b.emit("MovePose", POSE, "leave")
+        b.emit("SetJointVel", [20])
+        b.emit("SetBlending", [100])          # dead: overwritten by the next wafer before any move
+    program = CompiledSequence(
+        operation="carousel", start=0, count=3, config_version="test",
+        instructions=tuple(b.instructions), wafer_offsets=tuple(b.wafer_offsets)
+    )
+
+    optimized = eliminate_redundant_config(program)
+
+    assert optimized.eliminated_config == len(program) - len(optimized)
+    assert optimized.eliminated_config >= 6
+    assert _effective_settings(optimized) == _effective_settings(program)
+    for index, offset in optimized.wafer_offsets:
+        assert optimized.instructions[offset].wafer_index == index
+
+    # Wafer 3 no longer sets its own blending, so resuming there must restore it
+    resume = optimized.first_instruction_for_wafer(2)
+    first_move = next(i.index for i in optimized.instructions[resume:] if i.command_type == "MovePose")
+    assert not any(i.command_type == "SetBlending" for i in optimized.instructions[resume:first_move])
+    restored = {i.command_type: i.parameters for i in optimized.settings_before(resume)}
+    assert restored["SetBlending"] == (0,)
+
+
+def test_wrapper_skips_config_already_active(make_sim_driver):
+    robot = SimulatedMecaRobot(time_scale=0)
+    robot.Connect("sim")
+
+    def config(config_type, *values):
+        return MovementCommand(command_type="config", parameters={"config_type": config_type, "values": list(values)})
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            results = [
+                await wrapper.execute_movement(config("SetJointVel", 20)),
+                await wrapper.execute_movement(config("SetJointVel", 20)),
+                await wrapper.execute_movement(config("SetJointVel", 35)),
+            ]
+            wrapper.invalidate_motion_state()
+            results.append(await wrapper.execute_movement(config("SetJointVel", 35)))
+            return results, (await wrapper.get_performance_stats())["config_stats"]
+        finally:
+            await wrapper.shutdown()
+
+    results, stats = asyncio.run(run())
+    assert all(result.success for result in results)
+    assert [bool(result.metadata.get("eliminated")) for result in results] == [False, True, False, False]
+    assert stats["eliminated"] == 1 and stats["sent"] == 3
+    assert robot.get_simulation_report()["commands"]["SetJointVel"] == 3
+
+
+def test_clear_motion_and_pause_forget_tracked_parameters(make_mecademic_driver):
+    def joint_vel(value):
+        return MovementCommand(command_type="config", parameters={"config_type": "SetJointVel", "values": [value]})
+
+    async def run():
+        driver = make_mecademic_driver()
+        wrapper = AsyncRobotWrapper("meca", driver)
+        try:
+            assert await driver.connect()
+            robot = driver.get_robot_instance()
+            sent = []
+
+            async def send_twice():
+                for _ in range(2):
+                    result = await wrapper.execute_movement(joint_vel(20))
+                    sent.append(not result.metadata.get("eliminated"))
+
+            await send_twice()
+            # ClearMotion discards Set* commands still queued behind the motions
+            await driver.clear_motion()
+            await send_twice()
+            # A pause edge (e.g. a pause fault before a clear) also forgets them
+            robot.PauseMotion()
+            await driver.status_feed.wait_for_fault(timeout=2.0)
+            await asyncio.sleep(0)
+            await send_twice()
+            return sent
+        finally:
+            await wrapper.shutdown()
+            await driver.shutdown()
+
+    assert asyncio.run(run()) == [True, False, True, False, True, False]
@@ -0,0 +1,115 @@
+# Confirmed actions: a Delay after a gripper command ends when the robot confirms
+# the gripper move, never later than the fixed delay, and process waits sent with
+# confirm=False keep their full time.
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from core.async_robot_wrapper import AsyncRobotWrapper
+from drivers.meca_simulator import GRIPPER_MOVE_TIME, SimulatedMecaRobot
+
+SAFE_POINT = (135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308)
+FIRST_WAFER = (173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059)
+
+
+def _ready_robot() -> SimulatedMecaRobot:
+    robot = SimulatedMecaRobot(time_scale=1.0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+    return robot
+
+
+class _RtGripperStateOnly:
+    """Robot without WaitGripperMoveCompletion whose real-time gripper state, like the
+    hardware's, still reports the previous target as reached until a queued move runs"""
+
+    def __init__(self, robot):
+        self._robot = robot
+
+    def WaitIdle(self, timeout=None):
+        self._robot.WaitIdle(timeout)
+
+    def GetRtGripperState(self):
+        return SimpleNamespace(target_pos_reached=True)
+
+
+def test_gripper_wait_ends_on_confirmation(make_sim_driver):
+    robot = _ready_robot()
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            robot.GripperClose()
+            return await wrapper.confirm_action("gripper", timeout=2.0), robot.GetRtGripperState()
+        finally:
+            await wrapper.shutdown()
+
+    outcome, gripper = asyncio.run(run())
+    assert outcome["confirmed"] and gripper.closed and gripper.target_pos_reached
+    assert GRIPPER_MOVE_TIME * 0.5 < outcome["elapsed"] < 2.0
+
+
+def test_gripper_wait_times_out_at_the_fixed_delay(make_sim_driver):
+    robot = _ready_robot()
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            robot.MovePose(*FIRST_WAFER)
+            robot.GripperClose()
+            robot.inject_fault("pause")  # the gripper command never runs
+            return await wrapper.confirm_action("gripper", timeout=0.3), robot.GetRtGripperState()
+        finally:
+            await wrapper.shutdown()
+
+    outcome, gripper = asyncio.run(run())
+    assert not outcome["confirmed"] and not gripper.closed
+    assert 0.3 <= outcome["elapsed"] < 0.3 + 0.5
+
+
+def test_rt_gripper_state_is_read_only_after_the_command_is_dequeued(make_sim_driver):
+    robot = _ready_robot()
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(_RtGripperStateOnly(robot)))
+        try:
+            robot.MovePose(*SAFE_POINT)
+            robot.GripperClose()
+            outcome = await wrapper.confirm_action("gripper", timeout=10.0)
+            return outcome, robot.GetRtGripperState()
+        finally:
+            await wrapper.shutdown()
+
+    outcome, gripper = asyncio.run(run())
+    # The stale "target reached" did not confirm the close before it ran
+    assert outcome["confirmed"] and gripper.closed
+
+
+def test_process_wait_with_confirm_false_keeps_its_full_time(make_sim_driver, make_meca_service):
+    robot = _ready_robot()
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        service = await make_meca_service(wrapper)
+        service.set_confirmed_actions(True, reset_report=True)
+        try:
+            service.confirmed_actions.begin_wafer("pickup", 1)
+            await service._execute_movement_command("GripperClose", [])
+            started = time.monotonic()
+            await service._execute_movement_command("Delay", [0.5], confirm=False)
+            process_wait = time.monotonic() - started
+
+            await service._execute_movement_command("GripperOpen", [])
+            await service._execute_movement_command("Delay", [2.0])
+            return process_wait, service.get_confirmed_actions_report()["totals"]
+        finally:
+            await wrapper.shutdown()
+
+    process_wait, totals = asyncio.run(run())
+    assert process_wait >= 0.5
+    # Only the Delay after GripperOpen was confirmed; the process wait was not replaced
+    assert totals["waits"] == 1 and totals["confirmed"] == 1
+    assert totals["fixed_delay_time"] == 2.0 and totals["seconds_saved"] > 0
@@ -0,0 +1,113 @@
+# Cycle-time estimator checks: predictions must agree with the simulator's
+# motion model, and calibration must scale only the motion part.
+
+from types import SimpleNamespace
+
+import pytest
+
+from drivers.meca_simulator import SimulatedMecaRobot
+from services.cycle_time_estimator import CycleTimeEstimator, estimate_program
+from services.meca_sequence_compiler import CompiledSequence, _ProgramBuilder
+
+SAFE_POINT = [135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308]
+FIRST_WAFER = [173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059]
+PARAMS = {"joint_vel": 35.0, "joint_acc": 50.0, "cart_lin_vel": 150.0, "cart_acc": 50.0, "blending": 0.0}
+
+
+def _program(wafers: int) -> CompiledSequence:
+    b = _ProgramBuilder()
+    b.emit("SetJointAcc", [50])
+    b.emit("SetBlending", [0])
+    b.emit("GripperOpen", [])
+    b.emit("Delay", [1])
+    for i in range(wafers):
+        b.begin_wafer(i)
+        wafer = [FIRST_WAFER[0], FIRST_WAFER[1] - 2.7 * i] + FIRST_WAFER[2:]
+        above = wafer[:2] + [wafer[2] + 40.0] + wafer[3:]
+        b.emit("SetJointVel", [20], "align_speed")
+        b.emit("MovePose", above, "above_wafer")
+        b.emit("MoveLin", wafer, "wafer")
+        b.emit("GripperClose", [], "grip_wafer")
+        b.emit("Delay", [0.5])
+        b.emit("SetJointVel", [35], "wafer_speed")
+        b.emit("SetBlending", [100])
+        b.emit("MovePose", above, "lift")
+        b.emit("MovePose", SAFE_POINT, "safe_point")
+        b.emit("SetBlending", [0])
+        b.emit("WaitIdle", [60.0], "wafer_complete")
+    return CompiledSequence(
+        operation="pickup", start=0, count=wafers, config_version="test",
+        instructions=tuple(b.instructions), wafer_offsets=tuple(b.wafer_offsets)
+    )
+
+
+def _simulate(program: CompiledSequence) -> float:
+    robot = SimulatedMecaRobot(time_scale=0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+    robot.SetJointVel(PARAMS["joint_vel"])
+    started = robot.get_simulation_report()["virtual_time"]
+    for instruction in program.instructions:
+        if instruction.command_type == "WaitIdle":
+            robot.WaitIdle(timeout=instruction.parameters[0])
+        else:
+            getattr(robot, instruction.command_type)(*instruction.parameters)
+    robot.WaitIdle(timeout=60)
+    return robot.get_simulation_report()["virtual_time"] - started
+
+
+def test_prediction_matches_simulator():
+    program = _program(5)
+    estimate = estimate_program(program, SAFE_POINT, PARAMS)
+
+    assert estimate.predicted == pytest.approx(_simulate(program), rel=1e-6)
+    assert len(estimate.wafers) == 5
+    assert estimate.preamble.delay_time == pytest.approx(1.0)
+    assert sum(w.delay_time for w in estimate.wafers) == pytest.approx(2.5)
+    # The unblended approach into the wafer is reported as a blending opportunity
+    unblended = {hint["label"] for hint in estimate.hints()["unblended_moves"]}
+    assert "wafer" in unblended and "lift" not in unblended
+
+
+def test_overrides_and_wafer_speeds():
+    program = _program(3)
+    base = estimate_program(program, SAFE_POINT, PARAMS)
+    faster = estimate_program(program, SAFE_POINT, PARAMS, overrides={"align_speed": 60})
+    assert faster.motion_time < base.motion_time
+    assert faster.fixed_time == pytest.approx(base.fixed_time)
+
+    # A per-wafer override only changes that wafer
+    slow_second = estimate_program(
+        program, SAFE_POINT, PARAMS,
+        wafer_speeds=lambda i: {"wafer_speed": 10.0} if i == 1 else {}
+    )
+    assert slow_second.wafers[0].predicted == pytest.approx(base.wafers[0].predicted)
+    assert slow_second.wafers[1].predicted > base.wafers[1].predicted
+
+
+def test_calibration_scales_motion_only():
+    program = _program(4)
+    service = SimpleNamespace(
+        SAFE_POINT=SAFE_POINT,
+        SPEED=35.0,
+        ACC=50.0,
+        movement_params={},
+        wafer_config_manager=SimpleNamespace(
+            get_wafer_config=lambda i: SimpleNamespace(movement_speeds={})
+        ),
+        sequence_compiler=SimpleNamespace(compile=lambda op, start, count: program),
+        sequence_tracer=SimpleNamespace(spans=lambda kind=None: [])
+    )
+    estimator = CycleTimeEstimator(service)
+    raw = estimator.estimate("pickup", 0, 4)
+    assert raw.motion_scale == 1.0
+
+    # Real robot took 50% longer on motion; delays and gripper time are exact
+    measured = raw.motion_time * 1.5 + raw.fixed_time
+    estimator.calibrate("pickup", 0, 4, measured)
+    calibrated = estimator.estimate("pickup", 0, 4)
+    assert calibrated.motion_scale == pytest.approx(1.5)
+    assert calibrated.calibrated == pytest.approx(measured)
+    assert estimator.get_calibration()["drop"]["samples"] == 0
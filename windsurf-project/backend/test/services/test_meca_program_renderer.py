@@ -0,0 +1,112 @@
+# Robot-side program upload: a compiled sequence rendered in the legacy text
+# program format, stored on the (simulated) robot and followed by checkpoint.
+
+import asyncio
+
+from core.async_robot_wrapper import AsyncRobotWrapper, MovementCommand
+from drivers.meca_simulator import SimulatedMecaRobot
+from services.meca_program_renderer import render_program
+from services.meca_sequence_compiler import CompiledSequence, _ProgramBuilder
+
+SAFE_POINT = [135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308]
+FIRST_WAFER = [173.562, -175.178, 27.9714, 109.5547, 0.2877, -90.059]
+
+
+def _program(wafers: int) -> CompiledSequence:
+    b = _ProgramBuilder()
+    b.emit("SetBlending", [0])
+    b.emit("GripperOpen", [])
+    for i in range(wafers):
+        b.begin_wafer(i)
+        wafer = [FIRST_WAFER[0], FIRST_WAFER[1] - 2.7 * i] + FIRST_WAFER[2:]
+        b.emit("SetJointVel", [20 + 15 * (i % 2)], "speed")
+        b.emit("MovePose", wafer, "wafer")
+        b.emit("GripperClose", [], "grip_wafer")
+        b.emit("Delay", [0.5])
+        b.emit("MovePose", SAFE_POINT, "safe_point")
+        b.emit("GripperOpen", [], "release")
+        b.emit("WaitIdle", [60.0], "wafer_complete")
+    return CompiledSequence(
+        operation="carousel", start=0, count=wafers, config_version="test",
+        instructions=tuple(b.instructions), wafer_offsets=tuple(b.wafer_offsets)
+    )
+
+
+def test_rendered_program_matches_legacy_format():
+    program = _program(2)
+    rendered = render_program(program)
+
+    assert "//Pick Wafer 2 from Baking Tray to Carousel" in rendered.lines
+    assert "MovePose(173.562,-177.878,27.9714,109.5547,0.2877,-90.059) //wafer" in rendered.lines
+    assert not any(line.startswith("WaitIdle") for line in rendered.lines)
+    assert all("//" not in command for command in rendered.commands)
+    # One checkpoint per motion-queue instruction, confirming the instruction after it
+    assert len(rendered.checkpoints) == 1 + 2 * 5
+    assert rendered.checkpoints[-1][1] == program.instructions[-1].index
+
+    # Resuming restores the settings the skipped instructions would have made
+    resume_at = program.first_instruction_for_wafer(1) + 1
+    resumed = render_program(program, resume_at)
+    assert resumed.commands[:2] == ["SetBlending(0)", "SetJointVel(35)"]
+    assert resumed.checkpoints[0][1] > resume_at
+
+
+def test_uploaded_program_runs_on_robot_and_reports_progress(make_sim_driver):
+    program = _program(3)
+    rendered = render_program(program)
+    robot = SimulatedMecaRobot(time_scale=0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+    confirmed = []
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            return await wrapper.execute_uploaded_program(
+                program_id="upload", program_number=rendered.number, program_lines=rendered.commands,
+                checkpoints=list(rendered.checkpoints), start_index=0, total_instructions=len(program),
+                progress_callback=confirmed.append
+            )
+        finally:
+            await wrapper.shutdown()
+
+    result = asyncio.run(run())
+
+    assert result.success, result.error
+    assert result.metadata["confirmed_index"] == len(program)
+    assert confirmed == sorted(confirmed) and len(confirmed) == len(rendered.checkpoints) + 1
+    # The whole program was stored and started once; no per-move commands from the host
+    assert len(robot.get_program(rendered.number)) == len(rendered.commands)
+    report = robot.get_simulation_report()
+    assert report["commands"]["StartOfflineProgram"] == 1
+    assert report["commands"]["MovePose"] == 6
+
+
+def test_live_config_after_upload_is_not_skipped(make_sim_driver):
+    program = _program(3)  # ends at SetJointVel 20
+    rendered = render_program(program)
+    robot = SimulatedMecaRobot(time_scale=0)
+    robot.Connect("sim")
+    robot.ActivateRobot()
+    robot.Home()
+    robot.WaitHomed(timeout=5)
+    joint_vel = MovementCommand(command_type="config", parameters={"config_type": "SetJointVel", "values": [35]})
+
+    async def run():
+        wrapper = AsyncRobotWrapper("meca", make_sim_driver(robot))
+        try:
+            await wrapper.execute_movement(joint_vel)
+            uploaded = await wrapper.execute_uploaded_program(
+                program_id="upload", program_number=rendered.number, program_lines=rendered.commands,
+                checkpoints=list(rendered.checkpoints), start_index=0, total_instructions=len(program)
+            )
+            # The robot-side program changed the speed: the live value must be sent again
+            return uploaded, await wrapper.execute_movement(joint_vel)
+        finally:
+            await wrapper.shutdown()
+
+    uploaded, live = asyncio.run(run())
+    assert uploaded.success, uploaded.error
+    assert not live.metadata.get("eliminated")
@@ -0,0 +1,74 @@
+# apply_motion_profile must only change the settings a profile asks for and
+# never make a profiled program slower under the same motion model.
+
+from services.cycle_time_estimator import estimate_program
+from services.meca_sequence_compiler import CompiledSequence, _ProgramBuilder, apply_motion_profile
+
+SAFE_POINT = [135.0, -17.6177, 160.0, 123.2804, 40.9554, -101.3308]
+TRAY = [-141.6702, -206.8321, 50.0, -178.6427, -69.0899, 15.1903]
+CAROUSEL = [133.8, -247.95, 101.9, 90, 0, -90]
+PARAMS = {"joint_vel": 35.0, "joint_acc": 50.0, "cart_lin_vel": 150.0, "cart_acc": 50.0, "blending": 0.0}
+
+
+def _program(wafers: int) -> CompiledSequence:
+    b = _ProgramBuilder()
+    b.emit("SetConf", [1, 1, -1])
+    b.emit("SetBlending", [0])
+    for i in range(wafers):
+        b.begin_wafer(i)
+        b.emit("SetJointVel", [35], "speed")
+        b.emit("MovePose", TRAY, "above_baking")
+        b.emit("GripperClose", [], "grip_wafer")
+        b.emit("SetJointVel", [15], "entry_speed")
+        b.emit("MovePose", CAROUSEL, "carousel")
+        b.emit("MoveGripper", [2.9], "release_wafer")
+        b.emit("SetJointVel", [50], "empty_speed")
+        b.emit("MovePose", SAFE_POINT, "carousel_safe")
+        b.emit("MovePose", TRAY, "carousel_safe_2")
+        b.emit("SetBlending", [100])
+    return CompiledSequence(
+        operation="carousel", start=0, count=wafers, config_version="test",
+        instructions=tuple(b.instructions), wafer_offsets=tuple(b.wafer_offsets)
+    )
+
+
+def _settings_per_move(program: CompiledSequence):
+    vel, blend, result = None, None, []
+    for instruction in program.instructions:
+        if instruction.command_type == "SetJointVel":
+            vel = instruction.parameters[0]
+        elif instruction.command_type == "SetBlending":
+            blend = instruction.parameters[0]
+        elif instruction.command_type == "MovePose":
+            result.append((instruction.wafer_index, instruction.label, vel, blend))
+    return result
+
+
+def _final_settings(program: CompiledSequence):
+    settings = {}
+    for instruction in program.instructions:
+        if instruction.command_type in ("SetJointVel", "SetBlending"):
+            settings[instruction.command_type] = instruction.parameters[0]
+    return settings
+
+
+def test_profile_changes_only_listed_moves():
+    program = _program(3)
+    profile = {"moves": {"carousel_safe": {"joint_vel": 60, "blending": 100}}}
+    profiled = apply_motion_profile(program, profile)
+
+    for before, after in zip(_settings_per_move(program), _settings_per_move(profiled)):
+        if before[1] == "carousel_safe":
+            assert after[2:] == (60, 100)
+        else:
+            assert after == before
+
+    # Offsets still point at each wafer's first instruction and the final settings are restored
+    assert [index for index, _ in profiled.wafer_offsets] == [0, 1, 2]
+    for index, offset in profiled.wafer_offsets:
+        assert profiled.instructions[offset].wafer_index == index
+    assert _final_settings(profiled) == _final_settings(program)
+
+    before = estimate_program(program, SAFE_POINT, PARAMS)
+    after = estimate_program(profiled, SAFE_POINT, PARAMS)
+    assert after.predicted < before.predicted
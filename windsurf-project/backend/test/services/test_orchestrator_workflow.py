@@ -0,0 +1,154 @@
+# Dependency-based workflows in RobotOrchestrator: step ordering across robots,
+# shared resource locking, graph validation and abort on a failed step.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.exceptions import HardwareError, ValidationError
+from core.resource_lock import ResourceLockManager
+from core.state_manager import AtomicStateManager
+from services.base import ServiceResult
+from services.orchestrator import RobotOrchestrator
+
+
+class _FakeService:
+    """Robot service whose operations log start/end events into a shared list"""
+
+    def __init__(self, robot_id, events, fail=()):
+        self.robot_id = robot_id
+        self.events = events
+        self.fail = set(fail)
+        self.cancelled = []
+
+    async def _operation(self, name, duration):
+        self.events.append(("start", name))
+        try:
+            await asyncio.sleep(duration)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        self.events.append(("end", name))
+        if name in self.fail:
+            return ServiceResult.error_result(f"{name} failed")
+        return ServiceResult.success_result(name)
+
+    async def work(self, name, duration=0.01):
+        return await self._operation(name, duration)
+
+
+def _orchestrator(*services):
+    orchestrator = RobotOrchestrator(
+        SimpleNamespace(), AtomicStateManager(), ResourceLockManager(), SimpleNamespace()
+    )
+    for service in services:
+        orchestrator.register_robot_service(service.robot_id, service)
+    return orchestrator
+
+
+def _op(step_id, robot_id, duration=0.01, depends_on=(), resources=()):
+    return {
+        "id": step_id, "robot_id": robot_id, "operation_type": "work",
+        "parameters": {"name": step_id, "duration": duration},
+        "depends_on": list(depends_on), "resources": list(resources)
+    }
+
+
+def _intervals(events):
+    """step id -> (start position, end position) in the event log"""
+    positions = {}
+    for position, (kind, name) in enumerate(events):
+        positions.setdefault(name, [None, None])[0 if kind == "start" else 1] = position
+    return {name: tuple(span) for name, span in positions.items()}
+
+
+def _overlap(a, b):
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def test_steps_follow_dependencies_and_overlap_across_robots():
+    events = []
+    meca, ot2 = _FakeService("meca", events), _FakeService("ot2", events)
+    operations = [
+        _op("ot2_0", "ot2", 0.05),
+        _op("ot2_1", "ot2", 0.05),
+        _op("pickup_0", "meca", 0.05, depends_on=["ot2_0"]),
+        _op("drop_0", "meca", 0.05, depends_on=["pickup_0"]),
+        _op("pickup_1", "meca", 0.05, depends_on=["ot2_1", "drop_0"]),
+    ]
+
+    async def run():
+        orchestrator = _orchestrator(meca, ot2)
+        results = await orchestrator._execute_dependency_workflow(operations)
+        return results, orchestrator.get_last_workflow_schedule()
+
+    results, schedule = asyncio.run(run())
+    spans = _intervals(events)
+    assert [result.data for result in results] == [op["id"] for op in operations]
+    for op in operations:
+        for dependency in op["depends_on"]:
+            assert spans[dependency][1] < spans[op["id"]][0]
+    # One step at a time per robot, but the OT2 runs batch 1 while the Meca works on batch 0
+    assert not _overlap(spans["pickup_0"], spans["drop_0"])
+    assert _overlap(spans["ot2_1"], spans["pickup_0"])
+    assert schedule["completed_steps"] == len(operations)
+
+
+def test_steps_sharing_a_resource_never_overlap():
+    events = []
+    meca, ot2 = _FakeService("meca", events), _FakeService("ot2", events)
+    operations = [
+        _op("meca_spreader", "meca", 0.05, resources=["spreader"]),
+        _op("ot2_spreader", "ot2", 0.05, resources=["spreader"]),
+        _op("ot2_free", "ot2", 0.05, depends_on=["ot2_spreader"]),
+        _op("meca_free", "meca", 0.05, depends_on=["meca_spreader"]),
+    ]
+
+    async def run():
+        orchestrator = _orchestrator(meca, ot2)
+        await orchestrator._execute_dependency_workflow(operations)
+        return orchestrator.lock_manager
+
+    lock_manager = asyncio.run(run())
+    spans = _intervals(events)
+    assert not _overlap(spans["meca_spreader"], spans["ot2_spreader"])
+    assert not lock_manager._locks
+
+
+@pytest.mark.parametrize("operations, message", [
+    ([_op("a", "meca", depends_on=["b"]), _op("b", "meca", depends_on=["a"])], "cycle"),
+    ([_op("a", "meca", depends_on=["missing"])], "unknown"),
+    ([_op("a", "meca"), _op("a", "meca")], "Duplicate"),
+    ([_op("a", "arduino")], "not found"),
+])
+def test_invalid_graphs_are_rejected_before_any_step_runs(operations, message):
+    events = []
+    orchestrator = _orchestrator(_FakeService("meca", events))
+
+    with pytest.raises(ValidationError, match=message):
+        asyncio.run(orchestrator._execute_dependency_workflow(operations))
+    assert events == []
+
+
+def test_failed_step_aborts_the_workflow():
+    events = []
+    meca = _FakeService("meca", events, fail=["pickup_0"])
+    ot2 = _FakeService("ot2", events)
+    operations = [
+        _op("pickup_0", "meca", 0.01),
+        _op("ot2_0", "ot2", 5.0),
+        _op("drop_0", "meca", 0.01, depends_on=["pickup_0"]),
+    ]
+
+    async def run():
+        orchestrator = _orchestrator(meca, ot2)
+        with pytest.raises(HardwareError, match="pickup_0"):
+            await orchestrator._execute_dependency_workflow(operations)
+        return orchestrator.get_last_workflow_schedule()
+
+    schedule = asyncio.run(run())
+    # The dependent step never started and the step still running elsewhere was cancelled
+    assert ("start", "drop_0") not in events
+    assert ot2.cancelled == ["ot2_0"]
+    assert schedule["completed_steps"] == 0
@@ -0,0 +1,66 @@
+# Precomputed pose table: lookups match the per-call pose computation, bad
+# wafer indices are rejected, and the table follows sequence config versions.
+
+import asyncio
+import copy
+from types import SimpleNamespace
+
+import pytest
+
+from core.exceptions import ValidationError
+from services.position_table import POSE_NAMES
+
+OPERATIONS = ("pickup", "drop", "carousel", "empty_carousel")
+
+
+def _service(make_meca_service):
+    return asyncio.run(make_meca_service(SimpleNamespace()))
+
+
+def test_table_matches_per_call_computation_for_every_wafer(make_meca_service):
+    service = _service(make_meca_service)
+    table = service.get_position_table()
+
+    assert table.total_wafers == 55
+    for operation in OPERATIONS:
+        for wafer_index in range(55):
+            expected = service._compute_intermediate_positions(wafer_index, operation)
+            assert list(expected) == list(POSE_NAMES[operation])
+            assert service.calculate_intermediate_positions(wafer_index, operation) == expected
+            for name, pose in expected.items():
+                assert table.pose(operation, wafer_index, name) == pose
+
+
+def test_lookups_return_copies(make_meca_service):
+    service = _service(make_meca_service)
+    positions = service.calculate_intermediate_positions(0, "pickup")
+    positions["spreader"][2] += 100.0
+
+    assert service.calculate_intermediate_positions(0, "pickup") != positions
+
+
+@pytest.mark.parametrize("wafer_index", [-1, 55])
+def test_out_of_range_wafer_is_rejected(make_meca_service, wafer_index):
+    service = _service(make_meca_service)
+
+    with pytest.raises(ValidationError, match="out of range") as error:
+        service.calculate_intermediate_positions(wafer_index, "drop")
+    assert error.value.context["field"] == "wafer_index"
+
+
+def test_table_is_rebuilt_when_config_version_changes(make_meca_service):
+    service = _service(make_meca_service)
+    table = service.get_position_table()
+    assert service.get_position_table() is table
+    before = service.calculate_intermediate_positions(10, "pickup")
+
+    robot_config = copy.deepcopy(service.robot_config)
+    robot_config["sequence_config"]["version"] = "test-2"
+    robot_config["sequence_config"]["operation_offsets"]["pickup"]["pickup_high_z"] += 1.0
+    service.wafer_config_manager.reload_config(robot_config, robot_config.get("movement_params", {}))
+
+    rebuilt = service.get_position_table()
+    after = service.calculate_intermediate_positions(10, "pickup")
+    assert rebuilt is not table and rebuilt.config_version == "test-2"
+    assert after["pickup_high"][2] == pytest.approx(before["pickup_high"][2] + 1.0)
+    assert after == service._compute_intermediate_positions(10, "pickup")
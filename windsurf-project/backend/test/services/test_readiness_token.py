@@ -0,0 +1,97 @@
+# Readiness token: after one full hardware check, ensure_robot_ready only
+# re-checks software state until the status feed reports a relevant edge.
+
+import asyncio
+
+from core.robot_io_channel import RobotIOChannel
+from core.robot_status_feed import RobotStatusFeed
+
+READY = {"connected": True, "activated": True, "homed": True, "error": False, "paused": False}
+
+
+class _Driver:
+    def __init__(self, feed: RobotStatusFeed):
+        self.status_feed = feed
+        self.robot = object()
+        self.connection_generation = 1
+        self.calls = 0
+
+    def get_robot_instance(self):
+        return self.robot
+
+    async def get_status(self):
+        self.calls += 1
+        return {"activation_status": True, "homing_status": True, "error_status": False, "paused": False}
+
+    async def clear_motion(self):
+        self.calls += 1
+        return True
+
+    async def resume_motion(self):
+        self.calls += 1
+        return True
+
+
+class _Wrapper:
+    def __init__(self, driver: _Driver):
+        self.robot_driver = driver
+        self.status_feed = driver.status_feed
+
+
+async def _start_feed():
+    channel = RobotIOChannel("meca")
+    feed = RobotStatusFeed("meca", lambda: READY, channel, poll_interval=60.0)
+    feed.start()
+    await feed.wait_for_change(timeout=1.0)
+    return feed, channel
+
+
+def test_readiness_token_skips_hardware_checks_until_an_edge(make_meca_service):
+    async def run():
+        feed, channel = await _start_feed()
+        service = await make_meca_service(_Wrapper(_Driver(feed)))
+        driver = service.async_wrapper.robot_driver
+        try:
+            assert await service.ensure_robot_ready()
+            full_check_calls = driver.calls
+            for _ in range(20):
+                assert await service.ensure_robot_ready()
+            cached_calls = driver.calls - full_check_calls
+
+            # An error edge invalidates the token; the next call runs the full check again
+            feed.publish({"error": True})
+            await asyncio.sleep(0)
+            invalidated = service.get_readiness_stats()["token_valid"]
+            feed.publish({"error": False})
+            await asyncio.sleep(0)
+            assert await service.ensure_robot_ready()
+            return full_check_calls, cached_calls, invalidated, driver.calls, service.get_readiness_stats()
+        finally:
+            await feed.stop()
+            channel.shutdown(wait=True)
+
+    full_check_calls, cached_calls, invalidated, total_calls, stats = asyncio.run(run())
+    assert full_check_calls > 0 and cached_calls == 0
+    assert invalidated is False
+    assert total_calls == 2 * full_check_calls
+    assert stats["full_checks"] == 2 and stats["token_hits"] == 20 and stats["invalidations"] == 1
+
+
+def test_reconnect_invalidates_the_readiness_token(make_meca_service):
+    async def run():
+        feed, channel = await _start_feed()
+        service = await make_meca_service(_Wrapper(_Driver(feed)))
+        driver = service.async_wrapper.robot_driver
+        try:
+            assert await service.ensure_robot_ready()
+            # The driver reconnected with the same robot instance, between two status polls
+            driver.connection_generation += 1
+            assert await service.ensure_robot_ready()
+            return service.get_readiness_stats()
+        finally:
+            await feed.stop()
+            channel.shutdown(wait=True)
+
+    stats = asyncio.run(run())
+    assert stats["full_checks"] == 2 and stats["token_hits"] == 0 and stats["invalidations"] == 1
+    assert stats["token_valid"]
@@ -0,0 +1,118 @@
+# Dense per-wafer sequence config: the materialized arrays and whole-array
+# validation agree with resolving the range and per-wafer overrides one wafer
+# at a time, and values the arrays cannot hold are rejected up front.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from core.exceptions import ValidationError
+from services.wafer_config_manager import WaferConfigManager
+
+RUNTIME_CONFIG = Path(__file__).resolve().parents[2] / "config" / "runtime.json"
+
+
+def _robot_config():
+    robot_config = json.loads(RUNTIME_CONFIG.read_text())["meca"]
+    sequence_config = robot_config["sequence_config"]
+    sequence_config["wafer_range_overrides"] = [
+        {"range": [0, 20], "gap_wafers": 2.6, "wafer_speed": 30},
+        {"range": [10, 59], "gap_wafers": 2.8, "align_speed": 65},  # reaches past the loaded wafers
+    ]
+    sequence_config["wafer_specific_overrides"] = {
+        "12": {"gap_adjustment": 0.1, "empty_speed": 70, "pickup_pickup_high_z": 12.5},
+        "15": {"gap_wafers": 2.4},
+        "57": {"gap_wafers": 3.5},
+        "abc": {"gap_wafers": 9.0},
+    }
+    return robot_config
+
+
+def _manager(robot_config):
+    return WaferConfigManager(robot_config, robot_config["movement_params"])
+
+
+def _per_wafer(manager, wafer_index):
+    """(gap, adjustment, speeds) resolved for one wafer straight from the override lists"""
+    gap = manager.base_gap_wafers
+    adjustment = 0.0
+    speeds = {key: manager.movement_params.get(key, manager.SPEED_DEFAULTS[key]) for key in manager.SPEED_KEYS}
+    for range_override in manager.range_overrides:
+        range_start, range_end = range_override.get("range", [0, 54])
+        if range_start <= wafer_index <= range_end:
+            gap = range_override.get("gap_wafers", gap)
+            speeds.update({key: range_override[key] for key in manager.SPEED_KEYS if key in range_override})
+    override = manager.wafer_overrides.get(str(wafer_index), {})
+    adjustment = override.get("gap_adjustment", adjustment)
+    gap = override.get("gap_wafers", gap)
+    speeds.update({key: override[key] for key in manager.SPEED_KEYS if key in override})
+    return gap, adjustment, speeds
+
+
+def _per_wafer_validation(manager, total_wafers):
+    bounds, errors = manager.safety_bounds, []
+    for i in range(total_wafers):
+        gap, adjustment, speeds = _per_wafer(manager, i)
+        effective_gap = gap + adjustment
+        if effective_gap < bounds["min_gap_wafers"]:
+            errors.append(f"Wafer {i+1}: gap {effective_gap} below minimum {bounds['min_gap_wafers']}")
+        if effective_gap > bounds["max_gap_wafers"]:
+            errors.append(f"Wafer {i+1}: gap {effective_gap} above maximum {bounds['max_gap_wafers']}")
+        for speed_name, speed_value in speeds.items():
+            if speed_value < bounds["min_speed"]:
+                errors.append(f"Wafer {i+1}: {speed_name} {speed_value} below minimum")
+            if speed_value > bounds["max_speed"]:
+                errors.append(f"Wafer {i+1}: {speed_name} {speed_value} above maximum")
+    return errors
+
+
+def test_dense_arrays_match_per_wafer_overrides():
+    manager = _manager(_robot_config())
+    gaps = manager.get_effective_gaps()
+    pickup_high_z = manager.get_offset_column("pickup", "pickup_high_z")
+
+    assert manager.total_wafers == len(gaps) == 55
+    for i in range(60):
+        gap, adjustment, speeds = _per_wafer(manager, i)
+        config = manager.get_wafer_config(i)
+        assert (config.gap_wafers, config.gap_adjustment, config.movement_speeds) == (gap, adjustment, speeds)
+        if i < manager.total_wafers:
+            assert gaps[i] == gap + adjustment
+            assert pickup_high_z[i] == manager.get_offset("pickup", "pickup_high_z", i)
+    assert pickup_high_z[12] == 12.5
+
+
+@pytest.mark.parametrize("total_wafers", [10, 55, 60])
+def test_validation_matches_per_wafer_checks(total_wafers):
+    manager = _manager(_robot_config())
+
+    errors = manager.validate_all_wafers(total_wafers)
+
+    assert errors == _per_wafer_validation(manager, total_wafers)
+    assert ("Wafer 58: gap 3.5 above maximum 3" in errors) == (total_wafers > 57)
+    # Validating more wafers than were loaded leaves the loaded arrays alone
+    assert manager.total_wafers == len(manager.get_effective_gaps()) == 55
+
+
+@pytest.mark.parametrize("place, field", [
+    ("base", "gap_wafers"),
+    ("range", "gap_wafers"),
+    ("wafer_gap", "gap_wafers"),
+    ("wafer_adjustment", "gap_adjustment"),
+    ("wafer_offset", "pickup_pickup_high_z"),
+])
+def test_non_numeric_values_are_rejected(place, field):
+    robot_config = _robot_config()
+    sequence_config = robot_config["sequence_config"]
+    if place == "base":
+        robot_config["movement_params"]["gap_wafers"] = "2.7"
+    elif place == "range":
+        sequence_config["wafer_range_overrides"][0]["gap_wafers"] = "wide"
+    else:
+        key = {"wafer_gap": "gap_wafers", "wafer_adjustment": "gap_adjustment"}.get(place, field)
+        sequence_config["wafer_specific_overrides"]["12"][key] = None
+
+    with pytest.raises(ValidationError, match="must be a number") as error:
+        _manager(robot_config)
+    assert error.value.context["field"] == field